@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+"""
+Streaming validator, columnar cache and rollups for CarbonPlan projects.csv
+Checks every row against the rules of src/lib/validation/carbon-plan.ts in
+chunks, writing the valid rows of each chunk straight to memory-mappable
+NumPy columns so later tooling never parses the CSV text again. Bad rows are reported by line and
+left out of the cache, as the upload route would refuse them.
+With --rollups (the npm prebuild step), writes instead small precomputed
+JSON totals; the CarbonPlan chart reads their stats.json when the API is
+unavailable. That path needs no numpy
+"""
+
+import argparse
+import csv
+import functools
+import hashlib
+import heapq
+import json
+import re
+import shutil
+import struct
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # validation and --rollups still work without numpy
+    np = None
+
+ROOT = Path(__file__).resolve().parent
+PROJECTS_CSV = ROOT / "dados" / "CarbonPlan" / "projects.csv"
+CACHE_DIR = ROOT / ".carbon-plan-cache" / "projects"
+ROLLUPS_DIR = ROOT / "public" / "dados" / "CarbonPlan" / "rollups"
+CARBON_PROJECTS_ROUTE = ROOT / "src" / "app" / "api" / "carbon-projects" / "route.ts"
+
+# Rows validated per chunk; the upload route takes at most 2000 projects per
+# request, so each chunk is also one upload batch
+CHUNK_ROWS = 2000
+
+# carbonProjectUploadSchema: field -> (kind, max length, required). Strings are
+# trimmed and empty ones count as missing; lengths are in UTF-16 code units
+PROJECT_FIELDS = {
+    "category": ("string", 120, False),
+    "country": ("string", 120, True),
+    "first_issuance_at": ("date", None, False),
+    "first_retirement_at": ("date", None, False),
+    "is_compliance": ("bool", None, False),
+    "issued": ("int", None, False),
+    "listed_at": ("date", None, False),
+    "name": ("string", 500, True),
+    "project_id": ("string", 120, True),
+    "project_type": ("string", 120, False),
+    "project_type_source": ("string", 120, False),
+    "project_url": ("string", 1000, False),
+    "proponent": ("string", 255, False),
+    "protocol": ("string", 120, False),
+    "registry": ("string", 120, False),
+    "retired": ("int", None, False),
+    "status": ("string", 120, False),
+}
+
+# Values the upload route stores for missing fields
+PROJECT_DEFAULTS = {"category": "unknown", "issued": 0, "retired": 0, "status": "listed"}
+
+TRUE_VALUES = {"true", "1", "yes", "sim"}
+FALSE_VALUES = {"false", "0", "no", "nao", "não"}
+
+# What Number() parses in a trimmed string: a decimal literal with an optional
+# exponent, or an unsigned 0x/0o/0b integer; anything else ("1_000", non-ASCII
+# digits) is NaN
+DECIMAL_NUMBER = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?", re.ASCII)
+PREFIXED_INTEGER = re.compile(r"0(?:[xX][0-9a-fA-F]+|[oO][0-7]+|[bB][01]+)", re.ASCII)
+
+# protocol is a Python list literal of quoted codes: ['vm0038'], ['acm0002', 'ams-i.d.'] or []
+PROTOCOL_LIST = re.compile(r"\[\s*(?:'[^'\[\],]+'(?:\s*,\s*'[^'\[\],]+')*)?\s*\]")
+
+# String columns with at most this share of distinct values in their first
+# chunk are dictionary-encoded
+CATEGORY_MAX_SHARE = 0.5
+# Fixed .npy header size, so the row count can be filled in once the stream ends
+NPY_HEADER_BYTES = 128
+
+# Rollup file -> the categorical column it totals
+ROLLUP_DIMENSIONS = {
+    "by-country": "country",
+    "by-category": "category",
+    "by-registry": "registry",
+    "by-project-type": "project_type",
+    "by-status": "status",
+}
+# Rows in each top-N table
+TOP_N = 20
+# Columns of a project row in the top-N tables
+TOP_FIELDS = ("project_id", "name", "country", "category", "issued", "retired")
+
+def utf16_length(value):
+    """Length as JavaScript counts it, so max lengths match zod's"""
+    return len(value) if value.isascii() else len(value.encode("utf-16-le")) // 2
+
+def parse_int(value):
+    """Non-negative integer as Number() + Number.isInteger would accept it, or None
+
+    Both branches go through a double, so digits past 2**53 round as in
+    JavaScript and overflow to Infinity, which is not an integer.
+    """
+    if PREFIXED_INTEGER.fullmatch(value):
+        try:
+            number = float(int(value, 0))
+        except OverflowError:
+            return None
+    elif DECIMAL_NUMBER.fullmatch(value):
+        number = float(value)
+    else:
+        return None
+    return int(number) if number.is_integer() and number >= 0 else None
+
+@functools.lru_cache(maxsize=4096)
+def parse_date(value):
+    """Seconds since the epoch (UTC) of an ISO date or datetime, or None; memoized, as dates repeat"""
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+def load_continents(route=CARBON_PROJECTS_ROUTE):
+    """The countryToContinent map of the API route, so precomputed and mocked stats group the same way"""
+    if not route.exists():
+        return {}
+    return dict(re.findall(r'^\s*"([^"]+)":\s*"([^"]+)",?\s*$', route.read_text(encoding="utf-8"), re.M))
+
+def file_digest(path):
+    """sha256 of a file's bytes, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def validate_chunk(header, rows, lines, seen, errors):
+    """Validate one chunk of raw rows; returns {field: normalized values} of the good rows
+
+    rows are lists of strings in header order and lines their first line
+    numbers. Errors are appended as (line, project_id, field, message);
+    project_ids already in seen are duplicates.
+    """
+    expected = len(header)
+    good, good_lines = [], []
+    for row, line in zip(rows, lines):
+        if len(row) != expected:
+            errors.append((line, "", "", f"expected {expected} fields, got {len(row)}"))
+            continue
+        good.append(row)
+        good_lines.append(line)
+    if not good:
+        return {}
+
+    index = {name: position for position, name in enumerate(header)}
+    columns = {}
+    bad = set()
+    ids = [row[index["project_id"]].strip() if "project_id" in index else "" for row in good]
+    for field, (kind, max_length, required) in PROJECT_FIELDS.items():
+        raw = [row[index[field]].strip() for row in good] if field in index else [""] * len(good)
+        values = []
+        for position, value in enumerate(raw):
+            problem = None
+            if not value:
+                if required:
+                    problem = f"{field} is required"
+                parsed = False if kind == "bool" else PROJECT_DEFAULTS.get(field, "" if kind == "string" else None)
+            elif kind == "string":
+                parsed = value
+                if utf16_length(value) > max_length:
+                    problem = f"{field} is longer than {max_length} characters"
+                elif field == "protocol" and not PROTOCOL_LIST.fullmatch(value):
+                    problem = f"protocol is not a list of quoted codes: {value!r}"
+            elif kind == "int":
+                parsed = parse_int(value)
+                if parsed is None:
+                    problem = f"{field} must be a non-negative integer: {value!r}"
+            elif kind == "date":
+                parsed = parse_date(value)
+                if parsed is None:
+                    problem = f"{field} is not a date: {value!r}"
+            else:
+                lower = value.lower()
+                parsed = lower in TRUE_VALUES
+                if not parsed and lower not in FALSE_VALUES:
+                    problem = f"{field} is not a boolean: {value!r}"
+            if problem:
+                errors.append((good_lines[position], ids[position], field, problem))
+                bad.add(position)
+            values.append(parsed)
+        columns[field] = values
+
+    for position, project_id in enumerate(ids):
+        if not project_id:
+            continue
+        if project_id in seen:
+            errors.append((good_lines[position], project_id, "project_id",
+                           f"duplicate project_id, first on line {seen[project_id]}"))
+            bad.add(position)
+        else:
+            seen[project_id] = good_lines[position]
+    if bad:
+        columns = {field: [value for position, value in enumerate(values) if position not in bad]
+                   for field, values in columns.items()}
+    return columns
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Yield (header, rows, first line of each row) chunk by chunk; quoted fields may span lines"""
+    with open(path, encoding="utf-8", newline="") as source:
+        reader = csv.reader(source)
+        header = [name.strip() for name in next(reader, [])]
+        while True:
+            rows, lines = [], []
+            line = reader.line_num + 1
+            for row in islice(reader, chunk_rows):
+                if row:
+                    rows.append(row)
+                    lines.append(line)
+                line = reader.line_num + 1
+            if not rows:
+                return
+            yield header, rows, lines
+
+def validate_projects(path=PROJECTS_CSV, chunk_rows=CHUNK_ROWS, on_chunk=None):
+    """Validate projects.csv in one streaming pass; returns (valid rows, errors)
+
+    on_chunk, when given, is called with {field: values} of each chunk's
+    valid rows; nothing else of the rows is kept.
+    """
+    errors, seen, rows = [], {}, 0
+    for header, chunk, lines in read_chunks(path, chunk_rows):
+        missing = [field for field, (_, _, required) in PROJECT_FIELDS.items() if required and field not in header]
+        if missing:
+            errors.append((1, "", "", f"missing required columns: {', '.join(missing)}"))
+            break
+        columns = validate_chunk(header, chunk, lines, seen, errors)
+        if columns and on_chunk is not None:
+            on_chunk(columns)
+        rows += len(columns.get("project_id", ()))
+    errors.sort(key=lambda error: error[0])
+    return rows, errors
+
+def _require_numpy():
+    """Fail with a helpful message when numpy is not installed"""
+    if np is None:
+        raise RuntimeError("The columnar cache requires numpy (pip install numpy)")
+
+def npy_header(dtype, length):
+    """A .npy version 1.0 header of exactly NPY_HEADER_BYTES for a 1-D array"""
+    header = repr({"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False,
+                   "shape": (length,)}).encode("latin1")
+    magic = np.lib.format.magic(1, 0)
+    padding = NPY_HEADER_BYTES - len(magic) - 2 - len(header) - 1
+    return magic + struct.pack("<H", len(header) + padding + 1) + header + b" " * padding + b"\n"
+
+class NpyStream:
+    """A 1-D .npy file written in pieces; the header gets its length on close"""
+
+    def __init__(self, path, dtype):
+        self.dtype = np.dtype(dtype)
+        self.length = 0
+        self.file = open(path, "wb")
+        self.file.write(npy_header(self.dtype, 0))
+
+    def write(self, array):
+        array = np.asarray(array, dtype=self.dtype)
+        self.file.write(array.tobytes())
+        self.length += len(array)
+
+    def close(self):
+        self.file.seek(0)
+        self.file.write(npy_header(self.dtype, self.length))
+        self.file.close()
+
+class ColumnWriter:
+    """Writes one validated column chunk by chunk
+
+    String columns are dictionary-encoded when their first chunk has few
+    enough distinct values (only the distinct strings are then kept), and
+    otherwise stored as UTF-8 bytes plus offsets.
+    """
+
+    def __init__(self, kind, staging, field):
+        self.kind = kind
+        self.staging = staging
+        self.field = field
+        self.codes = {}
+        self.streams = {}
+        if kind != "string":
+            dtype = {"int": np.int64, "bool": np.bool_, "date": "datetime64[s]"}[kind]
+            self.streams[""] = NpyStream(staging / f"{field}.npy", dtype)
+
+    def _start_strings(self, values):
+        if len(set(values)) <= max(1, len(values) * CATEGORY_MAX_SHARE):
+            self.kind = "category"
+            self.streams[""] = NpyStream(self.staging / f"{self.field}.npy", np.uint32)
+        else:
+            self.kind = "text"
+            self.streams[""] = NpyStream(self.staging / f"{self.field}.npy", np.uint8)
+            self.streams[".offsets"] = NpyStream(self.staging / f"{self.field}.offsets.npy", np.int64)
+            self.streams[".offsets"].write([0])
+            self.end = 0
+
+    def add(self, values):
+        if self.kind == "string":
+            self._start_strings(values)
+        if self.kind == "category":
+            codes = self.codes
+            self.streams[""].write([codes.setdefault(value, len(codes)) for value in values])
+        elif self.kind == "text":
+            encoded = [value.encode("utf-8") for value in values]
+            offsets = self.end + np.cumsum([len(value) for value in encoded], dtype=np.int64)
+            self.streams[""].write(np.frombuffer(b"".join(encoded), dtype=np.uint8))
+            self.streams[".offsets"].write(offsets)
+            self.end = int(offsets[-1]) if len(offsets) else self.end
+        elif self.kind == "date":
+            self.streams[""].write(np.array([np.iinfo(np.int64).min if value is None else value for value in values],
+                                            dtype=np.int64).view("datetime64[s]"))
+        else:
+            self.streams[""].write(values)
+
+    def close(self):
+        """Finish the files; returns the column's metadata"""
+        if self.kind == "string":  # no valid rows at all
+            self._start_strings([])
+        for stream in self.streams.values():
+            stream.close()
+        if self.kind == "category":
+            return {"kind": "category", "categories": list(self.codes)}
+        return {"kind": self.kind}
+
+class CacheWriter:
+    """Streams validated chunks into the columnar cache, replacing any previous cache atomically on finish
+
+    Pass its add method as the on_chunk of validate_projects.
+    """
+
+    def __init__(self, source, cache_dir=CACHE_DIR):
+        _require_numpy()
+        self.source = source
+        self.cache_dir = Path(cache_dir)
+        self.staging = self.cache_dir.with_name(self.cache_dir.name + ".tmp")
+        shutil.rmtree(self.staging, ignore_errors=True)
+        self.staging.mkdir(parents=True)
+        self.columns = {field: ColumnWriter(kind, self.staging, field)
+                        for field, (kind, _, _) in PROJECT_FIELDS.items()}
+        self.rows = 0
+
+    def add(self, columns):
+        if not columns["project_id"]:
+            return
+        for field, values in columns.items():
+            self.columns[field].add(values)
+        self.rows += len(columns["project_id"])
+
+    def finish(self, errors=()):
+        """Write meta.json and move the cache into place; returns the metadata"""
+        meta = {"source": str(self.source), "sha256": file_digest(self.source), "rows": self.rows,
+                "rejected_lines": sorted({line for line, *_ in errors}),
+                "columns": {field: column.close() for field, column in self.columns.items()}}
+        (self.staging / "meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=1), encoding="utf-8")
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.staging.rename(self.cache_dir)
+        return meta
+
+def write_cache(source, cache_dir=CACHE_DIR, chunk_rows=CHUNK_ROWS):
+    """Validate source and stream its valid rows into the cache; returns (rows, errors, metadata)"""
+    writer = CacheWriter(source, cache_dir)
+    rows, errors = validate_projects(source, chunk_rows, on_chunk=writer.add)
+    return rows, errors, writer.finish(errors)
+
+class CategoryColumn:
+    """Dictionary-encoded strings: codes into categories"""
+
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        return self.categories[self.codes[index]]
+
+    def tolist(self):
+        return np.asarray(self.categories, dtype=object)[self.codes].tolist()
+
+class TextColumn:
+    """Variable-length strings: UTF-8 bytes and len + 1 offsets into them"""
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return bytes(self.data[self.offsets[index]:self.offsets[index + 1]]).decode("utf-8")
+
+    def tolist(self):
+        return [self[index] for index in range(len(self))]
+
+def load_cache(cache_dir=CACHE_DIR, source=None):
+    """{field: column} memory-mapped from the cache, or None if it is missing or source changed since"""
+    _require_numpy()
+    cache_dir = Path(cache_dir)
+    meta_path = cache_dir / "meta.json"
+    if not meta_path.exists():
+        return None
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    if source is not None and file_digest(source) != meta["sha256"]:
+        return None
+    columns = {}
+    for field, column in meta["columns"].items():
+        array = np.load(cache_dir / f"{field}.npy", mmap_mode="r")
+        if column["kind"] == "category":
+            columns[field] = CategoryColumn(array, column["categories"])
+        elif column["kind"] == "text":
+            columns[field] = TextColumn(array, np.load(cache_dir / f"{field}.offsets.npy", mmap_mode="r"))
+        else:
+            columns[field] = array
+    return columns
+
+def load_projects(source=PROJECTS_CSV, cache_dir=CACHE_DIR):
+    """Columns of the valid rows of projects.csv, rebuilding the cache first when the CSV changed"""
+    columns = load_cache(cache_dir, source)
+    if columns is None:
+        write_cache(source, cache_dir)
+        columns = load_cache(cache_dir)
+    return columns
+
+class Rollups:
+    """Issued and retired totals of the valid rows, accumulated chunk by chunk
+
+    Only the totals per key and the current top-N rows are kept, never the
+    rows themselves.
+    """
+
+    def __init__(self, top_n=TOP_N):
+        self.top_n = top_n
+        # name -> {key: [projects, issued, retired]}, keys in order of first appearance
+        self.totals = {name: {} for name in (*ROLLUP_DIMENSIONS, "by-first-issuance-year", "proponents")}
+        self.top = {"issued": [], "retired": []}
+        self.rows = 0
+
+    def _add(self, name, keys, issued, retired):
+        totals = self.totals[name]
+        for key, issued_credits, retired_credits in zip(keys, issued, retired):
+            entry = totals.get(key)
+            if entry is None:
+                entry = totals[key] = [0, 0, 0]
+            entry[0] += 1
+            entry[1] += issued_credits
+            entry[2] += retired_credits
+
+    def add(self, columns):
+        """Fold in {field: values} of one chunk of valid rows"""
+        issued, retired = columns["issued"], columns["retired"]
+        for name, field in ROLLUP_DIMENSIONS.items():
+            self._add(name, columns[field], issued, retired)
+        self._add("proponents", columns["proponent"], issued, retired)
+        dated = [(datetime.fromtimestamp(seconds, timezone.utc).year, issued_credits, retired_credits)
+                 for seconds, issued_credits, retired_credits in zip(columns["first_issuance_at"], issued, retired)
+                 if seconds is not None]
+        if dated:
+            self._add("by-first-issuance-year", *(list(values) for values in zip(*dated)))
+        rows = [dict(zip(TOP_FIELDS, values)) for values in zip(*(columns[field] for field in TOP_FIELDS))]
+        for weight, top in self.top.items():
+            # nlargest is stable, so ties keep the row that came first
+            self.top[weight] = heapq.nlargest(self.top_n, top + rows, key=lambda row: row[weight])
+        self.rows += len(rows)
+
+    def table(self, name):
+        """[{key, projects, issued, retired}] of one rollup, most issued first"""
+        entries = [{"key": key, "projects": projects, "issued": issued, "retired": retired}
+                   for key, (projects, issued, retired) in self.totals[name].items()]
+        return sorted(entries, key=lambda entry: (-entry["issued"], -entry["projects"]))
+
+    def build(self):
+        """{file name: payload} of every rollup"""
+        rollups = {name: self.table(name) for name in ROLLUP_DIMENSIONS}
+        by_year = self.table("by-first-issuance-year")
+        rollups["by-first-issuance-year"] = [{**entry, "key": str(entry["key"])}
+                                             for entry in sorted(by_year, key=lambda entry: entry["key"])]
+        rollups["top"] = {
+            "issued": self.top["issued"],
+            "retired": self.top["retired"],
+            "proponents": [entry for entry in self.table("proponents") if entry["key"]][:self.top_n],
+        }
+        rollups["stats"] = self.stats(rollups)
+        return rollups
+
+    def stats(self, rollups):
+        """Same shape as the stats of GET /api/carbon-projects, from the by-* rollups
+
+        Issued credits stand in for the carbon_credits quantities the route
+        sums, and first-issuance years for their vintages.
+        """
+        continents = load_continents()
+        by_country = rollups["by-country"]
+        continent_stats = Counter()
+        for entry in by_country:
+            continent_stats[continents.get(entry["key"], "Unknown")] += entry["projects"]
+        category_stats = {entry["key"]: entry["projects"] for entry in rollups["by-category"]}
+        return {
+            "totalProjects": self.rows,
+            "forestProjects": category_stats.get("forest", 0),
+            "countries": len(by_country),
+            "continents": len(continent_stats),
+            "totalCredits": sum(entry["issued"] for entry in by_country),
+            "countryStats": {entry["key"]: entry["projects"] for entry in by_country},
+            "continentStats": dict(continent_stats.most_common()),
+            "categoryStats": category_stats,
+            "creditsByCountry": {entry["key"]: entry["issued"] for entry in by_country},
+            "vintageStats": {entry["key"]: entry["issued"] for entry in rollups["by-first-issuance-year"]
+                             if entry["issued"]},
+        }
+
+def rollup_inputs(source, top_n=TOP_N):
+    """sha256 of everything the rollups are built from: the CSV, this script, the continent map and top_n"""
+    digest = hashlib.sha256()
+    for part in (file_digest(source), file_digest(__file__), json.dumps(load_continents(), sort_keys=True),
+                 str(top_n)):
+        digest.update(part.encode("utf-8"))
+    return digest.hexdigest()
+
+def rollups_current(out_dir, inputs):
+    """Whether out_dir holds every rollup file, built from the same inputs"""
+    index_path = Path(out_dir) / "index.json"
+    if not index_path.exists():
+        return False
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    files = index.get("files", {})
+    return (index.get("inputs") == inputs and "stats" in files
+            and all((Path(out_dir) / entry["path"]).exists() for entry in files.values()))
+
+def write_rollups(source=PROJECTS_CSV, out_dir=ROLLUPS_DIR, top_n=TOP_N, force=False, chunk_rows=CHUNK_ROWS):
+    """Write the rollup JSON files plus index.json; returns the index, or None if they are up to date
+
+    index.json records the sha256 of the CSV the rollups came from, and a
+    hash of every input (the CSV, this script, the continent map, top_n), so
+    they are only rebuilt when one of those changes or a file went missing.
+    """
+    out_dir = Path(out_dir)
+    index_path = out_dir / "index.json"
+    inputs = rollup_inputs(source, top_n)
+    if not force and rollups_current(out_dir, inputs):
+        return None
+
+    rollups = Rollups(top_n)
+    validate_projects(source, chunk_rows, on_chunk=rollups.add)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    files = {}
+    for name, payload in rollups.build().items():
+        path = out_dir / f"{name}.json"
+        path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        files[name] = {"path": path.name, "bytes": path.stat().st_size}
+    index = {"source": Path(source).name, "sha256": file_digest(source), "inputs": inputs, "rows": rollups.rows,
+             "top_n": top_n, "files": files}
+    index_path.write_text(json.dumps(index, indent=2) + "\n", encoding="utf-8")
+    return index
+
+def print_errors(errors, max_errors):
+    for line, project_id, field, message in errors[:max_errors]:
+        print(f"[FAIL] line {line}{f' ({project_id})' if project_id else ''}: {message}")
+    if len(errors) > max_errors:
+        print(f"... and {len(errors) - max_errors} more")
+    by_field = {}
+    for _, _, field, _ in errors:
+        by_field[field or "row"] = by_field.get(field or "row", 0) + 1
+    print(f"{len(errors)} problems: " + ", ".join(f"{field} {count}" for field, count in sorted(by_field.items())))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate CarbonPlan projects.csv and cache it as NumPy columns")
+    parser.add_argument("csv", nargs="?", default=str(PROJECTS_CSV),
+                        help=f"projects CSV (default: {PROJECTS_CSV.relative_to(ROOT)})")
+    parser.add_argument("--cache", default=str(CACHE_DIR), help="directory the columnar cache is written to")
+    parser.add_argument("--no-cache", action="store_true", help="only validate")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help=f"rows per chunk (default: {CHUNK_ROWS})")
+    parser.add_argument("--max-errors", type=int, default=50, help="problems listed before summarizing")
+    parser.add_argument("--rollups", nargs="?", const=str(ROLLUPS_DIR), metavar="DIR",
+                        help=f"write precomputed totals when the CSV changed (default: {ROLLUPS_DIR.relative_to(ROOT)})")
+    parser.add_argument("--top", type=int, default=TOP_N, help=f"rows per --rollups top-N table (default: {TOP_N})")
+    parser.add_argument("--force", action="store_true", help="rebuild --rollups even if the CSV is unchanged")
+    args = parser.parse_args(argv)
+
+    source = Path(args.csv)
+    if args.rollups:
+        index = write_rollups(source, args.rollups, args.top, args.force)
+        if index is None:
+            print(f"[SKIP] Rollups in {args.rollups} are up to date with {source.name}")
+        else:
+            print(f"Rollups of {index['rows']} projects written to {args.rollups}: "
+                  + ", ".join(f"{name} {entry['bytes'] / 1e3:.1f} kB" for name, entry in index["files"].items()))
+        return 0
+
+    caching = not args.no_cache and np is not None
+    if caching:
+        rows, errors, meta = write_cache(source, args.cache, args.chunk_rows)
+    else:
+        rows, errors = validate_projects(source, args.chunk_rows)
+    if errors:
+        print_errors(errors, args.max_errors)
+    else:
+        print(f"[PASS] {rows} projects, all valid")
+    if caching:
+        size = sum(path.stat().st_size for path in Path(args.cache).iterdir())
+        print(f"Columnar cache: {rows} rows x {len(meta['columns'])} columns, {size / 1e6:.1f} MB in {args.cache}")
+    elif not args.no_cache:
+        print("numpy is not installed (pip install numpy); the columnar cache was not written")
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
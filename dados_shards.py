@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Per-section shards of public/dados/dados.json
+Splits dados.json into one content-hashed JSON file per top-level key (so the
+I-REC page can fetch irecBrasil alone) and a manifest mapping keys to shard
+paths. Opt-in through `npm run shards`; the output is not committed.
+Also checks that dados/ and public/dados/ hold byte-identical copies; the
+pre-commit hook runs that check alone (--check-only) when dados/ is staged
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # shards are still written, just without .br variants
+    brotli = None
+
+ROOT = Path(__file__).resolve().parent
+DADOS_DIR = ROOT / "dados"
+PUBLIC_DADOS_DIR = ROOT / "public" / "dados"
+DADOS_JSON = PUBLIC_DADOS_DIR / "dados.json"
+SHARDS_DIR = PUBLIC_DADOS_DIR / "shards"
+MANIFEST = PUBLIC_DADOS_DIR / "dados.manifest.json"
+
+# Hex digits of the content hash in shard file names
+HASH_LENGTH = 12
+
+# Built from the data under public/dados/, so never expected in dados/
+GENERATED = ("shards", "dados.manifest.json", "CarbonPlan/rollups")
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+def file_hashes(root, exclude=()):
+    """{relative posix path: sha256} of every file under root, skipping excluded paths"""
+    hashes = {}
+    for path in sorted(root.rglob("*")):
+        relative = path.relative_to(root).as_posix()
+        if path.is_file() and not any(relative == skip or relative.startswith(skip + "/") for skip in exclude):
+            hashes[relative] = sha256(path.read_bytes())
+    return hashes
+
+def compare_mirrors(source=DADOS_DIR, mirror=PUBLIC_DADOS_DIR):
+    """(path, problem) for every file that is not byte-identical in both trees"""
+    left, right = file_hashes(source), file_hashes(mirror, GENERATED)
+    problems = []
+    for path in sorted(left.keys() | right.keys()):
+        if path not in right:
+            problems.append((path, f"only in {source.name}/"))
+        elif path not in left:
+            problems.append((path, f"only in {mirror.relative_to(ROOT).as_posix()}/"))
+        elif left[path] != right[path]:
+            problems.append((path, "contents differ"))
+    return problems
+
+def write_variants(path, data, precompress=False):
+    """Write data, plus .gz and .br (with brotli installed) next to it with precompress; returns the sizes
+
+    next start and Vercel compress static files on the fly and never serve
+    these siblings; they are for servers that do, such as debug_server.py.
+    Without precompress nothing is compressed and the variant sizes are None.
+    """
+    path.write_bytes(data)
+    sizes = {"bytes": len(data), "gzip": None, "br": None}
+    if precompress:
+        # mtime=0 keeps the gzip bytes, and so any CDN ETag, stable across rebuilds
+        gzipped = gzip.compress(data, compresslevel=9, mtime=0)
+        path.with_name(path.name + ".gz").write_bytes(gzipped)
+        sizes["gzip"] = len(gzipped)
+        if brotli is not None:
+            compressed = brotli.compress(data, quality=11)
+            path.with_name(path.name + ".br").write_bytes(compressed)
+            sizes["br"] = len(compressed)
+    return sizes
+
+def build_shards(source=DADOS_JSON, shards_dir=SHARDS_DIR, manifest_path=MANIFEST, precompress=False):
+    """Write one shard per top-level key and the manifest; stale shards are removed"""
+    raw = source.read_bytes()
+    data = json.loads(raw)
+    shards_dir.mkdir(parents=True, exist_ok=True)
+    shards, written = {}, set()
+    for key, value in data.items():
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = sha256(payload)
+        path = shards_dir / f"{key}.{digest[:HASH_LENGTH]}.json"
+        sizes = write_variants(path, payload, precompress)
+        written.update([path.name, path.name + ".gz", path.name + ".br"] if precompress else [path.name])
+        shards[key] = {"path": path.relative_to(manifest_path.parent).as_posix(), "sha256": digest, **sizes}
+    for path in shards_dir.iterdir():
+        if path.name not in written:
+            path.unlink()
+    manifest = {"source": source.name, "sha256": sha256(raw), "bytes": len(raw), "shards": shards}
+    manifest_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return manifest
+
+def _kilobytes(size, width):
+    return f"{size / 1e3:>{width}.1f}" if size is not None else f"{'-':>{width}}"
+
+def print_manifest(manifest, precompress=False):
+    print(f"=== SHARDS of {manifest['source']} ({manifest['bytes'] / 1e3:.1f} kB) ===")
+    print(f"{'key':<24} {'kB':>7} {'gzip kB':>8} {'br kB':>7}  path")
+    for key, shard in manifest["shards"].items():
+        print(f"{key:<24} {_kilobytes(shard['bytes'], 7)} {_kilobytes(shard['gzip'], 8)} "
+              f"{_kilobytes(shard['br'], 7)}  {shard['path']}")
+    if precompress and brotli is None:
+        print("brotli is not installed (pip install brotli); .br variants were skipped")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shard dados.json per key and check the dados/ mirror")
+    parser.add_argument("--check-only", action="store_true", help="only compare dados/ with public/dados/")
+    parser.add_argument("--precompress", action="store_true",
+                        help="also write .gz/.br next to each shard (for servers that serve precompressed files)")
+    args = parser.parse_args(argv)
+
+    if not args.check_only:
+        print_manifest(build_shards(precompress=args.precompress), args.precompress)
+        print()
+
+    problems = compare_mirrors()
+    if not problems:
+        print(f"[PASS] {DADOS_DIR.name}/ and {PUBLIC_DADOS_DIR.relative_to(ROOT).as_posix()}/ are byte-identical")
+        return 0
+    for path, problem in problems:
+        print(f"[FAIL] {path}: {problem}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
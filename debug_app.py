@@ -1,34 +1,439 @@
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+import argparse
+import asyncio
+import http.client
+import inspect
+import json
+import math
+import re
+import statistics
+import sys
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
 
-with sync_playwright() as p:
-    browser = p.chromium.launch(headless=False)
-    page = browser.new_page()
-    
-    # Capture console logs
+import debug_server
+import wcag_audit
+
+BASE_URL = "http://localhost:8000"
+DEFAULT_PAGE = "irec-brasil.html"
+# The Next.js app (npm run dev), as in playwright.config.ts
+APP_BASE_URL = "http://localhost:3000"
+ROOT = Path(__file__).resolve().parent
+PUBLIC_ROUTES_DIR = ROOT / "src" / "app" / "[locale]" / "(public)"
+MESSAGES_DIR = ROOT / "messages"
+ROUTING_TS = ROOT / "src" / "i18n" / "routing.ts"
+# Browser contexts the crawler keeps open at once
+CRAWL_CONCURRENCY = 6
+# One JSON line per page per --vitals run, compared against on the next one
+VITALS_HISTORY = ROOT / ".debug-vitals.jsonl"
+# Past runs per page whose median is the baseline
+VITALS_WINDOW = 5
+# Allowed increase over the baseline before a metric counts as regressed
+VITALS_TOLERANCE = 0.2
+# Absolute increases below these are noise whatever the relative change
+VITALS_NOISE_FLOOR = {
+    "ttfb_ms": 50, "dom_content_loaded_ms": 100, "load_ms": 100, "fcp_ms": 100, "lcp_ms": 100,
+    "cls": 0.02, "tbt_ms": 50, "js_heap_mb": 2, "transfer_kb": 20, "requests": 2,
+}
+# Upper bound for each readiness phase; a healthy page is ready long before
+READY_TIMEOUT_MS = 15000
+# Signed-in pages --dashboard checks, and where their session is kept between runs
+DASHBOARD_ROUTES = ("/feed", "/leaderboard", "/profile", "/mod")
+AUTH_STATE = ROOT / ".debug-auth.json"
+
+# Resolves once #irec-table has rendered rows: "error" when they carry the
+# "Erro ao carregar" message, "data" otherwise
+TABLE_RENDERED_JS = """() => {
+    const table = document.querySelector("#irec-table");
+    if (!table || table.querySelectorAll("tr").length === 0 || !table.innerText.trim()) {
+        return false;
+    }
+    return table.innerText.includes("Erro ao carregar") ? "error" : "data";
+}"""
+
+# Collects every visible text element's computed colors and font in a single
+# evaluate call. Colors go through a 1x1 canvas so any CSS color syntax
+# (oklch from Tailwind v4, named colors, ...) comes back as sRGB bytes.
+COLLECT_TEXT_STYLES_JS = """() => {
+    const canvas = document.createElement("canvas");
+    canvas.width = canvas.height = 1;
+    const ctx = canvas.getContext("2d", { willReadFrequently: true });
+    const colors = new Map();
+    const toRgba = (css) => {
+        let rgba = colors.get(css);
+        if (!rgba) {
+            ctx.clearRect(0, 0, 1, 1);
+            ctx.fillStyle = "rgba(0, 0, 0, 0)";
+            ctx.fillStyle = css;
+            ctx.fillRect(0, 0, 1, 1);
+            rgba = Array.from(ctx.getImageData(0, 0, 1, 1).data);
+            colors.set(css, rgba);
+        }
+        return rgba;
+    };
+    const backgrounds = new Map();
+    const backgroundOf = (el) => {
+        if (backgrounds.has(el)) {
+            return backgrounds.get(el);
+        }
+        const style = getComputedStyle(el);
+        const rgba = toRgba(style.backgroundColor);
+        const own = { layers: rgba[3] > 0 ? [rgba] : [], hasImage: style.backgroundImage !== "none" };
+        let result = own;
+        if (rgba[3] < 255 && el.parentElement) {
+            const parent = backgroundOf(el.parentElement);
+            result = { layers: own.layers.concat(parent.layers), hasImage: own.hasImage || parent.hasImage };
+        }
+        backgrounds.set(el, result);
+        return result;
+    };
+    const describe = (el) => {
+        const classes = typeof el.className === "string" ? el.className.trim().split(/\\s+/).filter(Boolean) : [];
+        return el.tagName.toLowerCase() + (el.id ? "#" + el.id : "") + classes.slice(0, 3).map((c) => "." + c).join("");
+    };
+    const skip = new Set(["SCRIPT", "STYLE", "NOSCRIPT", "TEMPLATE"]);
+    const seen = new Set();
+    const nodes = [];
+    const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT, {
+        acceptNode: (node) => (node.nodeValue.trim() ? NodeFilter.FILTER_ACCEPT : NodeFilter.FILTER_REJECT),
+    });
+    while (walker.nextNode()) {
+        const el = walker.currentNode.parentElement;
+        if (!el || seen.has(el) || skip.has(el.tagName)) {
+            continue;
+        }
+        seen.add(el);
+        const style = getComputedStyle(el);
+        if (style.visibility !== "visible" || parseFloat(style.opacity) === 0 || el.getClientRects().length === 0) {
+            continue;
+        }
+        const background = backgroundOf(el);
+        nodes.push({
+            selector: describe(el),
+            text: walker.currentNode.nodeValue.trim().slice(0, 60),
+            color: toRgba(style.color),
+            layers: background.layers,
+            hasImage: background.hasImage,
+            fontSize: parseFloat(style.fontSize),
+            fontWeight: parseInt(style.fontWeight, 10) || 400,
+        });
+    }
+    return nodes;
+}"""
+
+# Tables and rows on the page, and whether the "Erro ao carregar" message is shown
+TABLE_STATUS_JS = """() => ({
+    tables: document.querySelectorAll("table").length,
+    rows: document.querySelectorAll("table tbody tr").length,
+    error: document.body.innerText.includes("Erro ao carregar"),
+})"""
+
+# Resolves once every table present has rows or the page shows the error message
+TABLES_READY_JS = """() => {
+    const tables = document.querySelectorAll("table");
+    return document.body.innerText.includes("Erro ao carregar")
+        || Array.from(tables).every((table) => table.querySelector("tbody tr"));
+}"""
+
+# Installed before any page script runs: buffers LCP, layout shifts and long tasks
+VITALS_INIT_JS = """(() => {
+    const vitals = window.__vitals = { lcp: 0, cls: 0, longTasks: [] };
+    const observe = (type, callback) => {
+        try {
+            new PerformanceObserver((list) => list.getEntries().forEach(callback)).observe({ type, buffered: true });
+        } catch (e) {}
+    };
+    observe("largest-contentful-paint", (entry) => { vitals.lcp = entry.startTime; });
+    observe("layout-shift", (entry) => { if (!entry.hadRecentInput) vitals.cls += entry.value; });
+    observe("longtask", (entry) => { vitals.longTasks.push([entry.startTime, entry.duration]); });
+})()"""
+
+# Navigation Timing, paint, the buffered vitals, JS heap and per-resource transfer sizes.
+# TBT is the blocking time (over 50 ms) of long tasks after FCP, up to collection.
+COLLECT_VITALS_JS = """() => {
+    const nav = performance.getEntriesByType("navigation")[0] || {};
+    const fcp = (performance.getEntriesByName("first-contentful-paint")[0] || {}).startTime || 0;
+    const vitals = window.__vitals || { lcp: 0, cls: 0, longTasks: [] };
+    const resources = performance.getEntriesByType("resource").map((entry) => ({
+        name: entry.name,
+        type: entry.initiatorType,
+        transfer: entry.transferSize,
+        duration: Math.round(entry.duration),
+    }));
+    const transfer = resources.reduce((sum, entry) => sum + entry.transfer, nav.transferSize || 0);
+    return {
+        metrics: {
+            ttfb_ms: nav.responseStart || 0,
+            dom_content_loaded_ms: nav.domContentLoadedEventEnd || 0,
+            load_ms: nav.loadEventEnd || 0,
+            fcp_ms: fcp,
+            lcp_ms: vitals.lcp,
+            cls: vitals.cls,
+            tbt_ms: vitals.longTasks.filter(([start]) => start >= fcp)
+                .reduce((sum, [, duration]) => sum + Math.max(0, duration - 50), 0),
+            js_heap_mb: performance.memory ? performance.memory.usedJSHeapSize / 1048576 : 0,
+            transfer_kb: transfer / 1024,
+            requests: resources.length + 1,
+        },
+        resources: resources.sort((a, b) => b.transfer - a.transfer).slice(0, 5),
+    };
+}"""
+
+def capture_console(page):
+    """Start collecting "[type] text" console messages of a (sync or async) page"""
     console_logs = []
     page.on("console", lambda msg: console_logs.append(f"[{msg.type}] {msg.text}"))
-    
-    # Navigate to the page
-    page.goto('http://localhost:8000/irec-brasil.html')
-    page.wait_for_load_state('networkidle')
-    
-    # Wait a bit more for data to load
-    time.sleep(2)
-    
-    # Take screenshot
-    page.screenshot(path='debug_irec_brasil.png', full_page=True)
-    
-    # Print console logs
+    return console_logs
+
+# Data endpoints driven by --load: the chart API and the static dataset
+LOAD_PATHS = ("/api/carbon-projects?limit=1000", "/dados/dados.json")
+LOAD_CLIENTS = 32
+LOAD_DURATION_S = 10.0
+
+# Response headers CDNs and Next.js use to say whether they served from cache
+CACHE_HEADERS = ("x-vercel-cache", "x-nextjs-cache", "cf-cache-status", "x-cache")
+
+class NetworkRecorder:
+    """Records every request of the pages it is attached to, from Playwright's network events
+
+    Works with sync and async pages alike. Events are only observed, never
+    routed: page.route() would turn off the browser cache and hide exactly
+    the cache behaviour being measured. Each main-frame navigation starts a
+    new "page" so duplicates are counted per navigation: at its document
+    request, which fires before the navigation commits, or at the commit
+    for same-document (history API) navigations, which send no request.
+    """
+
+    def __init__(self):
+        self.pages = []
+        self.entries = []
+        self._by_request = {}
+        self._pending = []
+
+    def attach(self, page):
+        page.on("framenavigated", lambda frame: frame == page.main_frame and self._navigated(frame.url))
+        page.on("request", lambda request: self._request(request, page))
+        page.on("requestfinished", self._finished)
+        page.on("requestfailed", self._failed)
+        return self
+
+    def _open_page(self, url, committed=False):
+        self.pages.append({"id": f"page_{len(self.pages) + 1}", "url": url, "started": time.time(),
+                           "committed": committed})
+
+    def _navigated(self, url):
+        if self.pages and not self.pages[-1]["committed"]:
+            # The page its document request opened; the url is final after redirects
+            self.pages[-1].update(url=url, committed=True)
+        else:
+            self._open_page(url, committed=True)
+
+    def _request(self, request, page):
+        if (request.is_navigation_request() and request.redirected_from is None
+                and request.frame == page.main_frame):
+            self._open_page(request.url)
+        elif not self.pages:
+            self._open_page(page.url)
+        entry = {
+            "pageref": self.pages[-1]["id"],
+            "started": time.time(),
+            "method": request.method,
+            "url": request.url,
+            "type": request.resource_type,
+            "request_headers": request.headers,
+            "status": 0,
+            "status_text": "",
+            "response_headers": {},
+            "bytes": 0,
+            "cache": "network",
+            "time_ms": 0.0,
+        }
+        self.entries.append(entry)
+        self._by_request[request] = entry
+
+    def _finished(self, request):
+        entry = self._by_request.pop(request, None)
+        if entry is None:
+            return
+        entry["time_ms"] = (time.time() - entry["started"]) * 1000
+        response = request.response()
+        sizes = request.sizes()
+        if inspect.isawaitable(response):
+            self._pending.append(asyncio.ensure_future(self._complete_async(entry, response, sizes)))
+        else:
+            self._complete(entry, response, sizes)
+
+    async def _complete_async(self, entry, response, sizes):
+        self._complete(entry, await response, await sizes)
+
+    def _complete(self, entry, response, sizes):
+        entry["bytes"] = sizes["responseBodySize"] + sizes["responseHeadersSize"]
+        if response is None:
+            return
+        entry["status"] = response.status
+        entry["status_text"] = response.status_text
+        entry["response_headers"] = response.headers
+        entry["cache"] = cache_status(response, entry["bytes"])
+
+    def _failed(self, request):
+        entry = self._by_request.pop(request, None)
+        if entry is not None:
+            entry["cache"] = f"failed ({request.failure})"
+
+    async def flush(self):
+        """Wait for the async size lookups; only needed with async pages"""
+        await asyncio.gather(*self._pending, return_exceptions=True)
+        self._pending.clear()
+
+    def summary(self):
+        """Per navigation: url, requests, bytes, {cache status: count}, {url: times fetched} for duplicates"""
+        pages = []
+        for page in self.pages:
+            entries = [entry for entry in self.entries if entry["pageref"] == page["id"]]
+            cache, fetched = {}, {}
+            for entry in entries:
+                cache[entry["cache"]] = cache.get(entry["cache"], 0) + 1
+                key = f"{entry['method']} {entry['url']}"
+                fetched[key] = fetched.get(key, 0) + 1
+            pages.append({
+                "url": page["url"],
+                "requests": len(entries),
+                "bytes": sum(entry["bytes"] for entry in entries),
+                "cache": cache,
+                "duplicates": {key: count for key, count in fetched.items() if count > 1},
+            })
+        return pages
+
+    def to_har(self):
+        """HAR 1.2 document of everything recorded"""
+        def iso(timestamp):
+            return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="milliseconds")
+        def headers(values):
+            return [{"name": name, "value": value} for name, value in values.items()]
+        return {"log": {
+            "version": "1.2",
+            "creator": {"name": "debug_app.py", "version": "1.0"},
+            "pages": [{"id": page["id"], "title": page["url"], "startedDateTime": iso(page["started"]),
+                       "pageTimings": {}} for page in self.pages],
+            "entries": [{
+                "pageref": entry["pageref"],
+                "startedDateTime": iso(entry["started"]),
+                "time": entry["time_ms"],
+                "request": {"method": entry["method"], "url": entry["url"], "httpVersion": "HTTP/1.1",
+                            "cookies": [], "headers": headers(entry["request_headers"]), "queryString": [],
+                            "headersSize": -1, "bodySize": -1},
+                "response": {"status": entry["status"], "statusText": entry["status_text"], "httpVersion": "HTTP/1.1",
+                             "cookies": [], "headers": headers(entry["response_headers"]), "redirectURL": "",
+                             "content": {"size": entry["bytes"],
+                                         "mimeType": entry["response_headers"].get("content-type", "")},
+                             "headersSize": -1, "bodySize": entry["bytes"]},
+                "cache": {},
+                "timings": {"send": 0, "wait": entry["time_ms"], "receive": 0},
+                "_resourceType": entry["type"],
+                "_cacheStatus": entry["cache"],
+            } for entry in self.entries],
+        }}
+
+    def save_har(self, path):
+        Path(path).write_text(json.dumps(self.to_har(), indent=1), encoding="utf-8")
+
+def cache_status(response, transferred):
+    """'service-worker', 'revalidated' (304), a CDN/Next.js cache header value, 'memory/disk' or 'network'"""
+    if response.from_service_worker:
+        return "service-worker"
+    if response.status == 304:
+        return "revalidated"
+    for header in CACHE_HEADERS:
+        if header in response.headers:
+            return f"{header}: {response.headers[header]}"
+    return "memory/disk" if transferred == 0 else "network"
+
+def print_network_summary(summary):
+    print("=== NETWORK ===")
+    for page in summary:
+        cache = ", ".join(f"{status} {count}" for status, count in sorted(page["cache"].items()))
+        print(f"{page['url']}: {page['requests']} requests, {page['bytes'] / 1024:.1f} KB ({cache})")
+        for key, count in page["duplicates"].items():
+            print(f"  [DUPLICATE] {key} fetched {count} times")
+
+def print_console_logs(console_logs):
     print("=== CONSOLE LOGS ===")
     for log in console_logs:
         try:
             print(log.encode('utf-8', errors='ignore').decode('utf-8'))
         except:
             print("[Error printing log]")
-    
+
+def wait_for_irec_table(page, url, timeout=READY_TIMEOUT_MS):
+    """Navigate and wait for explicit readiness signals, timing each phase
+
+    Phases: navigation (DOMContentLoaded), data fetch (the dados.json response
+    completing, from the browser's own request timing) and table render
+    (#irec-table rows present, "table state" telling data from the error
+    message). Returns {phase: ms since navigation start}; a phase that times
+    out is missing and later phases are not waited for.
+    """
+    phases = {}
+    start = time.perf_counter()
+    start_epoch_ms = time.time() * 1000
+    try:
+        with page.expect_response(lambda response: response.url.split("?")[0].endswith("/dados/dados.json"),
+                                  timeout=timeout) as response_info:
+            page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+            phases["navigation"] = (time.perf_counter() - start) * 1000
+        response = response_info.value
+        response.finished()
+        timing = response.request.timing
+        if timing["responseEnd"] >= 0:
+            phases["data fetch"] = timing["startTime"] + timing["responseEnd"] - start_epoch_ms
+        else:
+            phases["data fetch"] = (time.perf_counter() - start) * 1000
+        phases["data status"] = response.status
+        state = page.wait_for_function(TABLE_RENDERED_JS, timeout=timeout).json_value()
+        phases["table render"] = (time.perf_counter() - start) * 1000
+        phases["table state"] = state
+    except PlaywrightTimeoutError:
+        pass
+    return phases
+
+def print_load_timing(phases, timeout=READY_TIMEOUT_MS):
+    print("=== LOAD TIMING ===")
+    for phase in ("navigation", "data fetch", "table render"):
+        if phase not in phases:
+            print(f"{phase}: TIMEOUT after {timeout} ms")
+            break
+        note = {
+            "data fetch": f" (dados.json HTTP {phases['data status']})",
+            "table render": " (Erro ao carregar shown)" if phases.get("table state") == "error" else "",
+        }.get(phase, "")
+        print(f"{phase}: {phases[phase]:.0f} ms{note}")
+    print()
+
+def debug_irec_brasil(page, base_url, timeout=READY_TIMEOUT_MS, har_path=None):
+    """Original I-REC Brasil check: console logs, load timing, table status and dados.json"""
+    # Capture console logs and every request
+    console_logs = capture_console(page)
+    network = NetworkRecorder().attach(page)
+
+    # Navigate and wait until the table has rendered the data (or the error)
+    phases = wait_for_irec_table(page, f'{base_url}/irec-brasil.html', timeout)
+
+    # Take screenshot
+    page.screenshot(path='debug_irec_brasil.png', full_page=True)
+
+    # Print console logs and how long each phase took
+    print_console_logs(console_logs)
+    print()
+    print_load_timing(phases, timeout)
+
     # Check if table has data or error message
-    print("\n=== TABLE STATUS ===")
+    print("=== TABLE STATUS ===")
     try:
         table_text = page.locator('#irec-table').inner_text()
         if "Erro ao carregar" in table_text:
@@ -40,7 +445,7 @@ with sync_playwright() as p:
             print("WARNING: Table is empty")
     except Exception as e:
         print(f"Error accessing table: {e}")
-    
+
     # Check if dados.json exists by trying to fetch it
     print("\n=== CHECKING dados.json ===")
     result = page.evaluate("""async () => {
@@ -56,7 +461,7 @@ with sync_playwright() as p:
         }
     }""")
     print(f"Fetch result: {result}")
-    
+
     # Try to load the data and see what happens
     print("\n=== TESTING DATA LOADING ===")
     data_result = page.evaluate("""async () => {
@@ -66,8 +471,8 @@ with sync_playwright() as p:
                 return { error: `HTTP ${response.status}: ${response.statusText}` };
             }
             const data = await response.json();
-            return { 
-                success: true, 
+            return {
+                success: true,
                 hasData: !!data.irecBrasil,
                 dataLength: data.irecBrasil ? data.irecBrasil.length : 0
             };
@@ -76,7 +481,508 @@ with sync_playwright() as p:
         }
     }""")
     print(f"Data loading result: {data_result}")
-    
-    browser.close()
-    
-    print("\nScreenshot saved as debug_irec_brasil.png")
+
+    # The page only needs irecBrasil: compare with its shard (npm run shards)
+    print("\n=== CHECKING dados.json SHARDS ===")
+    shard_result = page.evaluate("""async () => {
+        try {
+            const manifest = await (await fetch('./dados/dados.manifest.json')).json();
+            const shard = manifest.shards.irecBrasil;
+            const response = await fetch(`./dados/${shard.path}`);
+            const rows = await response.json();
+            return { path: shard.path, status: response.status, rows: rows.length,
+                     shardBytes: shard.bytes, fullBytes: manifest.bytes };
+        } catch (e) {
+            return { error: e.message };
+        }
+    }""")
+    print(f"Shard result: {shard_result}")
+
+    # Requests of the page and of the checks above, duplicates included
+    print()
+    print_network_summary(network.summary())
+    if har_path:
+        network.save_har(har_path)
+        print(f"HAR saved as {har_path}")
+
+def audit_rendered_contrast(page, base_url, paths, standard="AA"):
+    """Score the rendered text of each page with the wcag_audit.py engine"""
+    print("=== RENDERED CONTRAST AUDIT ===")
+    failures = 0
+    for path in paths:
+        url = f"{base_url}/{path.lstrip('/')}"
+        page.goto(url)
+        page.wait_for_load_state('networkidle')
+        nodes = page.evaluate(COLLECT_TEXT_STYLES_JS)
+        failures += len(wcag_audit.score_rendered_nodes(url, nodes, standard=standard))
+    print(f"Elements failing {wcag_audit.standard_title(standard)}: {failures}")
+    return failures
+
+def route_path(page_file, routes_dir=PUBLIC_ROUTES_DIR):
+    """URL path of a page.tsx, dropping route groups such as (public)"""
+    parts = [part for part in page_file.parent.relative_to(routes_dir).parts
+             if not (part.startswith("(") and part.endswith(")"))]
+    return "/" + "/".join(parts)
+
+def discover_public_routes(routes_dir=PUBLIC_ROUTES_DIR):
+    """URL paths of every page.tsx under (public), minus route groups
+
+    Dynamic segments ([username], ...) have no URL without real data, so
+    those routes are returned separately as skipped.
+    """
+    routes, skipped = [], []
+    for page_file in sorted(routes_dir.rglob("page.tsx")):
+        route = route_path(page_file, routes_dir)
+        (skipped if "[" in route else routes).append(route)
+    return routes, skipped
+
+def discover_locales(messages_dir=MESSAGES_DIR, routing_ts=ROUTING_TS):
+    """(locales from messages/*.json, default locale from the next-intl routing)"""
+    locales = sorted(path.stem for path in messages_dir.glob("*.json"))
+    match = re.search(r"defaultLocale:\s*['\"](\w+)['\"]", routing_ts.read_text(encoding="utf-8"))
+    default = match.group(1) if match else locales[0]
+    return [default] + [locale for locale in locales if locale != default], default
+
+def locale_url(base_url, locale, route, default_locale):
+    """URL of a route in a locale; the default locale has no prefix (localePrefix: 'as-needed')"""
+    prefix = "" if locale == default_locale else f"/{locale}"
+    return f"{base_url.rstrip('/')}{prefix}{route}"
+
+class AuthState:
+    """Playwright storage_state of one login, saved to disk and reused until it stops working"""
+
+    def __init__(self, base_url, email=debug_server.STAND_IN_EMAIL, password=debug_server.STAND_IN_PASSWORD,
+                 path=AUTH_STATE):
+        self.base_url = base_url.rstrip("/")
+        self.email = email
+        self.password = password
+        self.path = Path(path)
+
+    def valid(self):
+        """Whether the saved state holds an unexpired Supabase session cookie for base_url"""
+        if not self.path.exists():
+            return False
+        host = urlsplit(self.base_url).hostname
+        now = time.time()
+        return any(cookie["name"].startswith("sb-") and cookie["domain"].lstrip(".") == host
+                   and (cookie["expires"] < 0 or cookie["expires"] > now)
+                   for cookie in json.loads(self.path.read_text(encoding="utf-8")).get("cookies", []))
+
+    async def login(self, browser, timeout=READY_TIMEOUT_MS):
+        """Sign in through the login form once and save the resulting cookies and storage"""
+        context = await browser.new_context()
+        try:
+            page = await context.new_page()
+            await page.goto(f"{self.base_url}/login", timeout=timeout)
+            await page.fill('input[name="email"]', self.email)
+            await page.fill('input[name="password"]', self.password)
+            # Implicit submission goes through the form's first button, the password login
+            await page.press('input[name="password"]', "Enter")
+            await page.wait_for_url(lambda url: "/login" not in urlsplit(url).path, timeout=timeout)
+            await context.storage_state(path=str(self.path))
+        finally:
+            await context.close()
+        print(f"Signed in as {self.email}, session saved to {self.path.name}")
+
+    async def ensure(self, browser, timeout=READY_TIMEOUT_MS, force=False):
+        """Path of a usable storage_state, logging in only when the saved one is missing or stale"""
+        if force or not self.valid():
+            await self.login(browser, timeout)
+        else:
+            print(f"Reusing the session in {self.path.name}")
+        return str(self.path)
+
+def redirected_to_login(url, page_url):
+    return urlsplit(page_url).path.rstrip("/").endswith("/login") and not urlsplit(url).path.endswith("/login")
+
+async def check_page(context, url, timeout, vitals=False, screenshot_dir=None):
+    """Load one URL in a fresh page of a shared context, with console capture and table checks
+
+    With vitals, the context must have VITALS_INIT_JS installed; the page's
+    metrics and heaviest resources are added to the result. With
+    screenshot_dir, a full-page capture is saved there for debug_visual.
+    """
+    page = await context.new_page()
+    console_logs = capture_console(page)
+    network = NetworkRecorder().attach(page)
+    start = time.perf_counter()
+    result = {"url": url, "status": None, "console": console_logs, "tables": 0, "rows": 0, "error": None}
+    try:
+        response = await page.goto(url, wait_until="load", timeout=timeout)
+        result["status"] = response.status if response else None
+        if redirected_to_login(url, page.url):
+            result["login_redirect"] = True
+            raise RuntimeError("Redirected to /login")
+        await page.wait_for_function(TABLES_READY_JS, timeout=timeout)
+        table = await page.evaluate(TABLE_STATUS_JS)
+        result.update(tables=table["tables"], rows=table["rows"])
+        if table["error"]:
+            result["error"] = "Erro ao carregar"
+        if vitals:
+            result["vitals"] = await page.evaluate(COLLECT_VITALS_JS)
+        if screenshot_dir:
+            result["screenshot"] = Path(screenshot_dir) / (re.sub(r"[^\w.-]+", "_", url) + ".png")
+            await page.screenshot(path=str(result["screenshot"]), full_page=True)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {str(e).splitlines()[0]}"
+    finally:
+        result["ms"] = (time.perf_counter() - start) * 1000
+        await network.flush()
+        await page.close()
+        result["network"] = network
+    return result
+
+async def crawl(urls, concurrency=CRAWL_CONCURRENCY, timeout=READY_TIMEOUT_MS, headless=True, vitals=False,
+                screenshot_dir=None, auth=None):
+    """Check every URL with one browser and a bounded pool of contexts; results in URL order
+
+    With auth, every context of the pool starts from its saved storage_state;
+    if pages still bounce to /login, it signs in again once and retries them.
+    """
+    results = [None] * len(urls)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        storage_state = await auth.ensure(browser, timeout) if auth else None
+
+        async def worker(queue):
+            context = await browser.new_context(storage_state=storage_state)
+            if vitals:
+                await context.add_init_script(VITALS_INIT_JS)
+            try:
+                while not queue.empty():
+                    index, url = queue.get_nowait()
+                    results[index] = await check_page(context, url, timeout, vitals, screenshot_dir)
+                    print_crawl_result(results[index])
+            finally:
+                await context.close()
+
+        async def run_pool(indices):
+            queue = asyncio.Queue()
+            for index in indices:
+                queue.put_nowait((index, urls[index]))
+            await asyncio.gather(*(worker(queue) for _ in range(min(concurrency, len(indices)))))
+
+        await run_pool(range(len(urls)))
+        stale = [index for index, result in enumerate(results) if result.get("login_redirect")]
+        if auth and stale:
+            print(f"{len(stale)} pages redirected to /login; signing in again")
+            storage_state = await auth.ensure(browser, timeout, force=True)
+            await run_pool(stale)
+        await browser.close()
+    return results
+
+def print_crawl_result(result):
+    problem = result["error"] or (f"HTTP {result['status']}" if (result["status"] or 0) >= 400 else None)
+    errors = sum(1 for log in result["console"] if log.startswith("[error]"))
+    status = "[FAIL]" if problem else "[PASS]"
+    tables = f", {result['tables']} tables/{result['rows']} rows" if result["tables"] else ""
+    print(f"{status} {result['url']} - HTTP {result['status']}, {result['ms']:.0f} ms, "
+          f"{errors} console errors{tables}{f' - {problem}' if problem else ''}")
+    for log in result["console"]:
+        if log.startswith(("[error]", "[warning]")):
+            print(f"    {log}")
+    for page in result["network"].summary():
+        for key, count in page["duplicates"].items():
+            print(f"    [DUPLICATE] {key} fetched {count} times")
+
+def load_vitals_history(path=VITALS_HISTORY):
+    """{url: [metrics, ...]} from the time series, oldest first"""
+    history = {}
+    if path.exists():
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                entry = json.loads(line)
+                history.setdefault(entry["url"], []).append(entry["metrics"])
+    return history
+
+def append_vitals_history(results, path=VITALS_HISTORY):
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+    with path.open("a", encoding="utf-8") as history:
+        for result in results:
+            if "vitals" in result:
+                entry = {"timestamp": timestamp, "url": result["url"], "metrics": result["vitals"]["metrics"]}
+                history.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+def find_vitals_regressions(results, history, tolerance=VITALS_TOLERANCE, window=VITALS_WINDOW):
+    """(url, metric, value, baseline) for metrics above the median of the last runs by more than tolerance"""
+    regressions = []
+    for result in results:
+        past = history.get(result["url"], [])[-window:]
+        if "vitals" not in result or not past:
+            continue
+        for metric, value in result["vitals"]["metrics"].items():
+            baseline = statistics.median(run.get(metric, 0) for run in past)
+            if value > baseline * (1 + tolerance) and value - baseline > VITALS_NOISE_FLOOR.get(metric, 0):
+                regressions.append((result["url"], metric, value, baseline))
+    return regressions
+
+def print_vitals(results, regressions, chart_urls=()):
+    print("\n=== WEB VITALS ===")
+    print(f"{'page':<48} {'TTFB':>6} {'FCP':>6} {'LCP':>6} {'CLS':>6} {'TBT':>6} {'heap MB':>8} {'KB':>8}")
+    for result in results:
+        if "vitals" not in result:
+            continue
+        m = result["vitals"]["metrics"]
+        name = result["url"].split("://", 1)[-1].split("/", 1)[-1] or "/"
+        name = f"/{name}{' *' if result['url'] in chart_urls else ''}"
+        print(f"{name:<48} {m['ttfb_ms']:>6.0f} {m['fcp_ms']:>6.0f} {m['lcp_ms']:>6.0f} {m['cls']:>6.3f} "
+              f"{m['tbt_ms']:>6.0f} {m['js_heap_mb']:>8.1f} {m['transfer_kb']:>8.0f}")
+    if chart_urls:
+        print("* renders src/components/charts")
+    print()
+    if not regressions:
+        print("[PASS] No metric regressed past the baseline")
+    for url, metric, value, baseline in regressions:
+        print(f"[FAIL] {url}: {metric} {value:.2f} vs baseline {baseline:.2f}")
+
+def renders_charts(route, routes_dir=PUBLIC_ROUTES_DIR):
+    """Whether the route's page.tsx imports one of src/components/charts"""
+    for page_file in routes_dir.rglob("page.tsx"):
+        if route_path(page_file, routes_dir) == route:
+            return "components/charts" in page_file.read_text(encoding="utf-8")
+    return False
+
+def save_crawl_har(results, path):
+    """One HAR for the whole crawl, every navigation as its own page"""
+    merged = NetworkRecorder()
+    for result in results:
+        recorder = result["network"]
+        ids = {page["id"]: f"page_{len(merged.pages) + i + 1}" for i, page in enumerate(recorder.pages)}
+        merged.pages += [{**page, "id": ids[page["id"]]} for page in recorder.pages]
+        merged.entries += [{**entry, "pageref": ids.get(entry["pageref"], entry["pageref"])} for entry in recorder.entries]
+    merged.save_har(path)
+
+def crawl_public_routes(base_url, concurrency=CRAWL_CONCURRENCY, timeout=READY_TIMEOUT_MS, headless=True,
+                        vitals=False, tolerance=VITALS_TOLERANCE, har_path=None, visual=False, update_visual=False,
+                        auth=None):
+    """Check every public route in every locale concurrently; returns the failing results
+
+    With auth, the signed-in DASHBOARD_ROUTES are checked instead, every
+    context reusing the one saved login.
+
+    With vitals, metrics are compared against the on-disk history, then
+    appended to it; pages whose metrics regressed count as failing. With
+    visual, full-page captures are compared against their stored fingerprints
+    and discarded; pages that changed count as failing.
+    """
+    routes, skipped = (list(DASHBOARD_ROUTES), []) if auth else discover_public_routes()
+    locales, default_locale = discover_locales()
+    urls = [locale_url(base_url, locale, route, default_locale) for locale in locales for route in routes]
+    print(f"=== CRAWL: {len(routes)} routes x {len(locales)} locales ({', '.join(locales)}) = {len(urls)} pages ===")
+    if skipped:
+        print(f"Skipped dynamic routes: {', '.join(skipped)}")
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="debug-visual-") as screenshot_dir:
+        results = asyncio.run(crawl(urls, concurrency, timeout, headless, vitals, screenshot_dir if visual else None,
+                                    auth))
+        if visual:
+            # Imported here so the other modes do not need numpy
+            import debug_visual
+            captures = {debug_visual.page_key(r["url"]): r["screenshot"] for r in results if r.get("screenshot")}
+            visual_results = debug_visual.compare_captures(captures, update=update_visual)
+    failed = [r for r in results if r["error"] or (r["status"] or 0) >= 400]
+    requests = sum(len(r["network"].entries) for r in results)
+    duplicates = sum(count - 1 for r in results for page in r["network"].summary()
+                     for count in page["duplicates"].values())
+    print(f"\n{requests} requests, {duplicates} duplicate fetches within a navigation")
+    if har_path:
+        save_crawl_har(results, har_path)
+        print(f"HAR saved as {har_path}")
+    print(f"{len(results) - len(failed)}/{len(results)} pages OK in {time.perf_counter() - start:.1f} s "
+          f"({concurrency} contexts)")
+    if vitals:
+        chart_urls = {locale_url(base_url, locale, route, default_locale)
+                      for route in routes if renders_charts(route) for locale in locales}
+        regressions = find_vitals_regressions(results, load_vitals_history(), tolerance)
+        print_vitals(results, regressions, chart_urls)
+        append_vitals_history(results)
+        regressed = {url for url, *_ in regressions}
+        failed += [r for r in results if r["url"] in regressed and r not in failed]
+    if visual:
+        print()
+        debug_visual.print_visual_report(visual_results)
+        changed = {result["key"] for result in visual_results if result["status"] == "changed"}
+        if not update_visual:
+            failed += [r for r in results if debug_visual.page_key(r["url"]) in changed and r not in failed]
+    return failed
+
+def load_worker(base_url, paths, deadline, remaining, lock, timeout_s):
+    """One client with one pooled keep-alive connection; returns [(path, status, seconds, bytes)]"""
+    url = urlsplit(base_url)
+    connection_class = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+    connection = None
+    samples = []
+    index = 0
+    while time.perf_counter() < deadline:
+        with lock:
+            if remaining[0] == 0:
+                break
+            remaining[0] -= 1
+        path = paths[index % len(paths)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            connection = connection or connection_class(url.netloc, timeout=timeout_s)
+            connection.request("GET", url.path.rstrip("/") + path)
+            response = connection.getresponse()
+            size = len(response.read())
+            samples.append((path, response.status, time.perf_counter() - start, size))
+            if response.will_close:
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException):
+            samples.append((path, 0, time.perf_counter() - start, 0))
+            if connection:
+                connection.close()
+            connection = None
+    if connection:
+        connection.close()
+    return samples
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    return sorted_values[min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))]
+
+def run_load(base_url, paths=LOAD_PATHS, clients=LOAD_CLIENTS, duration_s=LOAD_DURATION_S, requests=None,
+             timeout_s=READY_TIMEOUT_MS / 1000):
+    """Drive concurrent clients against the data endpoints; returns {path: stats}
+
+    Each client thread holds one keep-alive connection and cycles through
+    the paths until the duration is over or the total request budget is spent.
+    """
+    remaining = [requests if requests else -1]
+    lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = start + duration_s
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        futures = [pool.submit(load_worker, base_url, list(paths[i % len(paths):] + paths[:i % len(paths)]),
+                               deadline, remaining, lock, timeout_s) for i in range(clients)]
+        samples = [sample for future in futures for sample in future.result()]
+    elapsed = time.perf_counter() - start
+
+    stats = {}
+    for path in paths:
+        mine = [sample for sample in samples if sample[0] == path]
+        latencies = sorted(seconds * 1000 for _, status, seconds, _ in mine if 200 <= status < 400)
+        stats[path] = {
+            "requests": len(mine),
+            "errors": sum(1 for _, status, _, _ in mine if not 200 <= status < 400),
+            "rps": len(mine) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 0.50) if latencies else None,
+            "p95_ms": percentile(latencies, 0.95) if latencies else None,
+            "p99_ms": percentile(latencies, 0.99) if latencies else None,
+            "max_ms": latencies[-1] if latencies else None,
+            "mb": sum(size for _, _, _, size in mine) / 1e6,
+        }
+    return stats, elapsed
+
+def print_load_report(stats, elapsed, clients):
+    total = sum(entry["requests"] for entry in stats.values())
+    print(f"=== LOAD: {clients} clients, {elapsed:.1f} s, {total} requests, {total / elapsed:.1f} req/s ===")
+    print(f"{'endpoint':<36} {'reqs':>7} {'errors':>7} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'MB':>8}")
+    for path, entry in stats.items():
+        ms = [f"{entry[key]:>8.1f}" if entry[key] is not None else f"{'-':>8}"
+              for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")]
+        print(f"{path:<36} {entry['requests']:>7} {entry['errors']:>7} {entry['rps']:>8.1f} {' '.join(ms)} "
+              f"{entry['mb']:>8.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Playwright debugging harness for Sintropia Carbono pages")
+    parser.add_argument("--base-url", default=None,
+                        help=f"server the pages are loaded from (default: {BASE_URL}, {APP_BASE_URL} for --crawl)")
+    parser.add_argument("--audit-contrast", nargs="*", metavar="PATH",
+                        help=f"score rendered text contrast on these pages (default: {DEFAULT_PAGE})")
+    parser.add_argument("--crawl", action="store_true",
+                        help="check every public route in every locale concurrently (headless)")
+    parser.add_argument("--dashboard", action="store_true",
+                        help=f"crawl the signed-in (dashboard) routes instead, reusing the login saved in "
+                             f"{AUTH_STATE.name}; with --stand-in, the app must use it as NEXT_PUBLIC_SUPABASE_URL")
+    parser.add_argument("--email", default=debug_server.STAND_IN_EMAIL,
+                        help="--dashboard login (default: the stand-in account)")
+    parser.add_argument("--password", default=debug_server.STAND_IN_PASSWORD, help="--dashboard login password")
+    parser.add_argument("--headless", action="store_true", help="run the single-page checks without a browser window")
+    parser.add_argument("--concurrency", type=int, default=CRAWL_CONCURRENCY,
+                        help=f"browser contexts --crawl keeps open at once (default: {CRAWL_CONCURRENCY})")
+    parser.add_argument("--vitals", action="store_true",
+                        help=f"with --crawl: record web vitals, compare with and append to {VITALS_HISTORY.name} "
+                             "(use --concurrency 1 for stable numbers)")
+    parser.add_argument("--tolerance", type=float, default=VITALS_TOLERANCE,
+                        help="allowed metric increase over the baseline (0.2 = 20%%)")
+    parser.add_argument("--har", metavar="PATH", help="export every recorded request as a HAR file")
+    parser.add_argument("--visual", action="store_true",
+                        help="compare full-page screenshots against the fingerprints in .debug-visual")
+    parser.add_argument("--update-visual", action="store_true",
+                        help="with --visual: accept changed screenshots as the new baseline")
+    parser.add_argument("--load", nargs="*", metavar="PATH",
+                        help=f"load-test these endpoints with plain HTTP clients (default: {' '.join(LOAD_PATHS)})")
+    parser.add_argument("--clients", type=int, default=LOAD_CLIENTS,
+                        help=f"concurrent --load clients, one pooled connection each (default: {LOAD_CLIENTS})")
+    parser.add_argument("--duration", type=float, default=LOAD_DURATION_S,
+                        help=f"seconds --load runs for (default: {LOAD_DURATION_S:g})")
+    parser.add_argument("--requests", type=int, default=None, help="stop --load after this many requests")
+    parser.add_argument("--stand-in", action="store_true",
+                        help="serve public/ and mocked /api routes from an in-process stand-in server")
+    parser.add_argument("--timeout", type=int, default=READY_TIMEOUT_MS,
+                        help=f"ms to wait for each readiness phase (default: {READY_TIMEOUT_MS})")
+    parser.add_argument("--standard", choices=list(wcag_audit.STANDARDS), default="AA",
+                        help="standard --audit-contrast judges text against (default: AA)")
+    debug_server.add_throttle_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.stand_in and args.dashboard:
+        # The app reaches it as Supabase, so it needs a port known before the app starts
+        server, supabase_url = debug_server.start_stand_in(debug_server.DEFAULT_PORT,
+                                                           debug_server.throttle_from_args(args))
+        print(f"Stand-in Supabase on {supabase_url} (start the app with NEXT_PUBLIC_SUPABASE_URL={supabase_url})")
+    elif args.stand_in:
+        server, args.base_url = debug_server.start_stand_in(throttle=debug_server.throttle_from_args(args))
+        print(f"Stand-in server on {args.base_url}")
+    try:
+        return run(args)
+    finally:
+        if server:
+            server.shutdown()
+
+def run(args):
+    """Run the mode selected on the command line; returns the exit status"""
+    if args.load is not None:
+        stats, elapsed = run_load(args.base_url or APP_BASE_URL, tuple(args.load or LOAD_PATHS), args.clients,
+                                  args.duration, args.requests, args.timeout / 1000)
+        print_load_report(stats, elapsed, args.clients)
+        return 1 if any(entry["errors"] for entry in stats.values()) else 0
+    if args.crawl or args.dashboard:
+        base_url = args.base_url or APP_BASE_URL
+        auth = AuthState(base_url, args.email, args.password) if args.dashboard else None
+        failed = crawl_public_routes(base_url, args.concurrency, args.timeout,
+                                     vitals=args.vitals, tolerance=args.tolerance, har_path=args.har,
+                                     visual=args.visual, update_visual=args.update_visual, auth=auth)
+        return 1 if failed else 0
+    args.base_url = args.base_url or BASE_URL
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=args.headless)
+        page = browser.new_page()
+        status = 0
+        if args.audit_contrast is not None:
+            status = 1 if audit_rendered_contrast(page, args.base_url, args.audit_contrast or [DEFAULT_PAGE],
+                                               args.standard) else 0
+        else:
+            debug_irec_brasil(page, args.base_url, args.timeout, args.har)
+        browser.close()
+
+    if args.audit_contrast is None:
+        print("\nScreenshot saved as debug_irec_brasil.png")
+        if args.visual:
+            import debug_visual
+            print()
+            results = debug_visual.compare_captures({"irec-brasil": "debug_irec_brasil.png"},
+                                                    update=args.update_visual)
+            debug_visual.print_visual_report(results)
+            if any(result["status"] == "changed" for result in results) and not args.update_visual:
+                status = 1
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Local stand-in server for the debug_app.py harness
+Serves public/ (dados.json, CarbonPlan/projects.csv, ...) and mocks the
+Supabase-backed API routes from the same CSV, with configurable latency,
+bandwidth and error injection to reproduce slow or flaky links.
+Also stands in for Supabase auth and REST, with a single moderator account,
+when the app is started with NEXT_PUBLIC_SUPABASE_URL pointing here
+"""
+
+import argparse
+import base64
+import csv
+import fnmatch
+import hashlib
+import hmac
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from carbon_plan_data import load_continents
+
+ROOT = Path(__file__).resolve().parent
+PUBLIC_DIR = ROOT / "public"
+PROJECTS_CSV = PUBLIC_DIR / "dados" / "CarbonPlan" / "projects.csv"
+DEFAULT_PORT = 8000
+
+# Bytes written between bandwidth checks
+CHUNK_SIZE = 16 * 1024
+
+# The one account the stand-in auth knows; a moderator so (dashboard)/mod renders
+STAND_IN_EMAIL = "debug@sintropia.local"
+STAND_IN_PASSWORD = "debug-password"
+# Lifetime of stand-in access tokens; refresh tokens never expire
+ACCESS_TOKEN_TTL_S = 3600
+
+class Throttle:
+    """Latency, bandwidth and error injection applied to every response"""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, bandwidth_kbps=0, error_rate=0.0, error_status=503,
+                 error_paths=("*",), seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.bandwidth_kbps = bandwidth_kbps
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.error_paths = tuple(error_paths)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self):
+        """Sleep for the configured latency plus uniform jitter"""
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        if self.latency_ms or jitter:
+            time.sleep(max(0.0, self.latency_ms + jitter) / 1000)
+
+    def should_fail(self, path):
+        if not self.error_rate or not any(fnmatch.fnmatch(path, pattern) for pattern in self.error_paths):
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def write(self, stream, data):
+        """Write data, paced to the configured bandwidth (kilobits per second)"""
+        if not self.bandwidth_kbps:
+            stream.write(data)
+            return
+        bytes_per_second = self.bandwidth_kbps * 1000 / 8
+        start = time.perf_counter()
+        for offset in range(0, len(data), CHUNK_SIZE):
+            stream.write(data[offset:offset + CHUNK_SIZE])
+            ahead = (offset + CHUNK_SIZE) / bytes_per_second - (time.perf_counter() - start)
+            if ahead > 0:
+                time.sleep(ahead)
+
+class CarbonProjects:
+    """projects.csv standing in for the carbon_projects table, loaded once on first use"""
+
+    def __init__(self, path=PROJECTS_CSV):
+        self.path = path
+        self._projects = None
+        self._stats = None
+        self._lock = threading.Lock()
+
+    def projects(self):
+        with self._lock:
+            if self._projects is None:
+                with self.path.open(encoding="utf-8", newline="") as source:
+                    # Kept in the route's .order('country') so queries never sort
+                    self._projects = sorted(csv.DictReader(source), key=lambda project: project["country"])
+                self._stats = self._compute_stats(self._projects)
+        return self._projects
+
+    @staticmethod
+    def _compute_stats(projects):
+        continents = load_continents()
+        stats = {"countryStats": {}, "continentStats": {}, "categoryStats": {}, "creditsByCountry": {},
+                 "vintageStats": {}}
+        total_credits = 0
+        for project in projects:
+            country, issued = project["country"], int(project["issued"] or 0)
+            continent = continents.get(country, "Unknown")
+            for key, value in (("countryStats", country), ("continentStats", continent),
+                               ("categoryStats", project["category"])):
+                stats[key][value] = stats[key].get(value, 0) + 1
+            # Issued credits stand in for the carbon_credits quantities
+            total_credits += issued
+            stats["creditsByCountry"][country] = stats["creditsByCountry"].get(country, 0) + issued
+            year = project["first_issuance_at"][:4]
+            if year and issued:
+                stats["vintageStats"][year] = stats["vintageStats"].get(year, 0) + issued
+        return {
+            "totalProjects": len(projects),
+            "forestProjects": stats["categoryStats"].get("forest", 0),
+            "countries": len(stats["countryStats"]),
+            "continents": len(stats["continentStats"]),
+            "totalCredits": total_credits,
+            **stats,
+        }
+
+    def query(self, params):
+        """Same filters, pagination and response shape as GET /api/carbon-projects"""
+        projects = self.projects()
+        country, category = params.get("country"), params.get("category")
+        search = (params.get("search") or "").lower()
+        limit, offset = int(params.get("limit") or 100), int(params.get("offset") or 0)
+        matches = [
+            project for project in projects
+            if (not country or project["country"] == country)
+            and (not category or project["category"] == category)
+            and (not search or search in project["name"].lower() or search in project["project_id"].lower())
+        ]
+        return {
+            "projects": matches[offset:offset + limit],
+            "stats": self._stats,
+            "pagination": {"total": len(projects), "limit": limit, "offset": offset},
+        }
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+class StandInAuth:
+    """Just enough of Supabase auth (GoTrue) and REST (PostgREST) for one signed-in moderator
+
+    Tokens are signed with a per-process secret, so a session saved against
+    one server run is refused by the next and the client has to sign in again.
+    profiles holds the account's row; every other table is empty.
+    """
+
+    def __init__(self, email=STAND_IN_EMAIL, password=STAND_IN_PASSWORD, role="moderator"):
+        self.email = email
+        self.password = password
+        self.secret = uuid.uuid4().bytes
+        created = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        self.user = {"id": str(uuid.uuid5(uuid.NAMESPACE_DNS, email)), "aud": "authenticated",
+                     "role": "authenticated", "email": email, "email_confirmed_at": created,
+                     "app_metadata": {"provider": "email", "providers": ["email"]}, "user_metadata": {},
+                     "created_at": created, "updated_at": created}
+        self.profile = {"id": self.user["id"], "username": email.split("@")[0], "display_name": "Debug",
+                        "role": role, "karma": 0, "user_type": None, "avatar_url": None, "bio": None,
+                        "cargo": None, "organization": None, "linkedin_url": None, "twitter_url": None,
+                        "created_at": created, "updated_at": created}
+        self._refresh_tokens = set()
+        self._lock = threading.Lock()
+
+    def _sign(self, payload):
+        head = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+        body = _b64url(json.dumps(payload, separators=(",", ":")).encode())
+        signature = hmac.new(self.secret, f"{head}.{body}".encode(), hashlib.sha256).digest()
+        return f"{head}.{body}.{_b64url(signature)}"
+
+    def session(self):
+        now = int(time.time())
+        refresh_token = uuid.uuid4().hex
+        with self._lock:
+            self._refresh_tokens.add(refresh_token)
+        access_token = self._sign({"sub": self.user["id"], "email": self.email, "aud": "authenticated",
+                                   "role": "authenticated", "iat": now, "exp": now + ACCESS_TOKEN_TTL_S,
+                                   "session_id": uuid.uuid4().hex})
+        return {"access_token": access_token, "token_type": "bearer", "expires_in": ACCESS_TOKEN_TTL_S,
+                "expires_at": now + ACCESS_TOKEN_TTL_S, "refresh_token": refresh_token, "user": self.user}
+
+    def grant(self, grant_type, body):
+        """Session for a password or refresh_token grant, or None if it is refused"""
+        if grant_type == "password":
+            if body.get("email") == self.email and body.get("password") == self.password:
+                return self.session()
+        elif grant_type == "refresh_token":
+            with self._lock:
+                known = body.get("refresh_token") in self._refresh_tokens
+                self._refresh_tokens.discard(body.get("refresh_token"))
+            if known:
+                return self.session()
+        return None
+
+    def authorized(self, header):
+        """Whether an Authorization header carries a live access token of ours"""
+        token = (header or "").removeprefix("Bearer ").strip()
+        parts = token.split(".")
+        if len(parts) != 3:
+            return False
+        expected = hmac.new(self.secret, f"{parts[0]}.{parts[1]}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(_b64url(expected), parts[2]):
+            return False
+        payload = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+        return payload.get("exp", 0) > time.time()
+
+    def rows(self, table, params):
+        """Rows of a table matching the query's eq. filters (other operators are ignored)"""
+        rows = [self.profile] if table == "profiles" else []
+        filters = {key: value[3:] for key, value in params.items() if value.startswith("eq.")}
+        return [row for row in rows if all(str(row.get(key)).lower() == value.lower()
+                                           for key, value in filters.items() if key in row)]
+
+class StandInHandler(SimpleHTTPRequestHandler):
+    """Static files from public/ (precompressed when accepted) and mocked API routes, behind the throttle"""
+
+    # Keep-alive, so load tests can reuse pooled connections
+    protocol_version = "HTTP/1.1"
+    throttle = Throttle()
+    carbon_projects = CarbonProjects()
+    auth = StandInAuth()
+    quiet = True
+
+    def do_GET(self):
+        self._serve(head=False)
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def do_POST(self):
+        self._serve(head=False)
+
+    def do_OPTIONS(self):
+        # CORS preflight of the browser Supabase client
+        self.read_body()
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, HEAD, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", self.headers.get("Access-Control-Request-Headers", "*"))
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _serve(self, head):
+        url = urlsplit(self.path)
+        # Read up front: early replies would otherwise leave the body to be
+        # parsed as the next request on the kept-alive connection
+        self.body = self.read_body()
+        self.throttle.delay()
+        if self.throttle.should_fail(url.path):
+            self.send_json({"error": "Injected failure", "fallback": True}, self.throttle.error_status)
+            return
+        if url.path.startswith("/api/"):
+            self.handle_api(url)
+        elif url.path.startswith("/auth/v1/"):
+            self.handle_auth(url)
+        elif url.path.startswith("/rest/v1/"):
+            self.handle_rest(url)
+        elif self.command not in ("GET", "HEAD"):
+            self.send_error(405)
+        elif self.send_precompressed(url.path, head):
+            return
+        elif head:
+            super().do_HEAD()
+        else:
+            super().do_GET()
+
+    def handle_api(self, url):
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path == "/api/carbon-projects" and self.command == "GET":
+            self.send_json(self.carbon_projects.query(params),
+                           headers={"Cache-Control": "public, s-maxage=3600, stale-while-revalidate=86400"})
+        elif url.path == "/api/debug":
+            self.send_json({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "url": self.path,
+                            "method": self.command, "standIn": True})
+        elif url.path.startswith(("/api/admin/", "/api/carbon-plan/upload/")):
+            self.send_json({"error": "Unauthorized"}, 401)
+        else:
+            self.send_json({"error": "Not found"}, 404)
+
+    def read_body(self):
+        """The request body; a body the stand-in cannot delimit closes the connection instead"""
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            self.close_connection = True
+            return b""
+        return self.rfile.read(length) if length else b""
+
+    def read_json(self):
+        try:
+            return json.loads(self.body or b"{}")
+        except ValueError:
+            return {}
+
+    def handle_auth(self, url):
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        cors = {"Access-Control-Allow-Origin": "*"}
+        if url.path == "/auth/v1/token" and self.command == "POST":
+            session = self.auth.grant(params.get("grant_type"), self.read_json())
+            if session:
+                self.send_json(session, headers=cors)
+            else:
+                self.send_json({"error": "invalid_grant", "error_description": "Invalid login credentials"}, 400,
+                               headers=cors)
+        elif url.path == "/auth/v1/user":
+            if self.auth.authorized(self.headers.get("Authorization")):
+                self.send_json(self.auth.user, headers=cors)
+            else:
+                self.send_json({"code": 401, "msg": "invalid JWT"}, 401, headers=cors)
+        elif url.path == "/auth/v1/logout" and self.command == "POST":
+            self.send_response(204)
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self.send_json({"error": "Not found"}, 404, headers=cors)
+
+    def handle_rest(self, url):
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        rows = self.auth.rows(url.path.removeprefix("/rest/v1/").strip("/"), params)
+        if not self.auth.authorized(self.headers.get("Authorization")):
+            # Row level security: anonymous requests see no profile rows
+            rows = []
+        headers = {"Access-Control-Allow-Origin": "*",
+                   "Content-Range": f"0-{len(rows) - 1}/{len(rows)}" if rows else "*/0"}
+        if "application/vnd.pgrst.object+json" in self.headers.get("Accept", ""):
+            if len(rows) == 1:
+                self.send_json(rows[0], headers=headers)
+            else:
+                self.send_json({"code": "PGRST116", "message": "JSON object requested, multiple (or no) rows returned",
+                                "details": f"The result contains {len(rows)} rows", "hint": None}, 406, headers)
+        else:
+            self.send_json(rows, headers=headers)
+
+    def send_precompressed(self, path, head):
+        """Serve a .br or .gz sibling the client accepts, as a CDN would; False if there is none"""
+        accepted = {encoding.split(";")[0].strip() for encoding in self.headers.get("Accept-Encoding", "").split(",")}
+        target = Path(self.translate_path(path))
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            variant = target.with_name(target.name + suffix)
+            if encoding in accepted and target.is_file() and variant.is_file():
+                body = variant.read_bytes()
+                self.send_response(200)
+                self.send_header("Content-Type", self.guess_type(str(target)))
+                self.send_header("Content-Encoding", encoding)
+                self.send_header("Vary", "Accept-Encoding")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if not head:
+                    self.throttle.write(self.wfile, body)
+                return True
+        return False
+
+    def send_json(self, payload, status=200, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.throttle.write(self.wfile, body)
+
+    def copyfile(self, source, outputfile):
+        if not self.throttle.bandwidth_kbps:
+            super().copyfile(source, outputfile)
+            return
+        self.throttle.write(outputfile, source.read())
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+def start_stand_in(port=0, throttle=None, directory=PUBLIC_DIR, quiet=True):
+    """Serve in a background thread; returns (server, base_url). Stop with server.shutdown()"""
+    handler = type("ConfiguredStandInHandler", (StandInHandler,), {
+        "throttle": throttle or Throttle(),
+        "carbon_projects": CarbonProjects(),
+        "auth": StandInAuth(),
+        "quiet": quiet,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), partial(handler, directory=str(directory)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def add_throttle_arguments(parser):
+    group = parser.add_argument_group("stand-in server throttling")
+    group.add_argument("--latency", type=float, default=0, help="ms added before every response")
+    group.add_argument("--jitter", type=float, default=0, help="+/- ms of uniform jitter on the latency")
+    group.add_argument("--bandwidth", type=float, default=0, help="kbit/s per response (0: unlimited)")
+    group.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with an error")
+    group.add_argument("--error-status", type=int, default=503, help="HTTP status of injected errors")
+    group.add_argument("--error-path", action="append", default=None, metavar="GLOB",
+                       help="only inject errors on matching paths (repeatable, default: all)")
+    group.add_argument("--seed", type=int, default=None, help="seed for jitter and error injection")
+    return group
+
+def throttle_from_args(args):
+    return Throttle(args.latency, args.jitter, args.bandwidth, args.error_rate, args.error_status,
+                    args.error_path or ("*",), args.seed)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in server for the Sintropia Carbono debug harness")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    add_throttle_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server, base_url = start_stand_in(args.port, throttle_from_args(args), quiet=not args.verbose)
+    print(f"Serving {PUBLIC_DIR} and mocked /api routes on {base_url} (Ctrl+C to stop)")
+    print(f"Stand-in Supabase: NEXT_PUBLIC_SUPABASE_URL={base_url}, sign in as {STAND_IN_EMAIL} / {STAND_IN_PASSWORD}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
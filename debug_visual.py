@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Visual regression for debug_app.py screenshots
+Each capture is first reduced to page hashes (a perceptual hash and an exact
+digest); only when those differ from the stored ones are per-tile digests
+computed to locate the change. Only fingerprints and the changed tiles are
+kept on disk, never full captures.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import wcag_audit
+
+ROOT = Path(__file__).resolve().parent
+VISUAL_DIR = ROOT / ".debug-visual"
+
+# Square tiles the capture is fingerprinted and diffed in
+TILE = 256
+# Grayscale cells each band of tile rows is reduced to for the page hash
+MOSAIC_ROWS, MOSAIC_COLS = 4, 64
+# Side of the page-level difference hash (DHASH bits per row)
+DHASH = 16
+# Below this many captures, comparing inline beats spawning a process pool
+POOL_MIN_CAPTURES = 4
+
+def page_key(url):
+    """File-system safe name for a page URL ('/en/carbono' -> 'en_carbono')"""
+    path = re.sub(r"^[a-z]+://[^/]+", "", url).strip("/")
+    return re.sub(r"[^\w.-]+", "_", path) or "index"
+
+def _block_mean(pixels, rows, cols):
+    """Mean of an (h, w, ...) array over a rows x cols grid of near-equal blocks"""
+    rows, cols = min(rows, pixels.shape[0]), min(cols, pixels.shape[1])
+    row_edges = np.linspace(0, pixels.shape[0], rows + 1).astype(np.intp)[:-1]
+    col_edges = np.linspace(0, pixels.shape[1], cols + 1).astype(np.intp)[:-1]
+    sums = np.add.reduceat(np.add.reduceat(pixels, row_edges, axis=0), col_edges, axis=1)
+    counts = np.outer(np.diff(np.r_[row_edges, pixels.shape[0]]), np.diff(np.r_[col_edges, pixels.shape[1]]))
+    return sums / counts.reshape(counts.shape + (1,) * (pixels.ndim - 2))
+
+def dhash(gray, size=DHASH):
+    """Difference hash: sign of horizontal gradients of a size x (size + 1) downscale, as hex"""
+    small = _block_mean(gray, size, size + 1)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return f"{int(''.join('1' if bit else '0' for bit in bits), 2):0{size * size // 4}x}"
+
+def hamming(a, b):
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+def _bands(pixels, tile):
+    for row in range(-(-pixels.shape[0] // tile)):
+        yield row, np.ascontiguousarray(pixels[row * tile:(row + 1) * tile, :, :3])
+
+def page_hashes(pixels, tile=TILE):
+    """Stage one: size, perceptual hash and exact digest of an (h, w, 3) capture
+
+    One pass over bands of tile rows, so a memory-mapped screenshot is never
+    fully paged in at once; no per-tile work.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    mosaic = []
+    for _, band in _bands(pixels, tile):
+        digest.update(band.tobytes())
+        gray = band.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        mosaic.append(_block_mean(gray, MOSAIC_ROWS, MOSAIC_COLS))
+    return {
+        "size": list(pixels.shape[:2]),
+        "tile": tile,
+        "dhash": dhash(np.concatenate(mosaic)),
+        "digest": digest.hexdigest(),
+    }
+
+def tile_digests(pixels, tile=TILE):
+    """Stage two: an exact digest per tile, row-major"""
+    width = pixels.shape[1]
+    return [hashlib.blake2b(np.ascontiguousarray(band[:, col:col + tile]).tobytes(), digest_size=8).hexdigest()
+            for _, band in _bands(pixels, tile) for col in range(0, width, tile)]
+
+def fingerprint(pixels, tile=TILE):
+    """Page hashes plus tile digests, as stored in the baseline"""
+    return {**page_hashes(pixels, tile), "tiles": tile_digests(pixels, tile)}
+
+def changed_tiles(new, old):
+    """(row, col) of tiles whose digest differs between two fingerprints of the same tile size
+
+    Any pixel change inside a tile counts; tiles only present in one of the
+    two (the page grew or shrank) count as changed too.
+    """
+    def grid(entry):
+        height, width = entry["size"]
+        return np.array(entry["tiles"]).reshape(-(-height // entry["tile"]), -(-width // entry["tile"]))
+
+    new_digests, old_digests = grid(new), grid(old)
+    rows, cols = np.maximum(new_digests.shape, old_digests.shape)
+    common_rows, common_cols = np.minimum(new_digests.shape, old_digests.shape)
+    changed = np.ones((rows, cols), dtype=bool)
+    changed[:common_rows, :common_cols] = (new_digests[:common_rows, :common_cols]
+                                           != old_digests[:common_rows, :common_cols])
+    return [tuple(index) for index in np.argwhere(changed).tolist()]
+
+def save_tile(pixels, row, col, tile, path):
+    """Write one tile of the capture, as PNG when Pillow is available and .npy otherwise"""
+    block = np.ascontiguousarray(pixels[row * tile:(row + 1) * tile, col * tile:(col + 1) * tile, :3])
+    if wcag_audit.Image is not None:
+        wcag_audit.Image.fromarray(block).save(path.with_suffix(".png"))
+    else:
+        np.save(path.with_suffix(".npy"), block)
+
+def compare_capture(job):
+    """Fingerprint one capture and compare it with its baseline; runs in a pool worker
+
+    job is (key, image path, baseline fingerprint or None, delta dir). Stage
+    one only hashes the page: an equal digest ends the comparison, and the
+    perceptual hash distance says how far the page moved visually. Otherwise
+    stage two digests every tile, and the tiles that differ in any pixel are
+    written as the delta.
+    """
+    key, image, baseline, delta_dir = job
+    pixels = wcag_audit.load_screenshot(image)
+    current = page_hashes(pixels)
+    result = {"key": key, "tiles": [], "distance": 0}
+    if baseline is None:
+        result.update(status="new", fingerprint={**current, "tiles": tile_digests(pixels)})
+        return result
+    result["distance"] = hamming(current["dhash"], baseline["dhash"])
+    if current["digest"] == baseline["digest"] and current["size"] == baseline["size"]:
+        result.update(status="unchanged", fingerprint=baseline)
+        return result
+
+    current["tiles"] = tile_digests(pixels)
+    result["fingerprint"] = current
+    if current["tile"] != baseline["tile"]:
+        # Fingerprinted with another tile size: the tiles cannot be matched up
+        result["status"] = "changed"
+        return result
+    tiles = changed_tiles(current, baseline)
+    result["status"] = "changed" if tiles else "unchanged"
+    result["tiles"] = tiles
+    out = Path(delta_dir) / key
+    shutil.rmtree(out, ignore_errors=True)
+    height, width = current["size"]
+    for row, col in tiles:
+        if row * current["tile"] < height and col * current["tile"] < width:
+            out.mkdir(parents=True, exist_ok=True)
+            save_tile(pixels, row, col, current["tile"], out / f"r{row:03d}c{col:02d}")
+    return result
+
+class VisualBaseline:
+    """One fingerprint file per page under .debug-visual/hashes, deltas under .debug-visual/deltas"""
+
+    def __init__(self, root=VISUAL_DIR):
+        self.root = Path(root)
+        self.hashes = self.root / "hashes"
+        self.deltas = self.root / "deltas"
+
+    def load(self, key):
+        path = self.hashes / f"{key}.json"
+        return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+    def store(self, key, entry):
+        self.hashes.mkdir(parents=True, exist_ok=True)
+        (self.hashes / f"{key}.json").write_text(json.dumps(entry, separators=(",", ":")), encoding="utf-8")
+
+def compare_captures(captures, baseline=None, update=False, workers=None):
+    """Compare {key: image path} against the baseline, in a process pool for larger batches
+
+    New pages are added to the baseline; changed pages only replace theirs
+    with update. Returns the per-page results in key order.
+    """
+    baseline = baseline or VisualBaseline()
+    jobs = [(key, str(path), baseline.load(key), str(baseline.deltas)) for key, path in sorted(captures.items())]
+    if len(jobs) >= POOL_MIN_CAPTURES:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(compare_capture, jobs))
+    else:
+        results = [compare_capture(job) for job in jobs]
+    for result in results:
+        if result["status"] == "new" or (update and result["status"] == "changed"):
+            baseline.store(result["key"], result["fingerprint"])
+        if result["status"] == "unchanged":
+            shutil.rmtree(baseline.deltas / result["key"], ignore_errors=True)
+    return results
+
+def print_visual_report(results, baseline=None):
+    baseline = baseline or VisualBaseline()
+    print("=== VISUAL REGRESSION ===")
+    for result in results:
+        status = {"new": "[NEW] ", "unchanged": "[PASS]", "changed": "[FAIL]"}[result["status"]]
+        detail = ""
+        if result["status"] == "changed":
+            detail = f" - {len(result['tiles'])} tiles changed, hash distance {result['distance']}"
+            if result["tiles"]:
+                detail += f", delta in {baseline.deltas / result['key']}"
+        print(f"{status} {result['key']}{detail}")
+    changed = sum(1 for result in results if result["status"] == "changed")
+    print(f"{len(results) - changed}/{len(results)} pages match the baseline")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare screenshots against their stored fingerprints")
+    parser.add_argument("images", nargs="+", help="captures to compare (PNG via Pillow, or .npy); keyed by file name")
+    parser.add_argument("--update", action="store_true", help="accept changed pages as the new baseline")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size")
+    parser.add_argument("--dir", default=str(VISUAL_DIR), help=f"baseline directory (default: {VISUAL_DIR.name})")
+    args = parser.parse_args(argv)
+
+    baseline = VisualBaseline(args.dir)
+    results = compare_captures({Path(image).stem: image for image in args.images}, baseline, args.update,
+                               args.workers)
+    print_visual_report(results, baseline)
+    return 1 if any(result["status"] == "changed" for result in results) and not args.update else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
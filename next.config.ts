@@ -71,6 +71,16 @@ const nextConfig: NextConfig = {
           },
         ],
       },
+      {
+        // dados.json shards are content-hashed (dados_shards.py), so they never change in place
+        source: "/dados/shards/:path*",
+        headers: [
+          {
+            key: "Cache-Control",
+            value: "public, max-age=31536000, immutable",
+          },
+        ],
+      },
     ];
   },
 };
@@ -111,9 +111,13 @@ export function CarbonPlanChart() {
       } catch (err) {
         console.log('Using fallback data:', err);
         setUseFallback(true);
+        // Prefer the totals precomputed from projects.csv (carbon_plan_data.py --rollups)
+        const rollupStats = await fetch('/dados/CarbonPlan/rollups/stats.json')
+          .then((res) => (res.ok ? res.json() : null))
+          .catch(() => null);
         // Use local data as fallback
         const localStats = getStats();
-        setStats({
+        setStats(rollupStats ?? {
           totalProjects: localStats.totalProjects,
           forestProjects: localStats.forestProjects,
           countries: localStats.countries,
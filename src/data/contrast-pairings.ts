@@ -0,0 +1,44 @@
+// Generated by `python wcag_audit.py --pairings`; do not edit by hand.
+import pairings from "./contrast-pairings.json";
+
+export type ContrastLevel = "aa" | "aaa";
+export type ContrastContext = "light" | "dark";
+
+type Masks = Record<ContrastLevel, string>;
+
+const texts: string[] = pairings.texts;
+const backgrounds = pairings.backgrounds as unknown as Record<"opaque" | ContrastContext, Record<string, Masks>>;
+const textIndex = new Map<string, number>(texts.map((name, index): [string, number] => [name, index]));
+
+function masksFor(background: string, context: ContrastContext): Masks | undefined {
+  return background.includes("/") ? backgrounds[context][background] : backgrounds.opaque[background];
+}
+
+function hasBit(mask: string, index: number): boolean {
+  return ((atob(mask).charCodeAt(index >> 3) >> (7 - (index & 7))) & 1) === 1;
+}
+
+/** Whether `text-<text>` on `bg-<background>` meets the WCAG level (e.g. "gray-700", "blue-900/20"). */
+export function isContrastSafe(
+  text: string,
+  background: string,
+  level: ContrastLevel = "aa",
+  context: ContrastContext = "light",
+): boolean {
+  const index = textIndex.get(text);
+  const masks = masksFor(background, context);
+  return index !== undefined && masks !== undefined && hasBit(masks[level], index);
+}
+
+/** Every Tailwind text color that meets the WCAG level on `bg-<background>`. */
+export function safeTextColors(
+  background: string,
+  level: ContrastLevel = "aa",
+  context: ContrastContext = "light",
+): string[] {
+  const masks = masksFor(background, context);
+  if (!masks) {
+    return [];
+  }
+  return texts.filter((_, index) => hasBit(masks[level], index));
+}
@@ -0,0 +1,140 @@
+import json
+
+import pytest
+
+import carbon_plan_data
+
+HEADER = "project_id,name,country,category,issued,retired,first_issuance_at\n"
+
+# Number(value), then Number.isInteger(parsed) && parsed >= 0, as in optionalNonNegativeInt()
+@pytest.mark.parametrize("value, expected", [
+    ("42", 42),
+    ("+5", 5),
+    ("-0", 0),
+    ("1.0", 1),
+    ("1.", 1),
+    (".0", 0),
+    ("1e3", 1000),
+    ("010", 10),
+    ("0x10", 16),
+    ("0X1f", 31),
+    ("0b101", 5),
+    ("0o17", 15),
+    ("9007199254740993", 9007199254740992),
+    ("1.5", None),
+    ("-1", None),
+    ("1_000", None),
+    ("\uff11\uff12", None),  # fullwidth digits
+    ("\u0661", None),  # Arabic-Indic digit
+    ("-0x10", None),
+    ("0x", None),
+    ("Infinity", None),
+    ("1e400", None),
+    ("12abc", None),
+])
+def test_parse_int_mirrors_number(value, expected):
+    assert carbon_plan_data.parse_int(value) == expected
+
+@pytest.mark.parametrize("value, expected", [
+    ("2021-01-15", 1610668800),
+    ("2021-01-15T12:30:00Z", 1610713800),
+    ("2021-01-15T12:30:00+02:00", 1610706600),
+    ("2021-02-30", None),
+    ("15/01/2021", None),
+    ("not a date", None),
+])
+def test_parse_date(value, expected):
+    assert carbon_plan_data.parse_date(value) == expected
+    assert carbon_plan_data.parse_date(value) == expected  # memoized result
+
+def write_csv(path, rows):
+    path.write_text(HEADER + "".join(row + "\n" for row in rows), encoding="utf-8")
+    return path
+
+def test_rollup_stats_match_the_route_shape(tmp_path):
+    source = write_csv(tmp_path / "projects.csv", [
+        "VCS1,Forest A,Brazil,forest,100,10,2019-05-01",
+        "VCS2,Stoves B,Kenya,cookstoves,50,0,2021-01-15T00:00:00Z",
+        "VCS3,Forest C,Brazil,forest,0,0,",
+        "VCS3,Duplicate,Brazil,forest,5,0,",
+    ])
+    index = carbon_plan_data.write_rollups(source, tmp_path / "rollups")
+    assert index["rows"] == 3
+    stats = json.loads((tmp_path / "rollups" / "stats.json").read_text(encoding="utf-8"))
+    assert stats == {
+        "totalProjects": 3,
+        "forestProjects": 2,
+        "countries": 2,
+        "continents": 2,
+        "totalCredits": 150,
+        "countryStats": {"Brazil": 2, "Kenya": 1},
+        "continentStats": {"South America": 2, "Africa": 1},
+        "categoryStats": {"forest": 2, "cookstoves": 1},
+        "creditsByCountry": {"Brazil": 100, "Kenya": 50},
+        "vintageStats": {"2019": 100, "2021": 50},
+    }
+    assert carbon_plan_data.write_rollups(source, tmp_path / "rollups") is None
+
+def test_rollups_total_issued_and_retired_per_key_and_keep_top_tables(tmp_path):
+    source = write_csv(tmp_path / "projects.csv", [
+        "VCS1,Forest A,Brazil,forest,100,10,2019-05-01",
+        "VCS2,Stoves B,Kenya,cookstoves,50,40,2021-01-15T00:00:00Z",
+        "VCS3,Forest C,Brazil,forest,0,0,",
+        "VCS4,Forest D,Peru,forest,70,5,2019-11-30",
+    ])
+    index = carbon_plan_data.write_rollups(source, tmp_path / "rollups", top_n=2, chunk_rows=2)
+    assert set(index["files"]) == {*carbon_plan_data.ROLLUP_DIMENSIONS, "by-first-issuance-year", "top", "stats"}
+
+    def read(name):
+        return json.loads((tmp_path / "rollups" / f"{name}.json").read_text(encoding="utf-8"))
+
+    assert read("by-country") == [
+        {"key": "Brazil", "projects": 2, "issued": 100, "retired": 10},
+        {"key": "Peru", "projects": 1, "issued": 70, "retired": 5},
+        {"key": "Kenya", "projects": 1, "issued": 50, "retired": 40},
+    ]
+    assert read("by-first-issuance-year") == [
+        {"key": "2019", "projects": 2, "issued": 170, "retired": 15},
+        {"key": "2021", "projects": 1, "issued": 50, "retired": 40},
+    ]
+    top = read("top")
+    assert [row["project_id"] for row in top["issued"]] == ["VCS1", "VCS4"]
+    assert [row["project_id"] for row in top["retired"]] == ["VCS2", "VCS1"]
+
+def test_rollups_rebuild_when_a_file_or_an_input_changed(tmp_path, monkeypatch):
+    source = write_csv(tmp_path / "projects.csv", ["VCS1,Forest A,Brazil,forest,100,10,2019-05-01"])
+    out = tmp_path / "rollups"
+    assert carbon_plan_data.write_rollups(source, out) is not None
+    assert carbon_plan_data.write_rollups(source, out) is None
+    (out / "stats.json").unlink()
+    assert carbon_plan_data.write_rollups(source, out) is not None
+    assert carbon_plan_data.write_rollups(source, out, top_n=5) is not None
+    monkeypatch.setattr(carbon_plan_data, "load_continents", lambda: {"Brazil": "Americas"})
+    assert carbon_plan_data.write_rollups(source, out, top_n=5) is not None
+    assert json.loads((out / "stats.json").read_text(encoding="utf-8"))["continentStats"] == {"Americas": 1}
+
+def test_cache_is_streamed_chunk_by_chunk_and_round_trips(tmp_path):
+    np = pytest.importorskip("numpy")
+    source = write_csv(tmp_path / "projects.csv", [
+        "VCS1,Forest A,Brazil,forest,100,10,2019-05-01",
+        "VCS2,Fogões B,Brazil,forest,50,40,",
+        "VCS2,Duplicate,Brazil,forest,1,0,",
+        "VCS3,Forest C,Kenya,forest,0,0,2021-01-15T00:00:00Z",
+        "VCS4,Forest D,Brazil,forest,70,5,",
+    ])
+    rows, errors, meta = carbon_plan_data.write_cache(source, tmp_path / "cache", chunk_rows=2)
+    assert rows == meta["rows"] == 4
+    assert meta["rejected_lines"] == [4]
+    assert meta["columns"]["country"] == {"kind": "category", "categories": ["Brazil", "Kenya"]}
+    assert meta["columns"]["name"] == {"kind": "text"}
+    assert not (tmp_path / "cache.tmp").exists()
+
+    columns = carbon_plan_data.load_cache(tmp_path / "cache", source)
+    assert columns["project_id"].tolist() == ["VCS1", "VCS2", "VCS3", "VCS4"]
+    assert columns["name"][1] == "Fogões B"
+    assert columns["country"].tolist() == ["Brazil", "Brazil", "Kenya", "Brazil"]
+    assert columns["issued"].tolist() == [100, 50, 0, 70]
+    dates = columns["first_issuance_at"]
+    assert dates.dtype == np.dtype("datetime64[s]")
+    assert np.isnat(dates).tolist() == [False, True, False, True]
+    assert dates[2] == np.datetime64("2021-01-15T00:00:00")
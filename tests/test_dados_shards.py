@@ -0,0 +1,55 @@
+import gzip
+import json
+
+import dados_shards
+
+DADOS = {
+    "irecBrasil": [{"empresa": "Usina São João", "mwh": 1200}],
+    "precosIrec": {"2025": 1.5},
+}
+
+def build(tmp_path, data=DADOS, **kwargs):
+    source = tmp_path / "dados.json"
+    source.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    shards_dir = tmp_path / "shards"
+    manifest = dados_shards.build_shards(source, shards_dir, tmp_path / "dados.manifest.json", **kwargs)
+    return manifest, shards_dir
+
+def test_manifest_round_trips_to_the_source(tmp_path):
+    manifest, _ = build(tmp_path)
+    written = json.loads((tmp_path / "dados.manifest.json").read_text(encoding="utf-8"))
+    assert written == manifest
+    assert written["bytes"] == (tmp_path / "dados.json").stat().st_size
+    rebuilt = {}
+    for key, shard in written["shards"].items():
+        payload = (tmp_path / shard["path"]).read_bytes()
+        assert dados_shards.sha256(payload) == shard["sha256"]
+        assert shard["path"] == f"shards/{key}.{shard['sha256'][:dados_shards.HASH_LENGTH]}.json"
+        rebuilt[key] = json.loads(payload)
+    assert rebuilt == DADOS
+
+def test_only_json_is_written_unless_precompressed(tmp_path):
+    manifest, shards_dir = build(tmp_path)
+    assert all(path.suffix == ".json" for path in shards_dir.iterdir())
+    assert {(shard["gzip"], shard["br"]) for shard in manifest["shards"].values()} == {(None, None)}
+    manifest, shards_dir = build(tmp_path, precompress=True)
+    shard = manifest["shards"]["irecBrasil"]
+    gzipped = (tmp_path / (shard["path"] + ".gz")).read_bytes()
+    assert len(gzipped) == shard["gzip"]
+    assert gzip.decompress(gzipped) == (tmp_path / shard["path"]).read_bytes()
+
+def test_rebuild_removes_stale_shards(tmp_path):
+    build(tmp_path, precompress=True)
+    manifest, shards_dir = build(tmp_path, {**DADOS, "precosIrec": {"2025": 2.0}})
+    names = sorted(path.name for path in shards_dir.iterdir())
+    assert names == sorted(shard["path"].split("/")[1] for shard in manifest["shards"].values())
+
+def test_compare_mirrors_reports_drift(tmp_path):
+    source, mirror = tmp_path / "dados", tmp_path / "public" / "dados"
+    for root in (source, mirror):
+        (root / "shards").mkdir(parents=True)
+        (root / "a.csv").write_text("x")
+    (source / "b.csv").write_text("only here")
+    (mirror / "a.csv").write_text("y")
+    (mirror / "shards" / "generated.json").write_text("{}")
+    assert dados_shards.compare_mirrors(source, mirror) == [("a.csv", "contents differ"), ("b.csv", "only in dados/")]
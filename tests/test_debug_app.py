@@ -0,0 +1,83 @@
+import debug_app
+
+class FakeFrame:
+    def __init__(self, url=""):
+        self.url = url
+
+class FakePage:
+    """Just enough of a Playwright page to fire the events NetworkRecorder listens to"""
+
+    def __init__(self):
+        self.main_frame = FakeFrame()
+        self.url = "about:blank"
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def emit(self, event, value):
+        self.handlers[event](value)
+
+    def request(self, url, navigation=False, frame=None, redirected_from=None):
+        request = FakeRequest(url, navigation, frame or self.main_frame, redirected_from)
+        self.emit("request", request)
+        return request
+
+    def commit(self, url):
+        self.main_frame.url = self.url = url
+        self.emit("framenavigated", self.main_frame)
+
+class FakeRequest:
+    method = "GET"
+    headers = {}
+    resource_type = "document"
+
+    def __init__(self, url, navigation, frame, redirected_from):
+        self.url = url
+        self.navigation = navigation
+        self.frame = frame
+        self.redirected_from = redirected_from
+
+    def is_navigation_request(self):
+        return self.navigation
+
+def test_document_requests_open_their_own_page():
+    page = FakePage()
+    recorder = debug_app.NetworkRecorder().attach(page)
+    first = page.request("http://localhost/en", navigation=True)
+    page.request("http://localhost/en/", navigation=True, redirected_from=first)
+    page.commit("http://localhost/en/")
+    page.request("http://localhost/dados/dados.json")
+    page.request("http://localhost/embed", navigation=True, frame=FakeFrame())
+    page.request("http://localhost/irec", navigation=True)
+    page.request("http://localhost/dados/dados.json")
+    page.commit("http://localhost/irec")
+    page.commit("http://localhost/irec#tabela")  # same-document: no request
+
+    assert [(entry["pageref"], entry["url"].rsplit("/", 1)[1]) for entry in recorder.entries] == [
+        ("page_1", "en"), ("page_1", ""), ("page_1", "dados.json"), ("page_1", "embed"),
+        ("page_2", "irec"), ("page_2", "dados.json"),
+    ]
+    summary = recorder.summary()
+    assert [(page["url"], page["requests"]) for page in summary] == [
+        ("http://localhost/en/", 4), ("http://localhost/irec", 2), ("http://localhost/irec#tabela", 0),
+    ]
+    har = recorder.to_har()["log"]
+    assert {entry["pageref"] for entry in har["entries"]} <= {page["id"] for page in har["pages"]}
+
+def test_requests_before_any_navigation_get_a_page():
+    page = FakePage()
+    recorder = debug_app.NetworkRecorder().attach(page)
+    page.request("http://localhost/sw.js")
+    assert recorder.summary()[0]["requests"] == 1
+    assert recorder.to_har()["log"]["pages"][0]["id"] == recorder.entries[0]["pageref"]
+
+def test_percentile_is_nearest_rank():
+    five = [10, 20, 30, 40, 50]
+    assert debug_app.percentile(five, 0.50) == 30
+    assert debug_app.percentile(five, 0.95) == 50
+    assert debug_app.percentile(five, 0.20) == 10
+    assert debug_app.percentile(five, 0.21) == 20
+    hundred = list(range(1, 101))
+    assert [debug_app.percentile(hundred, q) for q in (0.50, 0.95, 0.99)] == [50, 95, 99]
+    assert debug_app.percentile([7], 0.99) == 7
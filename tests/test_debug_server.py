@@ -0,0 +1,51 @@
+import http.client
+import json
+
+import pytest
+
+import debug_server
+
+@pytest.fixture
+def stand_in(tmp_path):
+    (tmp_path / "index.html").write_text("<h1>ok</h1>")
+
+    def start(throttle=None):
+        server, _ = debug_server.start_stand_in(throttle=throttle, directory=tmp_path)
+        servers.append(server)
+        return http.client.HTTPConnection(*server.server_address)
+
+    servers = []
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def request(connection, method, path, body=None):
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    connection.request(method, path, body=body, headers=headers)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+def test_rejected_post_body_does_not_leak_into_the_next_request(stand_in):
+    connection = stand_in()
+    status, _ = request(connection, "POST", "/index.html", json.dumps({"padding": "x" * 4096}))
+    assert status == 405
+    status, body = request(connection, "GET", "/index.html")
+    assert (status, body) == (200, b"<h1>ok</h1>")
+
+def test_injected_failure_drains_the_body(stand_in):
+    connection = stand_in(debug_server.Throttle(error_rate=1.0, error_paths=("/auth/*",)))
+    status, body = request(connection, "POST", "/auth/v1/token?grant_type=password",
+                           json.dumps({"email": debug_server.STAND_IN_EMAIL}))
+    assert status == 503
+    assert json.loads(body)["fallback"] is True
+    status, body = request(connection, "GET", "/api/debug")
+    assert status == 200
+    assert json.loads(body)["standIn"] is True
+
+def test_password_grant_reads_the_body(stand_in):
+    connection = stand_in()
+    credentials = {"email": debug_server.STAND_IN_EMAIL, "password": debug_server.STAND_IN_PASSWORD}
+    status, body = request(connection, "POST", "/auth/v1/token?grant_type=password", json.dumps(credentials))
+    assert status == 200
+    assert json.loads(body)["access_token"]
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+import debug_visual
+
+def blank_page(height=1024, width=768):
+    page = np.full((height, width, 3), 250, dtype=np.uint8)
+    page[100:116, 40:700] = 30  # a line of "text"
+    return page
+
+def compare(tmp_path, baseline_pixels, pixels):
+    store = debug_visual.VisualBaseline(tmp_path / "store")
+    np.save(tmp_path / "page.npy", baseline_pixels)
+    debug_visual.compare_captures({"page": tmp_path / "page.npy"}, store)
+    np.save(tmp_path / "page.npy", pixels)
+    [result] = debug_visual.compare_captures({"page": tmp_path / "page.npy"}, store)
+    return result, store
+
+def test_identical_capture_stops_at_page_hashes(tmp_path, monkeypatch):
+    page = blank_page()
+    store = debug_visual.VisualBaseline(tmp_path / "store")
+    np.save(tmp_path / "page.npy", page)
+    debug_visual.compare_captures({"page": tmp_path / "page.npy"}, store)
+    monkeypatch.setattr(debug_visual, "tile_digests", lambda *args: pytest.fail("tiles hashed"))
+    [result] = debug_visual.compare_captures({"page": tmp_path / "page.npy"}, store)
+    assert result["status"] == "unchanged"
+    assert result["distance"] == 0
+
+def test_blanked_glyphs_are_flagged(tmp_path):
+    page = blank_page()
+    changed = page.copy()
+    changed[103:113, 300:360] = 250  # a 60x10 run of glyphs erased
+    result, store = compare(tmp_path, page, changed)
+    assert result["status"] == "changed"
+    assert result["tiles"] == [(0, 1)]
+    assert len(list((store.deltas / "page").iterdir())) == 1
+
+def test_recoloured_line_flags_every_tile_it_crosses(tmp_path):
+    page = blank_page()
+    changed = page.copy()
+    changed[100:116, 40:700] = (30, 30, 90)
+    result, _ = compare(tmp_path, page, changed)
+    assert result["tiles"] == [(0, 0), (0, 1), (0, 2)]
+
+def test_grown_page_counts_new_tiles(tmp_path):
+    page = blank_page()
+    result, _ = compare(tmp_path, page, np.concatenate([page, page[:256]]))
+    assert result["status"] == "changed"
+    assert (4, 0) in result["tiles"]
+
+def test_changed_tiles_on_fingerprints():
+    page = blank_page()
+    changed = page.copy()
+    changed[600, 700] = 0
+    assert debug_visual.changed_tiles(debug_visual.fingerprint(changed), debug_visual.fingerprint(page)) == [(2, 2)]
+
+def test_page_key():
+    assert debug_visual.page_key("http://localhost:3000/en/carbono") == "en_carbono"
+    assert debug_visual.page_key("http://localhost:3000/") == "index"
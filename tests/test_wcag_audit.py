@@ -0,0 +1,139 @@
+import re
+
+import pytest
+
+import wcag_audit
+
+@pytest.mark.parametrize("fg, bg, expected", [
+    ("#000000", "#ffffff", 21.0),
+    ("#ffffff", "#ffffff", 1.0),
+    ("#777777", "#ffffff", 4.48),
+    ("#767676", "#ffffff", 4.54),
+    ("#6b7280", "#ffffff", 4.83),  # gray-500
+    ("#ffffff", "#2563eb", 5.17),  # white on blue-600
+])
+def test_known_contrast_ratios(fg, bg, expected):
+    assert wcag_audit.contrast_ratio(fg, bg) == pytest.approx(expected, abs=0.01)
+    assert wcag_audit.contrast_ratio(bg, fg) == pytest.approx(expected, abs=0.01)
+
+def test_palette_scores_match_the_scalar_ratio():
+    palette = wcag_audit.TAILWIND_PALETTE
+    ratio, lc = palette.scores("gray-500", palette, "white")
+    assert ratio == pytest.approx(wcag_audit.contrast_ratio("#6b7280", "#ffffff"))
+    assert lc > 0  # dark text on a light background
+
+def pairs(source):
+    return sorted(wcag_audit.extract_color_pairs(source))
+
+def test_text_takes_the_background_of_its_own_class_string():
+    assert pairs('<span className="bg-blue-600 text-white">x</span>') == [("light", "white", "blue-600", 1)]
+
+def test_text_inherits_the_nearest_enclosing_background():
+    source = (
+        '<div className="bg-emerald-600 flex">\n'
+        '  <div className="p-2">\n'
+        '    <span className="text-white text-xl">x</span>\n'
+        '  </div>\n'
+        '</div>\n'
+        '<p className="text-gray-500">y</p>\n'
+    )
+    assert pairs(source) == [
+        ("light", "gray-500", wcag_audit.DEFAULT_BACKGROUND["light"], 6),
+        ("light", "white", "emerald-600", 3),
+    ]
+
+def test_helper_call_backgrounds_apply_to_its_text():
+    source = '<div className={cn("rounded text-white", active ? "bg-blue-600" : "bg-gray-700")} />'
+    assert pairs(source) == [("light", "white", "blue-600", 1), ("light", "white", "gray-700", 1)]
+
+def test_ternary_branches_keep_their_own_backgrounds():
+    source = (
+        '<div className="bg-white dark:bg-gray-700">\n'
+        '  <button className={cx("px-4", on ? "bg-emerald-600 text-white" : "text-gray-600 dark:text-gray-400")} />\n'
+        '</div>\n'
+    )
+    assert pairs(source) == [
+        ("dark", "gray-400", "gray-700", 2),
+        ("light", "gray-600", "white", 2),
+        ("light", "white", "emerald-600", 2),
+    ]
+
+def test_generics_and_comparisons_are_not_tags():
+    source = (
+        'const [n, setN] = useState<number>(0);\n'
+        '<div className="bg-slate-950">{n<3 && <b className="text-white">x</b>}</div>\n'
+    )
+    assert pairs(source) == [("light", "white", "slate-950", 2)]
+
+def test_arbitrary_hex_values_resolve():
+    [(mode, fg, bg, line)] = pairs("<div className=\"bg-[#1e40af] text-white\" />")
+    assert bg == "[#1e40af]"
+    assert wcag_audit.parse_layer(bg, wcag_audit.TAILWIND_PALETTE) == [("#1e40af", 1.0)]
+    assert wcag_audit.parse_layer("[#fff8]", wcag_audit.TAILWIND_PALETTE) == [("#ffffff", pytest.approx(0x88 / 255))]
+
+def test_unresolvable_arbitrary_colors_are_kept_for_the_skipped_count():
+    [(_, _, bg, _)] = pairs('<div className="bg-[rgb(0,0,0)] text-white text-[14px]" />')
+    assert bg == "[rgb(0,0,0)]"
+    assert wcag_audit.parse_layer(bg, wcag_audit.TAILWIND_PALETTE) is None
+
+def test_page_background_comes_from_the_layout_body(tmp_path):
+    layout = tmp_path / "layout.tsx"
+    layout.write_text('<html className="dark:bg-gray-950"><body className="font-sans bg-white dark:bg-gray-900">')
+    assert wcag_audit.page_background(layout) == {"light": "white", "dark": "gray-900"}
+    assert wcag_audit.page_background(tmp_path / "missing.tsx") == {"light": "white", "dark": "gray-900"}
+
+def test_brief_scan_only_lists_failures_new_since_the_cached_run(tmp_path, capsys):
+    component = tmp_path / "src" / "components" / "Badge.tsx"
+    component.parent.mkdir(parents=True)
+    component.write_text('<span className="bg-white text-gray-300">x</span>\n')
+    cache_path = tmp_path / "cache.json"
+
+    def scan():
+        wcag_audit.analyze_scanned_pairs(tmp_path, cache=wcag_audit.AuditCache(cache_path), brief=True)
+        return capsys.readouterr().out.splitlines()
+
+    first = scan()
+    assert first[0].startswith("[FAIL] LIGHT: text-gray-300 on bg-white")
+    assert first[1] == "wcag_audit: 1/1 scanned pairs fail WCAG AA (1 new, 0 skipped)"
+    assert scan() == ["wcag_audit: 1/1 scanned pairs fail WCAG AA (0 new, 0 skipped)"]
+    component.write_text('<span className="bg-white text-gray-300">x</span><b className="text-yellow-400">y</b>\n')
+    [line, summary] = scan()
+    assert line.startswith("[FAIL] LIGHT: text-yellow-400 on bg-white")
+    assert summary.endswith("(1 new, 0 skipped)")
+
+def test_gradient_and_arbitrary_page_backgrounds_resolve_like_any_other(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(wcag_audit, "DEFAULT_BACKGROUND", {"light": "blue-50>green-50", "dark": "[#111827]"})
+    component = tmp_path / "src" / "components" / "Note.tsx"
+    component.parent.mkdir(parents=True)
+    component.write_text('<p className="text-gray-900 dark:text-gray-100">x</p><b className="bg-white/50 text-gray-900">y</b>\n')
+    assert wcag_audit.analyze_scanned_pairs(tmp_path, brief=True) == []
+    assert capsys.readouterr().out.startswith("wcag_audit: 0/3 scanned pairs fail")
+
+def test_fixes_for_translucent_text_start_from_the_rendered_color(tmp_path, capsys):
+    component = tmp_path / "src" / "components" / "Faded.tsx"
+    component.parent.mkdir(parents=True)
+    component.write_text('<p className="bg-white text-blue-700/50">x</p>\n')
+    wcag_audit.analyze_scanned_pairs(tmp_path, fix=True)
+    [fix] = [line for line in capsys.readouterr().out.splitlines() if line.startswith("LIGHT: text-blue-700/50")]
+    old, new = re.match(r".*: (#\w{6}) -> (#\w{6})", fix).groups()
+    assert old == wcag_audit.rendered_text_hex([(wcag_audit.TAILWIND_COLORS["blue-700"], 0.5)], "#ffffff")
+    assert wcag_audit.contrast_ratio(new, "#ffffff") >= 4.5
+
+def test_safe_pairings_agree_with_the_contrast_ratio():
+    table = wcag_audit.build_safe_pairings()
+    colors = wcag_audit.TAILWIND_COLORS
+    assert table["pageBackground"] == wcag_audit.DEFAULT_BACKGROUND
+    for text, bg in [("gray-500", "white"), ("gray-400", "white"), ("white", "blue-600"), ("white", "cyan-600")]:
+        passes = wcag_audit.contrast_ratio(colors[text], colors[bg]) >= 4.5
+        assert wcag_audit.is_safe_pairing(table, text, bg) == passes
+    # blue-600 at 20% over the white page is #d3e0fb, over gray-900 it is #15274e
+    assert wcag_audit.is_safe_pairing(table, "gray-900", "blue-600/20", context="light")
+    assert not wcag_audit.is_safe_pairing(table, "gray-900", "blue-600/20", context="dark")
+    assert wcag_audit.is_safe_pairing(table, "white", "blue-600/20", context="dark")
+
+def test_tinted_pairings_must_pass_over_the_whole_gradient_page(monkeypatch):
+    monkeypatch.setattr(wcag_audit, "DEFAULT_BACKGROUND", {"light": "white>black", "dark": "[rgb(0,0,0)]"})
+    table = wcag_audit.build_safe_pairings()
+    assert not wcag_audit.is_safe_pairing(table, "black", "white/10", context="light")
+    assert not wcag_audit.is_safe_pairing(table, "white", "white/10", context="light")
+    assert table["backgrounds"]["dark"] == {}
@@ -4,44 +4,173 @@ WCAG AA Contrast Compliance Audit for Sintropia Carbono HTML files
 Checks all color combinations used across 6 HTML pages in both light and dark modes
 """
 
+import argparse
+import base64
+import hashlib
+import json
+import re
+import sys
+import tempfile
+from contextlib import nullcontext, redirect_stdout
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+try:
+    import numpy as np
+except ImportError:  # the scalar report still works without numpy
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:  # only needed to decode screenshots for --screenshot
+    Image = None
+
+ROOT = Path(__file__).resolve().parent
+GLOBALS_CSS = ROOT / "src" / "app" / "globals.css"
+
+# WCAG 2.x minimum contrast ratios
+WCAG_THRESHOLDS = {
+    "AA": 4.5,
+    "AA-large": 3.0,
+    "AAA": 7.0,
+    "AAA-large": 4.5,
+}
+
+# APCA minimum |Lc|: 60 for content text, 45 for large or bold headlines
+APCA_THRESHOLDS = {
+    "APCA": 60.0,
+    "APCA-large": 45.0,
+}
+
+# Every standard a single scoring pass is checked against: (metric, minimum)
+STANDARDS = {
+    **{name: ("ratio", value) for name, value in WCAG_THRESHOLDS.items()},
+    **{name: ("apca", value) for name, value in APCA_THRESHOLDS.items()},
+}
+
 def hex_to_rgb(hex_color):
     """Convert hex color to RGB tuple"""
     hex_color = hex_color.lstrip('#')
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
+def _linearize(c):
+    """sRGB channel (0-255) to linear light"""
+    c = c / 255.0
+    if c <= 0.03928:
+        return c / 12.92
+    else:
+        return pow((c + 0.055) / 1.055, 2.4)
+
+# Every 8-bit channel value linearized once, indexed by the channel itself
+SRGB_TO_LINEAR = tuple(_linearize(c) for c in range(256))
+
 def relative_luminance(rgb):
     """Calculate relative luminance of an RGB color"""
-    def normalize(c):
-        c = c / 255.0
-        if c <= 0.03928:
-            return c / 12.92
-        else:
-            return pow((c + 0.055) / 1.055, 2.4)
-    
     r, g, b = rgb
-    return 0.2126 * normalize(r) + 0.7152 * normalize(g) + 0.0722 * normalize(b)
+    return 0.2126 * SRGB_TO_LINEAR[r] + 0.7152 * SRGB_TO_LINEAR[g] + 0.0722 * SRGB_TO_LINEAR[b]
 
-def contrast_ratio(color1, color2):
-    """Calculate contrast ratio between two colors"""
-    l1 = relative_luminance(hex_to_rgb(color1))
-    l2 = relative_luminance(hex_to_rgb(color2))
-    
+# APCA 0.0.98G-4g: plain 2.4 power per channel, its own coefficients and constants
+APCA_TO_LINEAR = tuple((c / 255.0) ** 2.4 for c in range(256))
+APCA_COEFFICIENTS = (0.2126729, 0.7151522, 0.0721750)
+APCA_BLACK_THRESHOLD = 0.022
+APCA_BLACK_CLAMP = 1.414
+APCA_DELTA_Y_MIN = 0.0005
+APCA_SCALE = 1.14
+APCA_OFFSET = 0.027
+APCA_LOW_CLIP = 0.1
+
+def apca_luminance(rgb):
+    """APCA screen luminance (Y) of an RGB color"""
+    r, g, b = rgb
+    kr, kg, kb = APCA_COEFFICIENTS
+    return kr * APCA_TO_LINEAR[r] + kg * APCA_TO_LINEAR[g] + kb * APCA_TO_LINEAR[b]
+
+def apca_contrast(y_text, y_bg):
+    """APCA lightness contrast Lc (positive: dark text on light bg, negative: reversed)"""
+    y_text = y_text if y_text > APCA_BLACK_THRESHOLD else y_text + (APCA_BLACK_THRESHOLD - y_text) ** APCA_BLACK_CLAMP
+    y_bg = y_bg if y_bg > APCA_BLACK_THRESHOLD else y_bg + (APCA_BLACK_THRESHOLD - y_bg) ** APCA_BLACK_CLAMP
+    if abs(y_bg - y_text) < APCA_DELTA_Y_MIN:
+        return 0.0
+    if y_bg > y_text:
+        sapc = (y_bg ** 0.56 - y_text ** 0.57) * APCA_SCALE
+        return 0.0 if sapc < APCA_LOW_CLIP else (sapc - APCA_OFFSET) * 100
+    sapc = (y_bg ** 0.65 - y_text ** 0.62) * APCA_SCALE
+    return 0.0 if sapc > -APCA_LOW_CLIP else (sapc + APCA_OFFSET) * 100
+
+def luminance_contrast(l1, l2):
+    """Contrast ratio between two relative luminances"""
     lighter = max(l1, l2)
     darker = min(l1, l2)
     
     return (lighter + 0.05) / (darker + 0.05)
 
-def check_wcag_aa(ratio, is_large_text=False):
-    """Check if contrast ratio meets WCAG AA standards"""
-    if is_large_text:
-        return ratio >= 3.0
-    else:
-        return ratio >= 4.5
+def contrast_ratio(color1, color2):
+    """Calculate contrast ratio between two colors"""
+    l1 = relative_luminance(hex_to_rgb(color1))
+    l2 = relative_luminance(hex_to_rgb(color2))
+    return luminance_contrast(l1, l2)
+
+class Palette:
+    """Named colors with RGB and relative luminance parsed once at load time"""
+
+    __slots__ = ("names", "hex", "rgb", "luminance", "apca_y", "_index")
+
+    def __init__(self, colors):
+        self.names = tuple(colors)
+        self.hex = tuple(colors[name] for name in self.names)
+        self.rgb = tuple(hex_to_rgb(color) for color in self.hex)
+        self.luminance = array("d", (relative_luminance(rgb) for rgb in self.rgb))
+        self.apca_y = array("d", (apca_luminance(rgb) for rgb in self.rgb))
+        self._index = {name: i for i, name in enumerate(self.names)}
 
-def format_result(ratio, passes):
-    """Format the result with color coding"""
-    status = "[PASS]" if passes else "[FAIL]"
-    return f"{ratio:.2f}:1 - {status}"
+    @classmethod
+    def merge(cls, *palettes):
+        """Build one palette from several {name: hex} dicts, later ones winning"""
+        merged = {}
+        for colors in palettes:
+            merged.update(colors)
+        return cls(merged)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __getitem__(self, name):
+        return self.hex[self._index[name]]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def scores(self, name, other, other_name):
+        """(WCAG ratio, APCA Lc) of text `name` from this palette on a background from another"""
+        i, j = self._index[name], other._index[other_name]
+        ratio = luminance_contrast(self.luminance[i], other.luminance[j])
+        return ratio, apca_contrast(self.apca_y[i], other.apca_y[j])
+
+def meets_standard(standard, ratio, lc):
+    """Whether a scored pair (WCAG ratio, APCA Lc) meets one of STANDARDS; works on arrays"""
+    metric, minimum = STANDARDS[standard]
+    return (ratio if metric == "ratio" else abs(lc)) >= minimum
+
+def large_variant(standard):
+    """The large-text counterpart of a standard (AA -> AA-large)"""
+    return standard if standard.endswith("-large") else f"{standard}-large"
+
+def format_score(standard, ratio, lc):
+    """The score a standard is judged on, as printed in reports"""
+    return f"{ratio:.2f}:1" if STANDARDS[standard][0] == "ratio" else f"Lc {lc:.1f}"
+
+def requirement_text(standard):
+    metric, minimum = STANDARDS[standard]
+    return f"{minimum:g}:1" if metric == "ratio" else f"Lc {minimum:g}"
+
+def standard_title(standard):
+    """'WCAG AA', 'WCAG AAA-large', 'APCA', ... as used in report headings"""
+    return f"WCAG {standard}" if STANDARDS[standard][0] == "ratio" else standard
 
 # Define all colors used across the 6 HTML files
 
@@ -62,8 +191,8 @@ LIGHT_COLORS = {
     "lime-300": "#bef264",
     
     # Card/section backgrounds
-    "gradient-blue-green": "#eff6ff",  # Approximation
-    "gradient-lime": "#d9f99d",  # Approximation
+    "gradient-blue-green": "#eff6ff",  # First stop; full range in GRADIENT_STOPS
+    "gradient-lime": "#d9f99d",  # First stop; full range in GRADIENT_STOPS
     
     # Table backgrounds
     "table-header": "#f3f4f6",
@@ -82,7 +211,7 @@ LIGHT_COLORS = {
     "badge-teal-100": "#ccfbf1",
     "badge-gray-100": "#f3f4f6",
     
-    # Sector badge backgrounds (from CSS variables)
+    # Sector badge backgrounds (fallbacks; --sector-* in globals.css win)
     "sector-tech": "#2563eb",
     "sector-energy": "#166534",
     "sector-cdr": "#7c3aed",
@@ -127,7 +256,7 @@ LIGHT_COLORS = {
     "irec-mundo-saude": "#db2777",
 }
 
-# Dark Mode Colors (from CSS overrides)
+# Dark Mode Colors (fallbacks; .dark custom properties in globals.css win)
 DARK_COLORS = {
     # Page backgrounds
     "body-bg": "#0f172a",  # slate-900
@@ -225,16 +354,1572 @@ GROWTH_COLORS = {
     "dark-growth-neg": "#f87171",
 }
 
-def analyze_color_combinations():
-    """Analyze all color combinations for WCAG AA compliance"""
+# Tailwind default palette (v3 hex values), shades 50-950 per hue
+TAILWIND_SHADES = (50, 100, 200, 300, 400, 500, 600, 700, 800, 900, 950)
+TAILWIND_HUES = {
+    "slate": "f8fafc f1f5f9 e2e8f0 cbd5e1 94a3b8 64748b 475569 334155 1e293b 0f172a 020617",
+    "gray": "f9fafb f3f4f6 e5e7eb d1d5db 9ca3af 6b7280 4b5563 374151 1f2937 111827 030712",
+    "zinc": "fafafa f4f4f5 e4e4e7 d4d4d8 a1a1aa 71717a 52525b 3f3f46 27272a 18181b 09090b",
+    "neutral": "fafafa f5f5f5 e5e5e5 d4d4d4 a3a3a3 737373 525252 404040 262626 171717 0a0a0a",
+    "stone": "fafaf9 f5f5f4 e7e5e4 d6d3d1 a8a29e 78716c 57534e 44403c 292524 1c1917 0c0a09",
+    "red": "fef2f2 fee2e2 fecaca fca5a5 f87171 ef4444 dc2626 b91c1c 991b1b 7f1d1d 450a0a",
+    "orange": "fff7ed ffedd5 fed7aa fdba74 fb923c f97316 ea580c c2410c 9a3412 7c2d12 431407",
+    "amber": "fffbeb fef3c7 fde68a fcd34d fbbf24 f59e0b d97706 b45309 92400e 78350f 451a03",
+    "yellow": "fefce8 fef9c3 fef08a fde047 facc15 eab308 ca8a04 a16207 854d0e 713f12 422006",
+    "lime": "f7fee7 ecfccb d9f99d bef264 a3e635 84cc16 65a30d 4d7c0f 3f6212 365314 1a2e05",
+    "green": "f0fdf4 dcfce7 bbf7d0 86efac 4ade80 22c55e 16a34a 15803d 166534 14532d 052e16",
+    "emerald": "ecfdf5 d1fae5 a7f3d0 6ee7b7 34d399 10b981 059669 047857 065f46 064e3b 022c22",
+    "teal": "f0fdfa ccfbf1 99f6e4 5eead4 2dd4bf 14b8a6 0d9488 0f766e 115e59 134e4a 042f2e",
+    "cyan": "ecfeff cffafe a5f3fc 67e8f9 22d3ee 06b6d4 0891b2 0e7490 155e75 164e63 083344",
+    "sky": "f0f9ff e0f2fe bae6fd 7dd3fc 38bdf8 0ea5e9 0284c7 0369a1 075985 0c4a6e 082f49",
+    "blue": "eff6ff dbeafe bfdbfe 93c5fd 60a5fa 3b82f6 2563eb 1d4ed8 1e40af 1e3a8a 172554",
+    "indigo": "eef2ff e0e7ff c7d2fe a5b4fc 818cf8 6366f1 4f46e5 4338ca 3730a3 312e81 1e1b4b",
+    "violet": "f5f3ff ede9fe ddd6fe c4b5fd a78bfa 8b5cf6 7c3aed 6d28d9 5b21b6 4c1d95 2e1065",
+    "purple": "faf5ff f3e8ff e9d5ff d8b4fe c084fc a855f7 9333ea 7e22ce 6b21a8 581c87 3b0764",
+    "fuchsia": "fdf4ff fae8ff f5d0fe f0abfc e879f9 d946ef c026d3 a21caf 86198f 701a75 4a044e",
+    "pink": "fdf2f8 fce7f3 fbcfe8 f9a8d4 f472b6 ec4899 db2777 be185d 9d174d 831843 500724",
+    "rose": "fff1f2 ffe4e6 fecdd3 fda4af fb7185 f43f5e e11d48 be123c 9f1239 881337 4c0519",
+}
+
+TAILWIND_COLORS = {"white": "#ffffff", "black": "#000000"}
+for _hue, _values in TAILWIND_HUES.items():
+    for _shade, _value in zip(TAILWIND_SHADES, _values.split()):
+        TAILWIND_COLORS[f"{_hue}-{_shade}"] = f"#{_value}"
+
+# globals.css custom properties: comments, --var declarations, block open/close
+CSS_TOKEN_RE = re.compile(
+    r"/\*.*?\*/"
+    r"|(?P<var>--[\w-]+)\s*:\s*(?P<value>[^;{}]+)(?:;|(?=\}))"
+    r"|(?P<selector>[^{};]+)\{"
+    r"|(?P<close>\})",
+    re.S,
+)
+CSS_VAR_RE = re.compile(r"var\(\s*(--[\w-]+)\s*(?:,\s*([^()]*(?:\([^()]*\))?[^()]*))?\)")
+CSS_HEX_RE = re.compile(r"#([0-9a-fA-F]{3}|[0-9a-fA-F]{6})")
+CSS_RGB_RE = re.compile(r"rgba?\(\s*(\d+)[\s,]+(\d+)[\s,]+(\d+)\s*(?:[,/]\s*([\d.]+%?)\s*)?\)")
+DARK_SELECTOR_RE = re.compile(r"\.dark(?![\w-])")
+
+def parse_css_variables(source):
+    """Split --var declarations into {"light": {...}, "dark": {...}} raw values"""
+    scopes = {"light": {}, "dark": {}}
+    stack = []
+    for match in CSS_TOKEN_RE.finditer(source):
+        if match.group("var"):
+            scope = "dark" if any(DARK_SELECTOR_RE.search(sel) for sel in stack) else "light"
+            scopes[scope][match.group("var")] = match.group("value").strip()
+        elif match.group("selector") is not None:
+            stack.append(match.group("selector").strip())
+        elif match.group("close") and stack:
+            stack.pop()
+    return scopes
+
+def css_color_to_hex(value):
+    """Normalize an opaque hex/rgb() CSS color to #rrggbb, else None"""
+    value = value.strip()
+    match = CSS_HEX_RE.fullmatch(value)
+    if match:
+        digits = match.group(1).lower()
+        if len(digits) == 3:
+            digits = "".join(c * 2 for c in digits)
+        return f"#{digits}"
+    match = CSS_RGB_RE.fullmatch(value)
+    if match:
+        alpha = match.group(4)
+        if alpha is not None and float(alpha.rstrip("%")) < (100 if alpha.endswith("%") else 1):
+            return None
+        return "#" + "".join(f"{min(int(c), 255):02x}" for c in match.group(1, 2, 3))
+    return None
+
+def resolve_css_colors(scopes):
+    """Resolve var() chains per scope; .dark falls back to light definitions"""
+    memo = {}
+
+    def resolve(scope, name, seen=()):
+        key = (scope, name)
+        if key in memo:
+            return memo[key]
+        if name in seen:  # cyclic reference
+            return None
+        raw = scopes[scope].get(name)
+        if raw is None:
+            value = resolve("light", name, seen + (name,)) if scope == "dark" else None
+        else:
+            value = substitute(scope, raw, seen + (name,))
+        memo[key] = value
+        return value
+
+    def substitute(scope, raw, seen):
+        def replace(match):
+            resolved = resolve(scope, match.group(1), seen)
+            if resolved is None and match.group(2) is not None:
+                resolved = substitute(scope, match.group(2), seen)
+            if resolved is None:
+                raise LookupError(match.group(1))
+            return resolved
+        try:
+            return CSS_VAR_RE.sub(replace, raw).strip()
+        except LookupError:
+            return None
+
+    colors = {"light": {}, "dark": {}}
+    for scope in colors:
+        for name in scopes[scope]:
+            value = resolve(scope, name)
+            color = css_color_to_hex(value) if value else None
+            if color:
+                colors[scope][css_palette_name(name)] = color
+    return colors
+
+def css_palette_name(var_name):
+    """--color-forest-green -> forest-green (Tailwind theme), --sector-tech -> sector-tech"""
+    name = var_name[2:]
+    return name[len("color-"):] if name.startswith("color-") else name
+
+def load_css_colors(path=GLOBALS_CSS):
+    """Resolved colors of every custom property in globals.css, by scope"""
+    try:
+        source = Path(path).read_text(encoding="utf-8")
+    except OSError:
+        return {"light": {}, "dark": {}}
+    return resolve_css_colors(parse_css_variables(source))
+
+# The stylesheet is the source of truth: its values replace the hand-copied
+# entries above and its theme colors become usable utilities for --scan
+CSS_COLORS = load_css_colors()
+LIGHT_COLORS.update(CSS_COLORS["light"])
+DARK_COLORS.update(CSS_COLORS["dark"])
+TAILWIND_COLORS.update(CSS_COLORS["light"])
+
+# Parsed once per run; lookups below never re-parse hex or re-linearize channels
+LIGHT_PALETTE = Palette(LIGHT_COLORS)
+DARK_PALETTE = Palette(DARK_COLORS)
+TEXT_PALETTE = Palette(TEXT_COLORS)
+GROWTH_PALETTE = Palette(GROWTH_COLORS)
+LIGHT_NAV_PALETTE = Palette.merge(TEXT_COLORS, LIGHT_COLORS)
+DARK_NAV_PALETTE = Palette.merge(TEXT_COLORS, GROWTH_COLORS, DARK_COLORS)
+TAILWIND_PALETTE = Palette(TAILWIND_COLORS)
+
+def _require_numpy():
+    """Fail with a helpful message when numpy is not installed"""
+    if np is None:
+        raise RuntimeError("The batched contrast engine requires numpy (pip install numpy)")
+
+def palette_to_array(palette):
+    """Convert a {name: hex} palette into (names, uint8 RGB array of shape (n, 3))"""
+    _require_numpy()
+    names = list(palette)
+    packed = np.array([int(palette[name].lstrip('#'), 16) for name in names], dtype=np.uint32)
+    rgb = np.empty((len(names), 3), dtype=np.uint8)
+    rgb[:, 0] = packed >> 16
+    rgb[:, 1] = (packed >> 8) & 0xFF
+    rgb[:, 2] = packed & 0xFF
+    return names, rgb
+
+def relative_luminance_array(rgb):
+    """Vectorized relative luminance for an (..., 3) array of 0-255 channels"""
+    _require_numpy()
+    linear = np.asarray(SRGB_TO_LINEAR)[np.asarray(rgb, dtype=np.uint8)]
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+def _palette_luminance(palette):
+    """(names, luminance array), reusing the precomputed values of a Palette"""
+    if isinstance(palette, Palette):
+        return list(palette.names), np.frombuffer(palette.luminance, dtype=np.float64)
+    names, rgb = palette_to_array(palette)
+    return names, relative_luminance_array(rgb)
+
+def _palette_apca(palette):
+    """APCA luminance array of a palette, reusing the precomputed values of a Palette"""
+    if isinstance(palette, Palette):
+        return np.frombuffer(palette.apca_y, dtype=np.float64)
+    _, rgb = palette_to_array(palette)
+    return score_luminances(rgb)[1]
+
+def contrast_matrix(fg_palette, bg_palette):
+    """Return (fg_names, bg_names, ratios) with ratios[i, j] = contrast of fg i on bg j"""
+    _require_numpy()
+    fg_names, l_fg = _palette_luminance(fg_palette)
+    bg_names, l_bg = _palette_luminance(bg_palette)
+    l_fg = l_fg[:, None]
+    l_bg = l_bg[None, :]
+    ratios = (np.maximum(l_fg, l_bg) + 0.05) / (np.minimum(l_fg, l_bg) + 0.05)
+    return fg_names, bg_names, ratios
+
+def standard_masks(ratios, lc):
+    """Pass/fail boolean masks for every entry of STANDARDS, from one scoring pass"""
+    return {standard: meets_standard(standard, ratios, lc) for standard in STANDARDS}
+
+def srgb_encode_array(linear):
+    """Inverse of the sRGB linearization: 0-1 linear light to 0-255 floats"""
+    linear = np.clip(linear, 0.0, 1.0)
+    encoded = np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+    return encoded * 255.0
+
+def luminance_to_lightness(y):
+    """CIE L* (0-100) of a relative luminance"""
+    y = np.asarray(y, dtype=np.float64)
+    return np.where(y > 216 / 24389, 116 * np.cbrt(y) - 16, y * 24389 / 27)
+
+def srgb_to_lab(rgb):
+    """Vectorized CIELAB (D65) for an (..., 3) array of 0-255 channels"""
+    linear = np.asarray(SRGB_TO_LINEAR)[np.asarray(rgb, dtype=np.uint8)]
+    xyz = linear @ np.array([
+        [0.4124, 0.2126, 0.0193],
+        [0.3576, 0.7152, 0.1192],
+        [0.1805, 0.0722, 0.9505],
+    ]) / np.array([0.95047, 1.0, 1.08883])
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    return np.stack([116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])], axis=-1)
+
+def delta_e2000(lab1, lab2):
+    """Vectorized CIEDE2000 color difference between broadcastable (..., 3) Lab arrays"""
+    l1, a1, b1 = np.moveaxis(np.asarray(lab1, dtype=np.float64), -1, 0)
+    l2, a2, b2 = np.moveaxis(np.asarray(lab2, dtype=np.float64), -1, 0)
+    c_bar7 = ((np.hypot(a1, b1) + np.hypot(a2, b2)) / 2) ** 7
+    g = 0.5 * (1 - np.sqrt(c_bar7 / (c_bar7 + 25.0 ** 7)))
+    a1, a2 = a1 * (1 + g), a2 * (1 + g)
+    c1, c2 = np.hypot(a1, b1), np.hypot(a2, b2)
+    h1 = np.degrees(np.arctan2(b1, a1)) % 360
+    h2 = np.degrees(np.arctan2(b2, a2)) % 360
+    chromatic = c1 * c2 != 0
+
+    dh = h2 - h1
+    dh = np.where(dh > 180, dh - 360, np.where(dh < -180, dh + 360, dh))
+    dh = np.where(chromatic, dh, 0.0)
+    d_l = l2 - l1
+    d_c = c2 - c1
+    d_h = 2 * np.sqrt(c1 * c2) * np.sin(np.radians(dh / 2))
+
+    l_bar = (l1 + l2) / 2
+    c_bar = (c1 + c2) / 2
+    h_sum = h1 + h2
+    h_bar = np.where(np.abs(h1 - h2) <= 180, h_sum / 2, np.where(h_sum < 360, h_sum + 360, h_sum - 360) / 2)
+    h_bar = np.where(chromatic, h_bar, h_sum)
+    t = (1 - 0.17 * np.cos(np.radians(h_bar - 30)) + 0.24 * np.cos(np.radians(2 * h_bar))
+         + 0.32 * np.cos(np.radians(3 * h_bar + 6)) - 0.20 * np.cos(np.radians(4 * h_bar - 63)))
+    r_c = 2 * np.sqrt(c_bar ** 7 / (c_bar ** 7 + 25.0 ** 7))
+    rotation = -np.sin(np.radians(60 * np.exp(-((h_bar - 275) / 25) ** 2))) * r_c
+    s_l = 1 + 0.015 * (l_bar - 50) ** 2 / np.sqrt(20 + (l_bar - 50) ** 2)
+    s_c = 1 + 0.045 * c_bar
+    s_h = 1 + 0.015 * c_bar * t
+    return np.sqrt((d_l / s_l) ** 2 + (d_c / s_c) ** 2 + (d_h / s_h) ** 2 + rotation * (d_c / s_c) * (d_h / s_h))
+
+# Machado et al. (2009) full-severity dichromacy simulation, applied to linear RGB
+CVD_MATRICES = {
+    "protanopia": ((0.152286, 1.052583, -0.204868),
+                   (0.114503, 0.786281, 0.099216),
+                   (-0.003882, -0.048116, 1.051998)),
+    "deuteranopia": ((0.367322, 0.860646, -0.227968),
+                     (0.280085, 0.672501, 0.047413),
+                     (-0.011820, 0.042940, 0.968881)),
+    "tritanopia": ((1.255528, -0.076749, -0.178779),
+                   (-0.078411, 0.930809, 0.147602),
+                   (0.004733, 0.691367, 0.303900)),
+}
+
+def simulate_cvd(rgb):
+    """(kinds, ..., 3) uint8 RGB of an (..., 3) array as seen with each of CVD_MATRICES
+
+    All kinds are applied in one batched matrix product over the linearized channels.
+    """
+    _require_numpy()
+    linear = np.asarray(SRGB_TO_LINEAR)[np.asarray(rgb, dtype=np.uint8)]
+    matrices = np.array(list(CVD_MATRICES.values()))
+    return _quantize(srgb_encode_array(np.einsum("kij,...j->k...i", matrices, linear)))
+
+def rgb_to_hsl_array(rgb):
+    """Vectorized (hue, saturation, lightness) in 0-1 for (n, 3) 0-255 channels"""
+    c = np.asarray(rgb, dtype=np.float64) / 255.0
+    high, low = c.max(axis=-1), c.min(axis=-1)
+    lightness = (high + low) / 2
+    delta = high - low
+    r, g, b = c[..., 0], c[..., 1], c[..., 2]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        saturation = np.where(delta == 0, 0.0, delta / (1 - np.abs(2 * lightness - 1)))
+        hue = np.select(
+            [delta == 0, high == r, high == g],
+            [0.0, ((g - b) / delta) % 6, (b - r) / delta + 2],
+            (r - g) / delta + 4,
+        ) / 6
+    return hue, np.nan_to_num(saturation), lightness
+
+def hsl_to_rgb_array(hue, saturation, lightness):
+    """Vectorized inverse of rgb_to_hsl_array, returning 0-255 floats"""
+    chroma = (1 - np.abs(2 * lightness - 1)) * saturation
+    k = (np.array([0, 8, 4]) + hue[..., None] * 12) % 12
+    channels = lightness[..., None] - chroma[..., None] / 2 * np.clip(np.minimum(k - 3, 9 - k), -1, 1)
+    return channels * 255.0
+
+def _quantize(rgb):
+    return np.clip(np.rint(rgb), 0, 255).astype(np.uint8)
+
+def _ratio_array(l1, l2):
+    return (np.maximum(l1, l2) + 0.05) / (np.minimum(l1, l2) + 0.05)
+
+def _apca_clamp(y):
+    return np.where(y > APCA_BLACK_THRESHOLD, y, y + np.abs(APCA_BLACK_THRESHOLD - y) ** APCA_BLACK_CLAMP)
+
+def apca_contrast_array(y_text, y_bg):
+    """Vectorized apca_contrast"""
+    y_text, y_bg = np.broadcast_arrays(_apca_clamp(np.asarray(y_text, dtype=np.float64)),
+                                       _apca_clamp(np.asarray(y_bg, dtype=np.float64)))
+    normal = (y_bg ** 0.56 - y_text ** 0.57) * APCA_SCALE
+    reverse = (y_bg ** 0.65 - y_text ** 0.62) * APCA_SCALE
+    lc = np.where(
+        y_bg > y_text,
+        np.where(normal < APCA_LOW_CLIP, 0.0, normal - APCA_OFFSET),
+        np.where(reverse > -APCA_LOW_CLIP, 0.0, reverse + APCA_OFFSET),
+    ) * 100
+    return np.where(np.abs(y_bg - y_text) < APCA_DELTA_Y_MIN, 0.0, lc)
+
+def score_luminances(rgb):
+    """(WCAG luminance, APCA Y) arrays for uint8 RGB, from one gather of both channel tables"""
+    tables = np.stack([SRGB_TO_LINEAR, APCA_TO_LINEAR], axis=-1)
+    weights = np.array([(0.2126, 0.7152, 0.0722), APCA_COEFFICIENTS])
+    linear = tables[np.asarray(rgb, dtype=np.uint8)]
+    return np.einsum("...cm,mc->m...", linear, weights)
+
+def score_rgb(fg_rgb, bg_rgb):
+    """(WCAG ratios, APCA Lc) of uint8 RGB text on uint8 RGB backgrounds"""
+    l_fg, y_fg = score_luminances(fg_rgb)
+    l_bg, y_bg = score_luminances(bg_rgb)
+    return _ratio_array(l_fg, l_bg), apca_contrast_array(y_fg, y_bg)
+
+def nearest_passing_colors(fg_hex, bg_hex, required, iterations=20):
+    """Smallest hue-preserving lightness change to each fg reaching its required ratio
+
+    Returns (uint8 RGB array of shape (n, 3), achieved ratios, feasible mask).
+    Rows where neither a lighter nor a darker fg can reach the ratio keep the
+    original color and are False in the mask.
+    """
+    _require_numpy()
+    fg = np.array([hex_to_rgb(color) for color in fg_hex], dtype=np.uint8).reshape(-1, 3)
+    bg = np.array([hex_to_rgb(color) for color in bg_hex], dtype=np.uint8).reshape(-1, 3)
+    required = np.broadcast_to(np.asarray(required, dtype=np.float64), (len(fg),))
+    l_fg = relative_luminance_array(fg)
+    l_bg = relative_luminance_array(bg)
+
+    # Target luminance solved from the ratio formula, on whichever side of the
+    # background costs the smaller change in perceived lightness (CIE L*)
+    lighter = required * (l_bg + 0.05) - 0.05
+    darker = (l_bg + 0.05) / required - 0.05
+    lightness = luminance_to_lightness(l_fg)
+    cost_up = np.where(lighter <= 1.0, np.abs(luminance_to_lightness(np.clip(lighter, 0, 1)) - lightness), np.inf)
+    cost_down = np.where(darker >= 0.0, np.abs(luminance_to_lightness(np.clip(darker, 0, 1)) - lightness), np.inf)
+    go_up = cost_up <= cost_down
+    feasible = np.isfinite(np.minimum(cost_up, cost_down))
+    target = np.clip(np.where(go_up, lighter, darker), 0.0, 1.0)
+
+    # Scaling linear light toward black (or mixing it toward white) keeps the
+    # chromaticity; rounding away from the background keeps the ratio after quantization
+    linear = np.asarray(SRGB_TO_LINEAR)[fg]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.where(l_fg > 0, target / l_fg, 0.0)
+        mix = np.where(l_fg < 1, (target - l_fg) / (1 - l_fg), 0.0)
+    darkened = np.floor(srgb_encode_array(linear * np.clip(scale, 0, 1)[:, None]))
+    lightened = np.ceil(srgb_encode_array(linear + (1 - linear) * np.clip(mix, 0, 1)[:, None]))
+    fixed = _quantize(np.where(go_up[:, None], lightened, darkened))
+    ratios = _ratio_array(relative_luminance_array(fixed), l_bg)
+
+    # Fallback: bisect HSL lightness (exact hue and saturation) for rows the
+    # analytic step left short
+    retry = np.nonzero(feasible & (ratios < required))[0]
+    if retry.size:
+        hue, saturation, start = rgb_to_hsl_array(fg[retry])
+        up = go_up[retry]
+        lo = np.where(up, start, 0.0)
+        hi = np.where(up, 1.0, start)
+        for _ in range(iterations):
+            mid = (lo + hi) / 2
+            mid_lum = relative_luminance_array(_quantize(hsl_to_rgb_array(hue, saturation, mid)))
+            passes = _ratio_array(mid_lum, l_bg[retry]) >= required[retry]
+            hi = np.where(up == passes, mid, hi)
+            lo = np.where(up == passes, lo, mid)
+        fixed[retry] = _quantize(hsl_to_rgb_array(hue, saturation, np.where(up, hi, lo)))
+        ratios[retry] = _ratio_array(relative_luminance_array(fixed[retry]), l_bg[retry])
+
+    fixed[~feasible] = fg[~feasible]
+    ratios[~feasible] = _ratio_array(l_fg, l_bg)[~feasible]
+    return fixed, ratios, feasible
+
+def nearest_tailwind_shades(fixed_rgb, bg_hex, required, fg_names=()):
+    """Closest (CIELAB) Tailwind color passing on each bg, same hue family first"""
+    _require_numpy()
+    palette = TAILWIND_PALETTE
+    names = palette.names
+    bg = np.array([hex_to_rgb(color) for color in bg_hex], dtype=np.uint8).reshape(-1, 3)
+    required = np.broadcast_to(np.asarray(required, dtype=np.float64), (len(bg),))
+    candidates_lum = np.frombuffer(palette.luminance, dtype=np.float64)
+    passes = _ratio_array(candidates_lum[None, :], relative_luminance_array(bg)[:, None]) >= required[:, None]
+
+    candidates_lab = srgb_to_lab(np.array(palette.rgb, dtype=np.uint8))
+    distance = np.linalg.norm(srgb_to_lab(fixed_rgb)[:, None, :] - candidates_lab[None, :, :], axis=-1)
+    families = np.array([name.rsplit("-", 1)[0] for name in names])
+    for row, name in enumerate(fg_names):
+        same = families == name.rsplit("-", 1)[0]
+        if name in palette and (same & passes[row]).any():
+            distance[row, ~same] += 1000.0
+    distance[~passes] = np.inf
+    best = distance.argmin(axis=1)
+    return [names[i] if np.isfinite(distance[row, i]) else None for row, i in enumerate(best)]
+
+def fix_requirement(standard):
+    """WCAG ratio the fixer targets for a standard; APCA standards use the matching AA level"""
+    metric, minimum = STANDARDS[standard]
+    if metric == "ratio":
+        return minimum
+    return WCAG_THRESHOLDS["AA-large" if standard.endswith("-large") else "AA"]
+
+def print_fix_suggestions(failures, required=WCAG_THRESHOLDS["AA"]):
+    """Print the nearest passing color and Tailwind shade for (label, fg_name, fg_hex, bg_hex) failures"""
+    print()
+    print("=" * 80)
+    print("SUGGESTED FIXES (nearest passing foreground, same hue)")
+    print("=" * 80)
+    print()
+    if not failures:
+        print("Nothing to fix.")
+        return
+    labels, fg_names, fg_hex, bg_hex = zip(*failures)
+    fixed, ratios, feasible = nearest_passing_colors(fg_hex, bg_hex, required)
+    shades = nearest_tailwind_shades(fixed, bg_hex, required, fg_names)
+    for label, old, rgb, ratio, ok, shade in zip(labels, fg_hex, fixed, ratios, feasible, shades):
+        if not ok:
+            print(f"[SKIP] {label}: no lightness of {old} reaches {required}:1 on this background")
+            continue
+        new = "#" + "".join(f"{int(c):02x}" for c in rgb)
+        suggestion = f", Tailwind: {shade}" if shade else ""
+        print(f"{label}: {old} -> {new} ({ratio:.2f}:1){suggestion}")
+
+def audit_record(check, description, fg, bg, ratio, lc, standard="AA", locations=()):
+    """One evaluated pair, as handed to a Reporter"""
+    return {
+        "check": check,
+        "description": description,
+        "fg": fg,
+        "bg": bg,
+        "ratio": round(ratio, 4),
+        "apca": round(lc, 2),
+        "standard": standard,
+        "required": STANDARDS[standard][1],
+        "passed": bool(meets_standard(standard, ratio, lc)),
+        "locations": list(locations),
+    }
+
+def record_message(record):
+    """'<score> (needs <minimum>)' for a record, in the units of its standard"""
+    standard = record["standard"]
+    return f"{format_score(standard, record['ratio'], record['apca'])} (needs {requirement_text(standard)})"
+
+class Reporter:
+    """Streams audit results as they are produced; the base class writes nothing
+
+    The human-readable report is printed by the analysis functions themselves,
+    so the "text" format only needs the pass/fail counts kept here.
+    """
+
+    # Whether passing pairs are worth building records for
+    streams_passes = False
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.total = 0
+        self.failed = 0
+
+    def start(self):
+        pass
+
+    def result(self, record):
+        self.total += 1
+        if not record["passed"]:
+            self.failed += 1
+        self.write(record)
+
+    def write(self, record):
+        pass
+
+    def finish(self):
+        pass
+
+class JsonLinesReporter(Reporter):
+    """One JSON object per evaluated pair"""
+
+    streams_passes = True
+
+    def write(self, record):
+        self.stream.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+class JUnitReporter(Reporter):
+    """JUnit XML, one <testcase> per pair; counts are left to the consumer"""
+
+    streams_passes = True
+
+    def start(self):
+        self.stream.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuite name="wcag-contrast">\n')
+
+    def write(self, record):
+        name = quoteattr(f"{record['description']}: {record['fg']} on {record['bg']}")
+        self.stream.write(f'  <testcase classname={quoteattr(record["check"])} name={name}')
+        if record["passed"]:
+            self.stream.write("/>\n")
+            return
+        message = record_message(record)
+        details = escape("\n".join(record["locations"]))
+        self.stream.write(f">\n    <failure message={quoteattr(message)}>{details}</failure>\n  </testcase>\n")
+
+    def finish(self):
+        self.stream.write(f"  <system-out>{self.failed} of {self.total} pairs failed</system-out>\n</testsuite>\n")
+
+class SarifReporter(Reporter):
+    """SARIF 2.1.0 with one result per failing pair, written incrementally"""
+
+    def start(self):
+        header = {
+            "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+            "version": "2.1.0",
+            "runs": [{
+                "tool": {"driver": {"name": "wcag_audit", "rules": [{
+                    "id": "wcag-contrast",
+                    "shortDescription": {"text": "Text contrast below the WCAG/APCA minimum"},
+                }]}},
+                "results": [],
+            }],
+        }
+        text = json.dumps(header)
+        self._tail = text[text.rindex("[]") + 2:]
+        self.stream.write(text[:text.rindex("[]") + 1] + "\n")
+        self._first = True
+
+    def write(self, record):
+        if record["passed"]:
+            return
+        result = {
+            "ruleId": "wcag-contrast",
+            "level": "error",
+            "message": {"text": f"{record['check']}: {record['description']} - {record['fg']} on "
+                                f"{record['bg']} = {record_message(record)}"},
+        }
+        locations = []
+        for location in record["locations"]:
+            path, _, line = location.rpartition(":")
+            locations.append({"physicalLocation": {
+                "artifactLocation": {"uri": path},
+                "region": {"startLine": int(line)},
+            }})
+        if locations:
+            result["locations"] = locations
+        self.stream.write(("" if self._first else ",\n") + json.dumps(result))
+        self._first = False
+
+    def finish(self):
+        self.stream.write("\n]" + self._tail + "\n")
+
+REPORTERS = {
+    "text": Reporter,
+    "jsonl": JsonLinesReporter,
+    "junit": JUnitReporter,
+    "sarif": SarifReporter,
+}
+
+# Foreground rows per block when streaming the full matrix
+MATRIX_BLOCK_ROWS = 256
+
+def analyze_all_pairings(fix=False, reporter=None, standard="AA"):
+    """Audit every text/growth color against every light and dark background
+
+    The matrix is evaluated in blocks of foreground rows so memory stays flat
+    however large the palettes get. Each block is scored once (WCAG ratio and
+    APCA Lc) and summarized for every standard. Returns the number of pairs
+    failing the selected standard.
+    """
+    _require_numpy()
+    reporter = reporter or Reporter()
+    foregrounds = Palette.merge(TEXT_COLORS, GROWTH_COLORS)
+    contexts = [("LIGHT", LIGHT_PALETTE), ("DARK", DARK_PALETTE)]
+
+    print("=" * 80)
+    print("WCAG FULL PAIRING MATRIX")
+    print("=" * 80)
+    print()
+
+    failed = 0
+    fixes = []
+    fg_names, l_fg = _palette_luminance(foregrounds)
+    y_fg = _palette_apca(foregrounds)
+    for mode, backgrounds in contexts:
+        bg_names, l_bg = _palette_luminance(backgrounds)
+        y_bg = _palette_apca(backgrounds)
+        total = len(fg_names) * len(bg_names)
+        passed = dict.fromkeys(STANDARDS, 0)
+        for start in range(0, len(fg_names), MATRIX_BLOCK_ROWS):
+            block = slice(start, start + MATRIX_BLOCK_ROWS)
+            ratios = _ratio_array(l_fg[block, None], l_bg[None, :])
+            lc = apca_contrast_array(y_fg[block, None], y_bg[None, :])
+            masks = standard_masks(ratios, lc)
+            for level, mask in masks.items():
+                passed[level] += int(mask.sum())
+            failed += int((~masks[standard]).sum())
+            rows, cols = np.nonzero(np.ones_like(masks[standard]) if reporter.streams_passes else ~masks[standard])
+            for i, j in zip(rows.tolist(), cols.tolist()):
+                fg, bg = fg_names[start + i], bg_names[j]
+                reporter.result(audit_record(f"MATRIX {mode}", f"{fg} on {bg}", foregrounds[fg], backgrounds[bg],
+                                             float(ratios[i, j]), float(lc[i, j]), standard))
+                if fix and not masks[standard][i, j]:
+                    fixes.append((f"{mode}: {fg} on {bg}", fg, foregrounds[fg], backgrounds[bg]))
+        print(f"## {mode}: {len(fg_names)} foregrounds x {len(bg_names)} backgrounds = {total} pairs")
+        for level, count in passed.items():
+            print(f"  {level:<10} {count:>6}/{total} pass ({100.0 * count / total:.1f}%)")
+        print()
+
+    print(f"Pairs failing {standard}: {failed}")
+    if fix:
+        print_fix_suggestions(fixes, fix_requirement(standard))
+    return failed
+
+def pair_contrast(palette, fg_names, bg_names):
+    """Vectorized (contrast ratios, APCA Lc) for parallel lists of color names in one palette"""
+    _require_numpy()
+    luminance = np.frombuffer(palette.luminance, dtype=np.float64)
+    apca_y = np.frombuffer(palette.apca_y, dtype=np.float64)
+    index = {name: i for i, name in enumerate(palette.names)}
+    fg = [index[name] for name in fg_names]
+    bg = [index[name] for name in bg_names]
+    return _ratio_array(luminance[fg], luminance[bg]), apca_contrast_array(apca_y[fg], apca_y[bg])
+
+# Samples taken along every gradient when looking for its worst-case contrast
+GRADIENT_SAMPLES = 1024
+
+def parse_layer(spec, palette):
+    """'blue-500', 'blue-900/20', '[#1e40af]' or a 'from>via>to' gradient -> [(hex, alpha), ...]
+
+    Returns None when any stop names a color the palette does not know, or
+    an arbitrary value other than a hex color or a theme variable.
+    """
+    stops = []
+    for token in spec.split(">"):
+        name, _, alpha = token.partition("/")
+        opacity = int(alpha) / 100 if alpha else 1.0
+        hex_value = ARBITRARY_HEX_RE.fullmatch(name)
+        theme = ARBITRARY_VAR_RE.fullmatch(name)
+        if theme:
+            name = theme.group(1)
+        if name == "transparent":
+            stops.append(("#000000", 0.0))
+        elif hex_value:
+            digits = hex_value.group(1).lower()
+            if len(digits) <= 4:
+                digits = "".join(digit * 2 for digit in digits)
+            if len(digits) == 8:
+                opacity *= int(digits[6:], 16) / 255
+            stops.append(("#" + digits[:6], opacity))
+        elif name in palette:
+            stops.append((palette[name], opacity))
+        else:
+            return None
+    return stops
+
+def is_plain_layer(stops):
+    """True for a single opaque color, which needs no compositing or sampling"""
+    return len(stops) == 1 and stops[0][1] >= 1.0
+
+def sample_stops(stops, samples=GRADIENT_SAMPLES):
+    """Premultiplied (samples, 4) RGBA, interpolated between evenly spaced stops"""
+    rgba = np.array([(*hex_to_rgb(color), 255.0) for color, _ in stops], dtype=np.float64)
+    rgba *= np.array([alpha for _, alpha in stops])[:, None] / 255.0
+    if len(stops) == 1:
+        return np.broadcast_to(rgba, (samples, 4))
+    t = np.linspace(0.0, 1.0, samples)
+    positions = np.linspace(0.0, 1.0, len(stops))
+    return np.stack([np.interp(t, positions, rgba[:, k]) for k in range(4)], axis=-1)
+
+def composite(premultiplied, under):
+    """Source-over compositing of premultiplied RGBA onto an opaque 0-255 RGB layer"""
+    return premultiplied[..., :3] * 255.0 + (1.0 - premultiplied[..., 3:]) * under
+
+# What the browser paints under a page background that is not fully opaque
+CANVAS_RGB = (255.0, 255.0, 255.0)
+
+def layered_contrast(fg_layers, bg_layers, parents, samples=GRADIENT_SAMPLES):
+    """Worst-case contrast of (possibly translucent) text over (possibly gradient) backgrounds
+
+    parents are the page background layers each bg sits on, composited over
+    the canvas. Each bg is sampled densely and composited over its parent,
+    and the fg is composited over every sample. Returns (worst ratios, worst
+    APCA Lc, uint8 RGB of the background sample with the worst ratio).
+    """
+    _require_numpy()
+    parent = composite(np.stack([sample_stops(stops, samples) for stops in parents]), np.array(CANVAS_RGB))
+    bg = composite(np.stack([sample_stops(stops, samples) for stops in bg_layers]), parent)
+    fg = np.stack([sample_stops(stops[:1], 1) for stops in fg_layers])
+    bg_rgb = _quantize(bg)
+    fg_rgb = _quantize(composite(fg, bg_rgb))
+    ratios, lc = score_rgb(fg_rgb, bg_rgb)
+    worst = ratios.argmin(axis=1)
+    rows = np.arange(len(worst))
+    worst_lc = lc[rows, np.abs(lc).argmin(axis=1)]
+    return ratios[rows, worst], worst_lc, bg_rgb[rows, worst]
+
+def rendered_text_hex(fg_stops, bg_hex):
+    """Hex of (possibly translucent) text as it renders over an opaque background color"""
+    color, alpha = fg_stops[0]
+    rgb = [round(alpha * fg + (1 - alpha) * bg) for fg, bg in zip(hex_to_rgb(color), hex_to_rgb(bg_hex))]
+    return "#" + "".join(f"{c:02x}" for c in rgb)
+
+def layer_key(fg_stops, bg_stops, parent_stops):
+    """Cache key for a resolved pair; plain pairs keep the short fg:bg form"""
+    def encode(stops):
+        return ">".join(color if alpha >= 1.0 else f"{color}/{alpha:g}" for color, alpha in stops)
+    if is_plain_layer(fg_stops) and is_plain_layer(bg_stops):
+        return f"{fg_stops[0][0]}:{bg_stops[0][0]}"
+    return f"{encode(fg_stops)}:{encode(bg_stops)}@{encode(parent_stops)}"
+
+# Gradient backgrounds of the curated report, sampled end to end (needs numpy)
+GRADIENT_STOPS = {
+    "gradient-blue-green": ("blue-50", "green-50"),
+    "gradient-lime": ("lime-200", "lime-300"),
+}
+
+def report_contrast(fg_palette, fg, bg_palette, bg):
+    """Palette (ratio, APCA Lc), taking the worst case along the gradient for gradient backgrounds"""
+    if bg in GRADIENT_STOPS and np is not None:
+        stops = parse_layer(">".join(GRADIENT_STOPS[bg]), TAILWIND_PALETTE)
+        ratios, lc, _ = layered_contrast([[(fg_palette[fg], 1.0)]], [stops], [[(bg_palette[bg], 1.0)]])
+        return float(ratios[0]), float(lc[0])
+    return fg_palette.scores(fg, bg_palette, bg)
+
+# Components and stylesheets scanned for Tailwind color classes
+SCAN_GLOBS = ("src/app/**/page.tsx", "src/components/**/*.tsx", "src/app/**/*.css")
+
+# Below this many changed files, parsing inline beats spawning a process pool
+POOL_MIN_FILES = 16
+
+CACHE_VERSION = 5
+DEFAULT_CACHE_PATH = ROOT / ".wcag-cache.json"
+
+# @apply rules are the only place stylesheets pair text and bg utilities
+CSS_APPLY_RE = re.compile(r"@apply\s+([^;}]+)")
+
+# One pass over the source: a quote closes the current class string, every
+# other match is an unprefixed or dark:-prefixed text-*/bg-* color utility or
+# a from-*/via-*/to-* gradient stop, named or an arbitrary [value]
+CLASS_TOKEN_RE = re.compile(
+    r"""(?P<quote>["'`])"""
+    r"""|(?<![\w:/-])(?P<dark>dark:)?(?P<kind>text|bg|from|via|to)-"""
+    r"""(?P<color>(?:\[[^\]\s"'`]+\]|[a-z]+(?:-[a-z]+)*(?:-\d{2,3})?)(?:/\d{1,3})?)(?![\w/-])"""
+)
+GRADIENT_BG_RE = re.compile(r"(?:gradient|linear)-to-[a-z]+")
+# Arbitrary values that are colors (text-[14px] is a font size, bg-[url(..)] an image)
+ARBITRARY_COLOR_RE = re.compile(r"\[(?:#|rgba?\(|hsla?\(|var\(--color-|color:)")
+ARBITRARY_HEX_RE = re.compile(r"\[#([0-9a-fA-F]{8}|[0-9a-fA-F]{6}|[0-9a-fA-F]{3,4})\]")
+ARBITRARY_VAR_RE = re.compile(r"\[var\(--color-([a-z0-9-]+)\)\]")
+
+# JSX closing tags ('</div>', '</>') anywhere, opening tags ('<div', '<>') only
+# when not preceded by an identifier, so generics (useState<string>) and
+# comparisons (i<n) are not taken for tags
+JSX_TAG_RE = re.compile(r"</(?P<close>[A-Za-z][\w.]*)?\s*>|(?<![\w)\].$])<(?P<name>[A-Za-z][\w.]*)?")
+# Helpers whose arguments are one className: cn("text-white", on && "bg-blue-600")
+CLASS_HELPER_RE = re.compile(r"(?<![\w.])(?:cn|clsx|classNames|twMerge|cva)\(")
+BRACKETS = {"(": ")", "[": "]", "{": "}"}
+
+# The locale layout's <body> paints every page; its utilities override the
+# base-layer body rule in globals.css (bg-bg-light), so they are the default
+LAYOUT_TSX = ROOT / "src" / "app" / "[locale]" / "layout.tsx"
+
+def _is_color_token(kind, color):
+    """True when a utility's value names a known color (or a gradient direction for bg)"""
+    if kind == "bg" and GRADIENT_BG_RE.fullmatch(color):
+        return True
+    name = color.partition("/")[0]
+    if name.startswith("["):
+        return bool(ARBITRARY_COLOR_RE.match(name))
+    return name in TAILWIND_COLORS or name == "transparent"
+
+def _group_background(group, prefix):
+    """bg spec for one mode: a plain color, or 'from>via>to' for a gradient"""
+    bg = group.get(prefix + "bg") or group.get("bg")
+    if bg and GRADIENT_BG_RE.fullmatch(bg):
+        stops = [group.get(prefix + kind) or group.get(kind) for kind in ("from", "via", "to")]
+        stops = [stop for stop in stops if stop]
+        return ">".join(stops) if stops else None
+    return bg
+
+def _group_text(group, mode):
+    """Text color a class string sets for one mode; dark only when it has dark: utilities"""
+    if mode == "light":
+        return group.get("text")
+    if any(key.startswith("dark:") for key in group):
+        return group.get("dark:text") or group.get("text")
+    return None
+
+def class_groups(source):
+    """(offset, line, {kind: color}) per class string, keyed 'text', 'dark:bg', ..."""
+    groups = []
+    group = {}
+    start = group_line = line = 1
+    last_end = 0
+    for match in CLASS_TOKEN_RE.finditer(source):
+        line += source.count("\n", last_end, match.start())
+        last_end = match.start()
+        if match.group("quote"):
+            if group:
+                groups.append((start, group_line, group))
+                group = {}
+            continue
+        kind, color = match.group("kind"), match.group("color")
+        if not _is_color_token(kind, color):
+            continue  # text-center, bg-cover and other non-color utilities
+        if not group:
+            start, group_line = match.start(), line
+        group.setdefault((match.group("dark") or "") + kind, color)
+    if group:
+        groups.append((start, group_line, group))
+    return groups
+
+def _scan_until(source, pos, stop):
+    """Index of the first stop character at bracket depth 0 from pos, skipping strings and comments"""
+    depth = 0
+    end = len(source)
+    while pos < end:
+        char = source[pos]
+        if char in "\"'`":
+            pos = source.find(char, pos + 1)
+            while pos > 0 and source[pos - 1] == "\\":
+                pos = source.find(char, pos + 1)
+            if pos < 0:
+                return end
+        elif source.startswith("//", pos) and depth:
+            pos = source.find("\n", pos)
+            if pos < 0:
+                return end
+        elif source.startswith("/*", pos):
+            pos = source.find("*/", pos + 2)
+            if pos < 0:
+                return end
+            pos += 1
+        elif depth == 0 and char in stop:
+            return pos
+        elif char in BRACKETS:
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+            if depth < 0:
+                return pos
+        pos += 1
+    return end
+
+def jsx_scopes(source):
+    """Class-string scopes of a TSX source, as (start, end, parent) offsets
+
+    Every JSX tag is a scope spanning its attributes, its parent being the
+    nearest enclosing open element; class helper calls outside tags are
+    scopes without a parent.
+    """
+    scopes = []
+    stack = []
+    for match in JSX_TAG_RE.finditer(source):
+        if match.group(0).startswith("</"):
+            name = match.group("close") or ""
+            names = [scopes[index][3] for index in stack]
+            if name in names:
+                del stack[len(names) - 1 - names[::-1].index(name):]
+            continue
+        name = match.group("name") or ""
+        if not name and not source.startswith(">", match.end()):
+            continue  # a comparison, not a fragment
+        end = _scan_until(source, match.end(), ">")
+        scopes.append((match.start(), end, stack[-1] if stack else None, name))
+        if source[end - 1:end] != "/":
+            stack.append(len(scopes) - 1)
+    for match in CLASS_HELPER_RE.finditer(source):
+        start = match.end()
+        if not any(tag_start <= start < tag_end for tag_start, tag_end, _, _ in scopes):
+            scopes.append((start, _scan_until(source, start, ")"), None, ""))
+    return [(start, end, parent) for start, end, parent, _ in scopes]
+
+def _innermost(scopes, offset):
+    """Index of the narrowest scope containing offset, or None"""
+    best = None
+    for index, (start, end, _) in enumerate(scopes):
+        if start <= offset < end and (best is None or start >= scopes[best][0]):
+            best = index
+    return best
+
+def page_background(layout=LAYOUT_TSX):
+    """{'light': bg, 'dark': bg} set on the layout's <body>, white / gray-900 when it sets none"""
+    background = {"light": "white", "dark": "gray-900"}
+    try:
+        source = layout.read_text(encoding="utf-8")
+    except OSError:
+        return background
+    body = re.search(r"<body\b", source)
+    if body:
+        for _, _, group in class_groups(source[body.end():_scan_until(source, body.end(), ">")]):
+            for mode, prefix in (("light", ""), ("dark", "dark:")):
+                background[mode] = _group_background(group, prefix) or background[mode]
+    return background
+
+# Page backgrounds for text no enclosing element or class string sets one for
+DEFAULT_BACKGROUND = page_background()
+
+def extract_color_pairs(source):
+    """Return (mode, fg, bg, line) tuples for every text color in a source
+
+    A class string without a background of its own is paired with every
+    background-only string in the rest of its tag or class helper call
+    (either branch of `on ? "bg-a" : "bg-b"` may apply), then with the
+    backgrounds of the nearest enclosing element that sets any, and finally
+    with the page default. Strings setting both colors are ternary branches
+    of their own and lend nothing to their siblings.
+    """
+    groups = class_groups(source)
+    scopes = jsx_scopes(source)
+    owners = [_innermost(scopes, offset) for offset, _, _ in groups]
+    # Per scope and mode: backgrounds the whole element may show, and those
+    # set by strings without a text color, which its text strings share
+    backgrounds = [{"light": set(), "dark": set()} for _ in scopes]
+    shared = [{"light": set(), "dark": set()} for _ in scopes]
+    for owner, (_, _, group) in zip(owners, groups):
+        if owner is None:
+            continue
+        for mode, prefix in (("light", ""), ("dark", "dark:")):
+            bg = _group_background(group, prefix)
+            if bg:
+                backgrounds[owner][mode].add(bg)
+                if not _group_text(group, "light") and not _group_text(group, "dark"):
+                    shared[owner][mode].add(bg)
+
+    pairs = []
+    for owner, (_, line, group) in zip(owners, groups):
+        for mode, prefix in (("light", ""), ("dark", "dark:")):
+            fg = _group_text(group, mode)
+            if not fg:
+                continue
+            own = _group_background(group, prefix)
+            candidates = {own} if own else shared[owner][mode] if owner is not None else set()
+            scope = scopes[owner][2] if owner is not None else None
+            while not candidates and scope is not None:
+                candidates = backgrounds[scope][mode]
+                scope = scopes[scope][2]
+            for bg in sorted(candidates) or [DEFAULT_BACKGROUND[mode]]:
+                pairs.append((mode, fg, bg, line))
+    return pairs
+
+def extract_css_pairs(source):
+    """Color pairs from the @apply rules of a stylesheet, one class string per rule"""
+    pairs = []
+    for match in CSS_APPLY_RE.finditer(source):
+        line = source.count("\n", 0, match.start()) + 1
+        pairs.extend((mode, fg, bg, line) for mode, fg, bg, _ in extract_color_pairs(match.group(1)))
+    return pairs
+
+def _scan_source(job):
+    """Worker: (relative path, pairs) for one TSX or CSS source"""
+    name, source = job
+    if name.endswith(".css"):
+        return name, extract_css_pairs(source)
+    return name, extract_color_pairs(source)
+
+def file_digest(data):
+    """Content hash used as the cache key for a scanned file"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def palette_fingerprint():
+    """Hash of the color names the scanner recognizes and the page default; extracted pairs depend on both"""
+    return file_digest(json.dumps([TAILWIND_COLORS, DEFAULT_BACKGROUND], sort_keys=True).encode("utf-8"))
+
+class AuditCache:
+    """On-disk cache of per-file pairs (by content hash), per-pair contrast and the last failures"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self.files = {}
+        self.contrast = {}
+        self.failures = {}
+        self.file_hits = self.file_misses = 0
+        self.pair_hits = self.pair_misses = 0
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION and data.get("palette") == palette_fingerprint():
+            self.files = data.get("files", {})
+            self.contrast = data.get("contrast", {})
+            self.failures = data.get("failures", {})
+
+    def lookup_file(self, name, digest):
+        """Cached pairs for a file, or None when its content changed"""
+        entry = self.files.get(name)
+        if entry is not None and entry["hash"] == digest:
+            self.file_hits += 1
+            return [tuple(pair) for pair in entry["pairs"]]
+        self.file_misses += 1
+        return None
+
+    def store_file(self, name, digest, pairs):
+        self.files[name] = {"hash": digest, "pairs": [list(pair) for pair in pairs]}
+
+    def prune_files(self, names):
+        """Forget files that no longer exist"""
+        keep = set(names)
+        self.files = {name: entry for name, entry in self.files.items() if name in keep}
+
+    def save(self):
+        data = {
+            "version": CACHE_VERSION,
+            "palette": palette_fingerprint(),
+            "files": self.files,
+            "contrast": self.contrast,
+            "failures": self.failures,
+        }
+        self.path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+
+    def summary(self):
+        return (f"cache: files {self.file_hits} hit / {self.file_misses} miss, "
+                f"pairs {self.pair_hits} hit / {self.pair_misses} miss")
+
+def scan_files(root=ROOT):
+    """All files covered by SCAN_GLOBS, sorted for stable output"""
+    files = set()
+    for pattern in SCAN_GLOBS:
+        files.update(Path(root).glob(pattern))
+    return sorted(path.relative_to(root).as_posix() for path in files)
+
+def scan_color_pairs(root=ROOT, workers=None, cache=None):
+    """Map (mode, fg, bg) -> ["file:line", ...] for every color pair found in src/"""
+    files = scan_files(root)
+    results = {}
+    jobs = []
+    digests = {}
+    for name in files:
+        data = (Path(root) / name).read_bytes()
+        digest = digests[name] = file_digest(data)
+        pairs = cache.lookup_file(name, digest) if cache is not None else None
+        if pairs is None:
+            jobs.append((name, data.decode("utf-8", errors="ignore")))
+        else:
+            results[name] = pairs
+
+    if len(jobs) >= POOL_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(_scan_source, jobs, chunksize=8))
+    else:
+        parsed = [_scan_source(job) for job in jobs]
+    for name, pairs in parsed:
+        results[name] = pairs
+        if cache is not None:
+            cache.store_file(name, digests[name], pairs)
+    if cache is not None:
+        cache.prune_files(files)
+
+    found = {}
+    for name in files:
+        for mode, fg, bg, line in results[name]:
+            found.setdefault((mode, fg, bg), []).append(f"{name}:{line}")
+    return files, found
+
+def cached_pair_contrast(pairs, cache=None):
+    """Worst-case contrast for resolved (fg stops, bg stops, page stops) pairs
+
+    Only pairs missing from the cache are evaluated: plain pairs in one
+    vectorized lookup, translucent or gradient ones through layered_contrast.
+    Returns (ratios, APCA Lc, hex of the worst background sample) per pair.
+    """
+    keys = [layer_key(*pair) for pair in pairs]
+    known = cache.contrast if cache is not None else {}
+    missing = {}
+    for key, pair in zip(keys, pairs):
+        if key not in known:
+            missing.setdefault(key, pair)
+    if cache is not None:
+        cache.pair_misses += len(missing)
+        cache.pair_hits += len(keys) - len(missing)
+
+    results = {}
+    plain = [key for key, (fg, bg, _) in missing.items() if is_plain_layer(fg) and is_plain_layer(bg)]
+    plain_keys = set(plain)
+    layered = [key for key in missing if key not in plain_keys]
+    if plain:
+        fg_hex = [missing[key][0][0][0] for key in plain]
+        bg_hex = [missing[key][1][0][0] for key in plain]
+        colors = Palette({color: color for color in fg_hex + bg_hex})
+        ratios, lc = pair_contrast(colors, fg_hex, bg_hex)
+        for key, ratio, score, bg in zip(plain, ratios.tolist(), lc.tolist(), bg_hex):
+            results[key] = [ratio, score, bg]
+    if layered:
+        ratios, lc, worst_bg = layered_contrast(*zip(*(missing[key] for key in layered)))
+        for key, ratio, score, rgb in zip(layered, ratios.tolist(), lc.tolist(), worst_bg):
+            results[key] = [ratio, score, "#" + "".join(f"{int(c):02x}" for c in rgb)]
+    known.update(results)
+    return tuple([known[key][k] for key in keys] for k in range(3))
+
+def analyze_scanned_pairs(root=ROOT, workers=None, cache=None, fix=False, reporter=None, standard="AA",
+                          brief=False):
+    """Audit the text/bg pairs actually used in src/ against one of STANDARDS (WCAG AA by default)
+
+    brief prints a single summary line, plus the failures the cache did not
+    record on its previous run.
+    """
+    reporter = reporter or Reporter()
+    say = print if not brief else lambda *args: None
+    files, found = scan_color_pairs(root, workers, cache)
+    palette = TAILWIND_PALETTE
+    page = {mode: parse_layer(bg, palette) for mode, bg in DEFAULT_BACKGROUND.items()}
+    resolvable = []
+    layers = []
+    text_stops = {}
+    for key in found:
+        mode, fg, bg = key
+        fg_stops, bg_stops = parse_layer(fg, palette), parse_layer(bg, palette)
+        if fg_stops and bg_stops and page[mode]:
+            resolvable.append(key)
+            layers.append((fg_stops, bg_stops, page[mode]))
+            text_stops[fg] = fg_stops
+    skipped = len(found) - len(resolvable)
+
+    say("=" * 80)
+    say("WCAG AUDIT OF COLOR PAIRS FOUND IN SOURCE")
+    say(f"{len(files)} files scanned, {len(found)} distinct pairs, {skipped} skipped (unresolved color)")
+    say("=" * 80)
+    say()
+
+    issues = []
+    failing = []
+    labels = []
+    known = set(cache.failures.get(standard, ())) if cache is not None else set()
+    ratios, lcs, worst_bg = cached_pair_contrast(layers, cache) if resolvable else ([], [], [])
+    scored = sorted(zip(resolvable, ratios, lcs, worst_bg), key=lambda item: item[1])
+    for (mode, fg, bg), ratio, lc, bg_hex in scored:
+        passes = meets_standard(standard, ratio, lc)
+        locations = found[(mode, fg, bg)]
+        name = fg.partition("/")[0]
+        # Translucent text is judged, and fixed, as it renders over the worst background sample
+        fg_hex = rendered_text_hex(text_stops[fg], bg_hex)
+        if not passes or reporter.streams_passes:
+            reporter.result(audit_record(f"SCAN {mode.upper()}", f"text-{fg} on bg-{bg}",
+                                         fg_hex, bg_hex, ratio, lc, standard, locations))
+        if passes:
+            continue
+        label = f"{mode.upper()}: text-{fg} on bg-{bg}"
+        labels.append(label)
+        more = f" (+{len(locations) - 1} more)" if len(locations) > 1 else ""
+        score = format_score(standard, ratio, lc)
+        if not brief or label not in known:
+            print(f"[FAIL] {label} = {score} at {locations[0]}{more}")
+        issues.append(f"{mode.upper()} SCAN: text-{fg} on bg-{bg} - {score} (needs {requirement_text(standard)})")
+        failing.append((label, name, fg_hex, bg_hex))
+
+    say()
+    say(f"{len(resolvable) - len(issues)}/{len(resolvable)} resolvable pairs pass {standard_title(standard)}")
+    if brief:
+        new = sum(1 for label in labels if label not in known)
+        print(f"wcag_audit: {len(issues)}/{len(resolvable)} scanned pairs fail {standard_title(standard)} "
+              f"({new} new, {skipped} skipped)")
+    if fix:
+        print_fix_suggestions(failing, fix_requirement(standard))
+    if cache is not None:
+        cache.failures[standard] = labels
+        cache.save()
+        say(cache.summary())
+    return issues
+
+def is_large_text(font_size_px, font_weight):
+    """WCAG large text: at least 18pt (24px), or 14pt (~18.66px) when bold"""
+    return font_size_px >= 24 or (font_size_px >= 18.66 and font_weight >= 700)
+
+def rendered_contrast(nodes):
+    """Contrast of rendered text nodes collected from the DOM
+
+    Each node carries its text "color" and the background "layers" from the
+    element up to the first opaque ancestor, all as 0-255 RGBA. Layers are
+    composited top-down over a white canvas in one pass over the padded
+    (nodes, depth, 4) array. Returns (ratios, APCA Lc, effective background RGB).
+    """
+    _require_numpy()
+    depth = max([len(node["layers"]) for node in nodes] + [1])
+    layers = np.zeros((len(nodes), depth, 4), dtype=np.float64)
+    for i, node in enumerate(nodes):
+        if node["layers"]:
+            layers[i, :len(node["layers"])] = node["layers"]
+    bg = np.full((len(nodes), 3), 255.0)
+    for d in reversed(range(depth)):
+        alpha = layers[:, d, 3:] / 255.0
+        bg = layers[:, d, :3] * alpha + bg * (1 - alpha)
+    bg_rgb = _quantize(bg)
+    color = np.array([node["color"] for node in nodes], dtype=np.float64).reshape(-1, 4)
+    alpha = color[:, 3:] / 255.0
+    fg_rgb = _quantize(color[:, :3] * alpha + bg_rgb * (1 - alpha))
+    ratios, lc = score_rgb(fg_rgb, bg_rgb)
+    return ratios, lc, bg_rgb
+
+def score_rendered_nodes(url, nodes, reporter=None, standard="AA"):
+    """Score DOM text nodes from one page against a standard, relaxed for large text; returns the failing nodes"""
+    reporter = reporter or Reporter()
+    print(f"## {url}: {len(nodes)} visible text elements")
+    if not nodes:
+        return []
+    ratios, lcs, bg_rgb = rendered_contrast(nodes)
+    failures = []
+    for node, ratio, lc, bg in zip(nodes, ratios.tolist(), lcs.tolist(), bg_rgb):
+        large = is_large_text(node["fontSize"], node["fontWeight"])
+        level = large_variant(standard) if large else standard
+        fg_hex = "#" + "".join(f"{int(c):02x}" for c in node["color"][:3])
+        bg_hex = "#" + "".join(f"{int(c):02x}" for c in bg)
+        passes = meets_standard(level, ratio, lc)
+        if not passes or reporter.streams_passes:
+            reporter.result(audit_record("DOM", f"{url} {node['selector']}", fg_hex, bg_hex, ratio, lc, level))
+        if passes:
+            continue
+        failures.append(node)
+        note = " (over background image)" if node.get("hasImage") else ""
+        print(f"[FAIL] {node['selector']} \"{node['text']}\": {fg_hex} on {bg_hex} = "
+              f"{format_score(level, ratio, lc)} (needs {requirement_text(level)}){note}")
+    print(f"{len(nodes) - len(failures)}/{len(nodes)} text elements pass {standard_title(standard)}")
+    print()
+    return failures
+
+# Screenshots are read in bands of full-width rows and scored per square cell
+SCREENSHOT_BAND_ROWS = 256
+SCREENSHOT_CELL = 16
+# A text cell: at least this share of pixels on the flat background color...
+SCREENSHOT_MIN_BACKGROUND = 0.5
+# ...and between these shares of "ink" pixels standing out from it
+SCREENSHOT_INK_RANGE = (0.02, 0.45)
+# Contrast against the background above which a pixel counts as ink
+SCREENSHOT_INK_RATIO = 1.25
+
+def load_screenshot(path, band_rows=SCREENSHOT_BAND_ROWS):
+    """(height, width, 3) uint8 array backed by a memory map, never a Python-level pixel list
+
+    .npy captures are mapped directly. PNG/JPEG files are opened lazily with
+    Pillow, and each band is cropped, converted to RGB on its own and copied
+    into a memory-mapped temporary file, so no RGB copy of the whole capture
+    is ever held. The analysis then only pages in the rows it is looking at.
+    Pillow still decodes the file's own bitmap once, in C; pass .npy captures
+    to keep even that out of memory.
+    """
+    _require_numpy()
+    path = Path(path)
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r")[..., :3]
+    if Image is None:
+        raise RuntimeError("Decoding screenshots requires Pillow (pip install Pillow), or pass a .npy capture")
+    with Image.open(path) as image:
+        width, height = image.size
+        pixels = np.memmap(tempfile.TemporaryFile(), dtype=np.uint8, mode="w+", shape=(height, width, 3))
+        for top in range(0, height, band_rows):
+            bottom = min(top + band_rows, height)
+            band = image.crop((0, top, width, bottom))
+            pixels[top:bottom] = np.asarray(band if band.mode == "RGB" else band.convert("RGB"))
+    return pixels
+
+def score_screenshot_band(band, cell=SCREENSHOT_CELL):
+    """Estimate text/background colors for every text-like cell of one band of pixels
+
+    The band is cut into cell x cell squares and all cells are scored at
+    once: the background is the per-channel median, ink is whatever stands
+    out from it by SCREENSHOT_INK_RATIO, and a cell's text color is the ink
+    pixel at the 90th percentile of contrast (the glyph cores, not the
+    anti-aliasing). Runs of adjacent text cells on the same background are
+    one line of text and share the strongest text color found along it, so
+    a cell that only caught the edge of a glyph does not report its fringe.
+    Returns (row, col) cell indices, fg RGB, bg RGB, ratios and APCA Lc.
+    """
+    rows, cols = band.shape[0] // cell, band.shape[1] // cell
+    cells = np.ascontiguousarray(band[:rows * cell, :cols * cell, :3])
+    cells = cells.reshape(rows, cell, cols, cell, 3).swapaxes(1, 2).reshape(rows * cols, cell * cell, 3)
+    bg = np.median(cells, axis=1).astype(np.uint8)
+    ratio_px = _ratio_array(relative_luminance_array(cells), relative_luminance_array(bg)[:, None])
+    flat = (cells == bg[:, None, :]).all(axis=-1).mean(axis=1)
+    ink = ratio_px >= SCREENSHOT_INK_RATIO
+    share = ink.mean(axis=1)
+    text = (flat >= SCREENSHOT_MIN_BACKGROUND) & (share >= SCREENSHOT_INK_RANGE[0]) & (share <= SCREENSHOT_INK_RANGE[1])
+    index = np.flatnonzero(text)
+    if not len(index):
+        empty = np.empty((0, 3), dtype=np.uint8)
+        return np.empty((0, 2), dtype=np.intp), empty, empty, np.empty(0), np.empty(0)
+
+    ranked = np.argsort(np.where(ink[index], ratio_px[index], np.nan), axis=1)  # non-ink (NaN) sorts last
+    pick = ranked[np.arange(len(index)), (0.9 * (share[index] * cell * cell - 1)).astype(np.intp)]
+    target = ratio_px[index, pick]
+    fg = cells[index, pick]
+
+    same_bg = np.zeros(rows * cols, dtype=bool)
+    same_bg[1:] = (bg[1:] == bg[:-1]).all(axis=1) & text[:-1] & (np.arange(1, rows * cols) % cols != 0)
+    line = np.cumsum(text & ~same_bg)[index]
+    order = np.lexsort((target, line))
+    last = np.r_[line[order][1:] != line[order][:-1], True]
+    strongest = dict(zip(line[order][last].tolist(), order[last].tolist()))
+    fg = fg[[strongest[run] for run in line.tolist()]]
+    ratios, lc = score_rgb(fg, bg[index])
+    return np.stack(np.divmod(index, cols), axis=1), fg, bg[index], ratios, lc
+
+def analyze_screenshot(path, reporter=None, standard="AA", band_rows=SCREENSHOT_BAND_ROWS, cell=SCREENSHOT_CELL):
+    """Check contrast on the rendered pixels of a (full-page) screenshot
+
+    Text cells sharing the same estimated fg/bg colors are grouped into one
+    region with their bounding box. Pixel-level estimates cannot tell text
+    size, so regions are judged against the standard for body text.
+    Returns the failing regions as issue strings.
+    """
+    reporter = reporter or Reporter()
+    pixels = load_screenshot(path, band_rows)
+    height, width = pixels.shape[:2]
+    band_rows -= band_rows % cell
+
+    regions = {}
+    for top in range(0, height, band_rows):
+        index, fg, bg, ratios, lcs = score_screenshot_band(pixels[top:top + band_rows], cell)
+        if not len(index):
+            continue
+        # Group the band's cells by (fg, bg) before touching Python objects
+        packed = np.concatenate([fg, bg], axis=1).astype(np.uint64) @ (256 ** np.arange(5, -1, -1, dtype=np.uint64))
+        keys, first, group = np.unique(packed, return_index=True, return_inverse=True)
+        y, x = top + index[:, 0] * cell, index[:, 1] * cell
+        boxes = np.empty((len(keys), 4), dtype=np.int64)
+        boxes[:, :2] = np.iinfo(np.int64).max
+        boxes[:, 2:] = np.iinfo(np.int64).min
+        np.minimum.at(boxes[:, 0], group, x)
+        np.minimum.at(boxes[:, 1], group, y)
+        np.maximum.at(boxes[:, 2], group, x + cell)
+        np.maximum.at(boxes[:, 3], group, y + cell)
+        counts = np.bincount(group, minlength=len(keys))
+        for k, i in enumerate(first.tolist()):
+            key = ("#" + "".join(f"{int(c):02x}" for c in fg[i]), "#" + "".join(f"{int(c):02x}" for c in bg[i]))
+            region = regions.setdefault(key, {"ratio": float(ratios[i]), "lc": float(lcs[i]), "cells": 0,
+                                              "box": [width, height, 0, 0]})
+            region["cells"] += int(counts[k])
+            x0, y0, x1, y1 = boxes[k].tolist()
+            box = region["box"]
+            box[:] = [min(box[0], x0), min(box[1], y0), max(box[2], x1), max(box[3], y1)]
+
+    print("=" * 80)
+    print(f"PIXEL CONTRAST OF {path}")
+    print(f"{width}x{height} px, {sum(r['cells'] for r in regions.values())} text cells, {len(regions)} color pairs")
+    print("=" * 80)
+    print()
+
+    issues = []
+    for (fg, bg), region in sorted(regions.items(), key=lambda item: item[1]["ratio"]):
+        passes = meets_standard(standard, region["ratio"], region["lc"])
+        x0, y0, x1, y1 = region["box"]
+        where = f"{path} @ {x0},{y0} {x1 - x0}x{y1 - y0} ({region['cells']} cells)"
+        if not passes or reporter.streams_passes:
+            reporter.result(audit_record("PIXELS", where, fg, bg, region["ratio"], region["lc"], standard))
+        if passes:
+            continue
+        score = format_score(standard, region["ratio"], region["lc"])
+        print(f"[FAIL] {fg} on {bg} = {score} at {where}")
+        issues.append(f"PIXELS: {fg} on {bg} - {score} (needs {requirement_text(standard)})")
+
+    print()
+    print(f"{len(regions) - len(issues)}/{len(regions)} color pairs pass {standard_title(standard)}")
+    return issues
+
+# Precomputed "safe pairings" artifacts, imported by the app from src/data
+PAIRINGS_DIR = ROOT / "src" / "data"
+PAIRINGS_NAME = "contrast-pairings"
+PAIRINGS_LEVELS = {"aa": WCAG_THRESHOLDS["AA"], "aaa": WCAG_THRESHOLDS["AAA"]}
+# Translucent background tints in use across src/, evaluated per page context
+PAIRINGS_ALPHAS = (10, 20, 30, 50)
+# Samples along a gradient page background a tint is composited over
+PAIRINGS_PAGE_SAMPLES = 16
+
+def build_safe_pairings(alphas=PAIRINGS_ALPHAS):
+    """Every Tailwind text color against every background, as base64 pass bitmasks
+
+    Opaque backgrounds look the same everywhere; translucent ones are
+    composited over the light and dark page backgrounds of the layout
+    (page_background()) separately, and must pass over every sample of a
+    gradient one. A context whose page background cannot be resolved gets
+    no tinted entries. Bit i of a mask (most significant bit first) is set
+    when texts[i] passes.
+    """
+    _require_numpy()
+    palette = TAILWIND_PALETTE
+    texts = list(palette.names)
+    l_text = np.frombuffer(palette.luminance, dtype=np.float64)
+    rgb = np.array(palette.rgb, dtype=np.float64)
+
+    def masks(bg_names, ratios):
+        rows = {name: {} for name in bg_names}
+        for level, threshold in PAIRINGS_LEVELS.items():
+            packed = np.packbits(ratios >= threshold, axis=1)
+            for name, row in zip(bg_names, packed):
+                rows[name][level] = base64.b64encode(row.tobytes()).decode("ascii")
+        return rows
+
+    backgrounds = {"opaque": masks(texts, _ratio_array(relative_luminance_array(rgb)[:, None], l_text[None, :]))}
+    tinted = [f"{name}/{alpha}" for name in texts for alpha in alphas]
+    opacity = np.tile(np.array(alphas, dtype=np.float64) / 100, len(texts))[:, None, None]
+    tints = np.repeat(rgb, len(alphas), axis=0)[:, None, :]
+    for context, page in DEFAULT_BACKGROUND.items():
+        stops = parse_layer(page, palette)
+        if stops is None:
+            backgrounds[context] = {}
+            continue
+        under = composite(sample_stops(stops, PAIRINGS_PAGE_SAMPLES), np.array(CANVAS_RGB))
+        under = np.unique(_quantize(under), axis=0).astype(np.float64)[None, :, :]
+        l_bg = relative_luminance_array(_quantize(tints * opacity + under * (1 - opacity)))
+        backgrounds[context] = masks(tinted, _ratio_array(l_bg[:, :, None], l_text[None, None, :]).min(axis=1))
+
+    return {
+        "version": 2,
+        "thresholds": PAIRINGS_LEVELS,
+        "pageBackground": dict(DEFAULT_BACKGROUND),
+        "texts": texts,
+        "backgrounds": backgrounds,
+    }
+
+PAIRINGS_TS = """\
+// Generated by `python wcag_audit.py --pairings`; do not edit by hand.
+import pairings from "./contrast-pairings.json";
+
+export type ContrastLevel = "aa" | "aaa";
+export type ContrastContext = "light" | "dark";
+
+type Masks = Record<ContrastLevel, string>;
+
+const texts: string[] = pairings.texts;
+const backgrounds = pairings.backgrounds as unknown as Record<"opaque" | ContrastContext, Record<string, Masks>>;
+const textIndex = new Map<string, number>(texts.map((name, index): [string, number] => [name, index]));
+
+function masksFor(background: string, context: ContrastContext): Masks | undefined {
+  return background.includes("/") ? backgrounds[context][background] : backgrounds.opaque[background];
+}
+
+function hasBit(mask: string, index: number): boolean {
+  return ((atob(mask).charCodeAt(index >> 3) >> (7 - (index & 7))) & 1) === 1;
+}
+
+/** Whether `text-<text>` on `bg-<background>` meets the WCAG level (e.g. "gray-700", "blue-900/20"). */
+export function isContrastSafe(
+  text: string,
+  background: string,
+  level: ContrastLevel = "aa",
+  context: ContrastContext = "light",
+): boolean {
+  const index = textIndex.get(text);
+  const masks = masksFor(background, context);
+  return index !== undefined && masks !== undefined && hasBit(masks[level], index);
+}
+
+/** Every Tailwind text color that meets the WCAG level on `bg-<background>`. */
+export function safeTextColors(
+  background: string,
+  level: ContrastLevel = "aa",
+  context: ContrastContext = "light",
+): string[] {
+  const masks = masksFor(background, context);
+  if (!masks) {
+    return [];
+  }
+  return texts.filter((_, index) => hasBit(masks[level], index));
+}
+"""
+
+def write_safe_pairings(out_dir=PAIRINGS_DIR):
+    """Write the JSON table and its typed TS accessor; returns the JSON path"""
+    table = build_safe_pairings()
+    out_dir = Path(out_dir)
+    json_path = out_dir / f"{PAIRINGS_NAME}.json"
+    json_path.write_text(json.dumps(table, separators=(",", ":")) + "\n", encoding="utf-8")
+    (out_dir / f"{PAIRINGS_NAME}.ts").write_text(PAIRINGS_TS, encoding="utf-8")
+    return json_path, table
+
+def load_safe_pairings(path=PAIRINGS_DIR / f"{PAIRINGS_NAME}.json"):
+    """The generated table, or None when it has not been generated yet"""
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def is_safe_pairing(table, text, background, level="aa", context="light"):
+    """Python twin of isContrastSafe() in the generated TS module"""
+    try:
+        index = table["texts"].index(text)
+    except ValueError:
+        return False
+    section = table["backgrounds"][context if "/" in background else "opaque"]
+    if background not in section:
+        return False
+    mask = base64.b64decode(section[background][level])
+    return bool(mask[index >> 3] >> (7 - (index & 7)) & 1)
+
+def generate_safe_pairings(out_dir=PAIRINGS_DIR):
+    """CLI entry: regenerate the lookup artifacts and summarize them"""
+    json_path, table = write_safe_pairings(out_dir)
+    texts = len(table["texts"])
+    rows = sum(len(section) for section in table["backgrounds"].values())
+    print(f"{texts} text colors x {rows} backgrounds = {texts * rows} pairs")
+    print(f"Wrote {json_path} ({json_path.stat().st_size / 1024:.0f} KiB) and {PAIRINGS_NAME}.ts")
+
+
+# Badge sets told apart by color alone: family name -> LIGHT_COLORS prefix
+BADGE_FAMILIES = {
+    "Brazil sectors": "br-",
+    "iREC Mundo sectors": "irec-mundo-",
+}
+# Below this CIEDE2000 distance two filled badges read as the same color at a glance
+MIN_BADGE_DELTA_E = 10.0
+
+VISIONS = ("normal", *CVD_MATRICES)
+
+def badge_distances(rgb):
+    """(views, distances) for n badge colors, one row per entry of VISIONS
+
+    views is the (visions, n, 3) uint8 RGB as seen, distances the
+    (visions, n, n) pairwise CIEDE2000 matrices, all from one broadcast.
+    """
+    _require_numpy()
+    rgb = np.asarray(rgb, dtype=np.uint8)
+    views = np.concatenate([rgb[None], simulate_cvd(rgb)])
+    lab = srgb_to_lab(views)
+    return views, delta_e2000(lab[:, :, None, :], lab[:, None, :, :])
+
+def analyze_badge_distinguishability(palette=LIGHT_PALETTE, families=BADGE_FAMILIES,
+                                     min_delta_e=MIN_BADGE_DELTA_E):
+    """Flag badge pairs of one family that become indistinguishable under color-vision deficiency
+
+    Returns the list of issues, one per (vision, pair) below min_delta_e.
+    """
+    _require_numpy()
+    print("=" * 80)
+    print("BADGE DISTINGUISHABILITY (CIEDE2000, normal vision and simulated CVD)")
+    print("=" * 80)
+    print()
+
+    issues = []
+    for family, prefix in families.items():
+        names = [name for name in palette.names if name.startswith(prefix)]
+        views, distances = badge_distances([hex_to_rgb(palette[name]) for name in names])
+        rows, cols = np.triu_indices(len(names), 1)
+        print(f"## {family}: {len(names)} badges, {len(rows)} pairs")
+        for vision, seen, matrix in zip(VISIONS, views, distances):
+            pairs = matrix[rows, cols]
+            close = np.flatnonzero(pairs < min_delta_e)
+            print(f"  {vision:<13} min dE00 {pairs.min():6.2f}, {len(close)} pairs below {min_delta_e:g}")
+            for k in close[np.argsort(pairs[close])].tolist():
+                i, j = rows[k], cols[k]
+                colors = " vs ".join("#" + "".join(f"{int(c):02x}" for c in seen[n]) for n in (i, j))
+                print(f"    [FAIL] {names[i]} / {names[j]}: {colors} = dE00 {pairs[k]:.2f}")
+                issues.append(f"{vision.upper()}: {names[i]} / {names[j]} - dE00 {pairs[k]:.2f} (needs {min_delta_e:g})")
+        print()
+
+    print(f"Indistinguishable badge pairs: {len(issues)}")
+    return issues
+
+def analyze_color_combinations(fix=False, reporter=None, standard="AA"):
+    """Analyze all color combinations for compliance with one of STANDARDS (WCAG AA by default)"""
+    reporter = reporter or Reporter()
     
     print("=" * 80)
-    print("WCAG AA CONTRAST COMPLIANCE AUDIT")
+    print(f"{standard_title(standard)} CONTRAST COMPLIANCE AUDIT")
     print("Sintropia Carbono - All 6 HTML Pages")
     print("=" * 80)
     print()
     
     all_issues = []
+    failing = []
     
     # LIGHT MODE ANALYSIS
     print("=" * 80)
@@ -298,13 +1983,15 @@ def analyze_color_combinations():
     ]
     
     for text, bg, description in text_bg_combos:
-        if text in TEXT_COLORS and bg in LIGHT_COLORS:
-            ratio = contrast_ratio(TEXT_COLORS[text], LIGHT_COLORS[bg])
-            passes = check_wcag_aa(ratio)
+        if text in TEXT_PALETTE and bg in LIGHT_PALETTE:
+            ratio, lc = report_contrast(TEXT_PALETTE, text, LIGHT_PALETTE, bg)
+            passes = meets_standard(standard, ratio, lc)
+            reporter.result(audit_record("LIGHT", description, TEXT_PALETTE[text], LIGHT_PALETTE[bg], ratio, lc, standard))
             status = "[PASS]" if passes else "[FAIL]"
-            print(f"{status} {description}: {TEXT_COLORS[text]} on {LIGHT_COLORS[bg]} = {ratio:.2f}:1")
+            print(f"{status} {description}: {TEXT_COLORS[text]} on {LIGHT_COLORS[bg]} = {format_score(standard, ratio, lc)}")
             if not passes:
-                all_issues.append(f"LIGHT: {description} - {ratio:.2f}:1 (needs 4.5:1)")
+                all_issues.append(f"LIGHT: {description} - {format_score(standard, ratio, lc)} (needs {requirement_text(standard)})")
+                failing.append((description, text, TEXT_PALETTE[text], LIGHT_PALETTE[bg]))
     
     print()
     print("## Badge Text (Light Mode)")
@@ -356,13 +2043,15 @@ def analyze_color_combinations():
     ]
     
     for text, bg, description in badge_combos:
-        if text in TEXT_COLORS and bg in LIGHT_COLORS:
-            ratio = contrast_ratio(TEXT_COLORS[text], LIGHT_COLORS[bg])
-            passes = check_wcag_aa(ratio)
+        if text in TEXT_PALETTE and bg in LIGHT_PALETTE:
+            ratio, lc = report_contrast(TEXT_PALETTE, text, LIGHT_PALETTE, bg)
+            passes = meets_standard(standard, ratio, lc)
+            reporter.result(audit_record("LIGHT BADGE", description, TEXT_PALETTE[text], LIGHT_PALETTE[bg], ratio, lc, standard))
             status = "[PASS]" if passes else "[FAIL]"
-            print(f"{status} {description}: White on {LIGHT_COLORS[bg]} = {ratio:.2f}:1")
+            print(f"{status} {description}: White on {LIGHT_COLORS[bg]} = {format_score(standard, ratio, lc)}")
             if not passes:
-                all_issues.append(f"LIGHT BADGE: {description} - {ratio:.2f}:1 (needs 4.5:1)")
+                all_issues.append(f"LIGHT BADGE: {description} - {format_score(standard, ratio, lc)} (needs {requirement_text(standard)})")
+                failing.append((description, text, TEXT_PALETTE[text], LIGHT_PALETTE[bg]))
     
     print()
     print("## Growth Indicators (Light Mode)")
@@ -381,13 +2070,15 @@ def analyze_color_combinations():
     ]
     
     for text, bg, description in growth_combos:
-        if text in GROWTH_COLORS and bg in LIGHT_COLORS:
-            ratio = contrast_ratio(GROWTH_COLORS[text], LIGHT_COLORS[bg])
-            passes = check_wcag_aa(ratio)
+        if text in GROWTH_PALETTE and bg in LIGHT_PALETTE:
+            ratio, lc = report_contrast(GROWTH_PALETTE, text, LIGHT_PALETTE, bg)
+            passes = meets_standard(standard, ratio, lc)
+            reporter.result(audit_record("LIGHT GROWTH", description, GROWTH_PALETTE[text], LIGHT_PALETTE[bg], ratio, lc, standard))
             status = "[PASS]" if passes else "[FAIL]"
-            print(f"{status} {description}: {GROWTH_COLORS[text]} on white = {ratio:.2f}:1")
+            print(f"{status} {description}: {GROWTH_COLORS[text]} on white = {format_score(standard, ratio, lc)}")
             if not passes:
-                all_issues.append(f"LIGHT GROWTH: {description} - {ratio:.2f}:1 (needs 4.5:1)")
+                all_issues.append(f"LIGHT GROWTH: {description} - {format_score(standard, ratio, lc)} (needs {requirement_text(standard)})")
+                failing.append((description, text, GROWTH_PALETTE[text], LIGHT_PALETTE[bg]))
     
     print()
     print("## Navigation & Buttons (Light Mode)")
@@ -401,14 +2092,16 @@ def analyze_color_combinations():
     ]
     
     for text, bg, description in nav_combos:
-        color_map = {**TEXT_COLORS, **LIGHT_COLORS}
+        color_map = LIGHT_NAV_PALETTE
         if text in color_map and bg in color_map:
-            ratio = contrast_ratio(color_map[text], color_map[bg])
-            passes = check_wcag_aa(ratio)
+            ratio, lc = report_contrast(color_map, text, color_map, bg)
+            passes = meets_standard(standard, ratio, lc)
+            reporter.result(audit_record("LIGHT NAV", description, color_map[text], color_map[bg], ratio, lc, standard))
             status = "[PASS]" if passes else "[FAIL]"
-            print(f"{status} {description}: {color_map[text]} on {color_map[bg]} = {ratio:.2f}:1")
+            print(f"{status} {description}: {color_map[text]} on {color_map[bg]} = {format_score(standard, ratio, lc)}")
             if not passes:
-                all_issues.append(f"LIGHT NAV: {description} - {ratio:.2f}:1 (needs 4.5:1)")
+                all_issues.append(f"LIGHT NAV: {description} - {format_score(standard, ratio, lc)} (needs {requirement_text(standard)})")
+                failing.append((description, text, color_map[text], color_map[bg]))
     
     # DARK MODE ANALYSIS
     print()
@@ -457,13 +2150,15 @@ def analyze_color_combinations():
     ]
     
     for text, bg, description in dark_text_bg_combos:
-        if text in TEXT_COLORS and bg in DARK_COLORS:
-            ratio = contrast_ratio(TEXT_COLORS[text], DARK_COLORS[bg])
-            passes = check_wcag_aa(ratio)
+        if text in TEXT_PALETTE and bg in DARK_PALETTE:
+            ratio, lc = report_contrast(TEXT_PALETTE, text, DARK_PALETTE, bg)
+            passes = meets_standard(standard, ratio, lc)
+            reporter.result(audit_record("DARK", description, TEXT_PALETTE[text], DARK_PALETTE[bg], ratio, lc, standard))
             status = "[PASS]" if passes else "[FAIL]"
-            print(f"{status} {description}: {TEXT_COLORS[text]} on {DARK_COLORS[bg]} = {ratio:.2f}:1")
+            print(f"{status} {description}: {TEXT_COLORS[text]} on {DARK_COLORS[bg]} = {format_score(standard, ratio, lc)}")
             if not passes:
-                all_issues.append(f"DARK: {description} - {ratio:.2f}:1 (needs 4.5:1)")
+                all_issues.append(f"DARK: {description} - {format_score(standard, ratio, lc)} (needs {requirement_text(standard)})")
+                failing.append((description, text, TEXT_PALETTE[text], DARK_PALETTE[bg]))
     
     print()
     print("## Badge Text (Dark Mode)")
@@ -516,13 +2211,15 @@ def analyze_color_combinations():
     ]
     
     for text, bg, description in dark_badge_combos:
-        if text in TEXT_COLORS and bg in LIGHT_COLORS:
-            ratio = contrast_ratio(TEXT_COLORS[text], LIGHT_COLORS[bg])
-            passes = check_wcag_aa(ratio)
+        if text in TEXT_PALETTE and bg in LIGHT_PALETTE:
+            ratio, lc = report_contrast(TEXT_PALETTE, text, LIGHT_PALETTE, bg)
+            passes = meets_standard(standard, ratio, lc)
+            reporter.result(audit_record("DARK BADGE", description, TEXT_PALETTE[text], LIGHT_PALETTE[bg], ratio, lc, standard))
             status = "[PASS]" if passes else "[FAIL]"
-            print(f"{status} {description}: White on {LIGHT_COLORS[bg]} = {ratio:.2f}:1")
+            print(f"{status} {description}: White on {LIGHT_COLORS[bg]} = {format_score(standard, ratio, lc)}")
             if not passes:
-                all_issues.append(f"DARK BADGE: {description} - {ratio:.2f}:1 (needs 4.5:1)")
+                all_issues.append(f"DARK BADGE: {description} - {format_score(standard, ratio, lc)} (needs {requirement_text(standard)})")
+                failing.append((description, text, TEXT_PALETTE[text], LIGHT_PALETTE[bg]))
     
     print()
     print("## Growth Indicators (Dark Mode)")
@@ -541,13 +2238,15 @@ def analyze_color_combinations():
     ]
     
     for text, bg, description in dark_growth_combos:
-        if text in GROWTH_COLORS and bg in DARK_COLORS:
-            ratio = contrast_ratio(GROWTH_COLORS[text], DARK_COLORS[bg])
-            passes = check_wcag_aa(ratio)
+        if text in GROWTH_PALETTE and bg in DARK_PALETTE:
+            ratio, lc = report_contrast(GROWTH_PALETTE, text, DARK_PALETTE, bg)
+            passes = meets_standard(standard, ratio, lc)
+            reporter.result(audit_record("DARK GROWTH", description, GROWTH_PALETTE[text], DARK_PALETTE[bg], ratio, lc, standard))
             status = "[PASS]" if passes else "[FAIL]"
-            print(f"{status} {description}: {GROWTH_COLORS[text]} on {DARK_COLORS[bg]} = {ratio:.2f}:1")
+            print(f"{status} {description}: {GROWTH_COLORS[text]} on {DARK_COLORS[bg]} = {format_score(standard, ratio, lc)}")
             if not passes:
-                all_issues.append(f"DARK GROWTH: {description} - {ratio:.2f}:1 (needs 4.5:1)")
+                all_issues.append(f"DARK GROWTH: {description} - {format_score(standard, ratio, lc)} (needs {requirement_text(standard)})")
+                failing.append((description, text, GROWTH_PALETTE[text], DARK_PALETTE[bg]))
     
     print()
     print("## Navigation & Buttons (Dark Mode)")
@@ -559,14 +2258,16 @@ def analyze_color_combinations():
     ]
     
     for text, bg, description in dark_nav_combos:
-        color_map = {**TEXT_COLORS, **GROWTH_COLORS, **DARK_COLORS}
+        color_map = DARK_NAV_PALETTE
         if text in color_map and bg in color_map:
-            ratio = contrast_ratio(color_map[text], color_map[bg])
-            passes = check_wcag_aa(ratio)
+            ratio, lc = report_contrast(color_map, text, color_map, bg)
+            passes = meets_standard(standard, ratio, lc)
+            reporter.result(audit_record("DARK NAV", description, color_map[text], color_map[bg], ratio, lc, standard))
             status = "[PASS]" if passes else "[FAIL]"
-            print(f"{status} {description}: {color_map[text]} on {color_map[bg]} = {ratio:.2f}:1")
+            print(f"{status} {description}: {color_map[text]} on {color_map[bg]} = {format_score(standard, ratio, lc)}")
             if not passes:
-                all_issues.append(f"DARK NAV: {description} - {ratio:.2f}:1 (needs 4.5:1)")
+                all_issues.append(f"DARK NAV: {description} - {format_score(standard, ratio, lc)} (needs {requirement_text(standard)})")
+                failing.append((description, text, color_map[text], color_map[bg]))
     
     # SUMMARY
     print()
@@ -576,12 +2277,12 @@ def analyze_color_combinations():
     print()
     
     if all_issues:
-        print(f"[FAIL] FOUND {len(all_issues)} WCAG AA CONTRAST ISSUES:")
+        print(f"[FAIL] FOUND {len(all_issues)} {standard_title(standard)} CONTRAST ISSUES:")
         print()
         for i, issue in enumerate(all_issues, 1):
             print(f"{i}. {issue}")
     else:
-        print("[PASS] ALL COLOR COMBINATIONS PASS WCAG AA CONTRAST REQUIREMENTS!")
+        print(f"[PASS] ALL COLOR COMBINATIONS PASS {standard_title(standard)} CONTRAST REQUIREMENTS!")
     
     print()
     print("=" * 80)
@@ -590,17 +2291,72 @@ def analyze_color_combinations():
     print()
     
     if all_issues:
-        print("Issues found. See above for details.")
+        if fix:
+            print_fix_suggestions(failing, fix_requirement(standard))
+        else:
+            print("Issues found. Run with --fix for the nearest passing colors.")
         print()
         print("General recommendations:")
-        print("1. Ensure all text has a minimum contrast ratio of 4.5:1")
-        print("2. For large text (18pt+ or 14pt+bold), minimum is 3:1")
+        print(f"1. Ensure all text has a minimum contrast of {requirement_text(standard)}")
+        print(f"2. For large text (18pt+ or 14pt+bold), minimum is {requirement_text(large_variant(standard))}")
         print("3. Check badge colors - many may need adjustment")
         print("4. Verify growth indicator colors are visible on both light and dark backgrounds")
     else:
-        print("No fixes needed - all combinations meet WCAG AA standards!")
+        print(f"No fixes needed - all combinations meet {standard_title(standard)} standards!")
     
     return all_issues
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="WCAG contrast audit for Sintropia Carbono")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--matrix", action="store_true", help="audit every foreground x background pairing")
+    mode.add_argument("--scan", action="store_true", help="audit text/bg class pairs found in src/")
+    mode.add_argument("--screenshot", nargs="+", metavar="IMAGE",
+                      help="check contrast on the rendered pixels of screenshots (PNG/JPEG via Pillow, or .npy)")
+    mode.add_argument("--cvd", action="store_true",
+                      help="check that badges of one family stay distinguishable under color-vision deficiency")
+    mode.add_argument("--pairings", action="store_true",
+                      help=f"regenerate src/data/{PAIRINGS_NAME}.json/.ts (safe text shades per background)")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size for --scan")
+    parser.add_argument("--cache", nargs="?", const=str(DEFAULT_CACHE_PATH), default=None,
+                        help="reuse results for unchanged files from this cache (--scan only)")
+    parser.add_argument("--brief", action="store_true",
+                        help="--scan: one summary line, plus the failures the cache has not seen before")
+    parser.add_argument("--fix", action="store_true",
+                        help="suggest the nearest passing color and Tailwind shade for each failure")
+    parser.add_argument("--standard", choices=list(STANDARDS), default="AA",
+                        help="standard pairs are judged against (all are scored in the same pass; default: AA)")
+    parser.add_argument("--format", choices=sorted(REPORTERS), default="text",
+                        help="machine-readable result stream (default: the human report only)")
+    parser.add_argument("--output", default=None, help="write the --format stream here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.pairings:
+        generate_safe_pairings()
+        return 0
+    if args.cvd:
+        return 1 if analyze_badge_distinguishability() else 0
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else nullcontext(sys.stdout)
+    with output as stream:
+        reporter = REPORTERS[args.format](stream)
+        # Keep stdout clean for the machine format; the human report goes to stderr
+        human = redirect_stdout(sys.stderr) if args.format != "text" and not args.output else nullcontext()
+        with human:
+            reporter.start()
+            if args.matrix:
+                analyze_all_pairings(fix=args.fix, reporter=reporter, standard=args.standard)
+            elif args.screenshot:
+                for path in args.screenshot:
+                    analyze_screenshot(path, reporter=reporter, standard=args.standard)
+            elif args.scan:
+                cache = AuditCache(args.cache) if args.cache else None
+                analyze_scanned_pairs(workers=args.workers, cache=cache, fix=args.fix, reporter=reporter,
+                                      standard=args.standard, brief=args.brief)
+            else:
+                analyze_color_combinations(fix=args.fix, reporter=reporter, standard=args.standard)
+            reporter.finish()
+    return 1 if reporter.failed else 0
+
 if __name__ == "__main__":
-    issues = analyze_color_combinations()
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the wcag_audit.py contrast hot paths
+Times the scalar helpers, the batched matrix engine and the scan report's pair
+scoring on synthetic palettes from ~120 up to 10^6 pairs, plus the full curated
+report at its own fixed pair count, and fails on throughput regressions
+"""
+
+import argparse
+import io
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import wcag_audit
+
+DEFAULT_SIZES = (120, 1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_BASELINE = Path(__file__).resolve().parent / ".wcag-bench.json"
+
+# Pure-Python paths are ~100x slower; past this they only slow the suite down
+SCALAR_MAX_PAIRS = 100_000
+
+def synthetic_palette(count, seed):
+    """Deterministic {name: hex} palette of random colors"""
+    rng = random.Random(seed)
+    return {f"c{i}": f"#{rng.getrandbits(24):06x}" for i in range(count)}
+
+def synthetic_pairs(count, seed):
+    """Deterministic list of (fg hex, bg hex) pairs"""
+    rng = random.Random(seed)
+    return [(f"#{rng.getrandbits(24):06x}", f"#{rng.getrandbits(24):06x}") for _ in range(count)]
+
+def bench_hex_to_rgb(size):
+    colors = [fg for fg, _ in synthetic_pairs(size, 1)]
+    def run():
+        for color in colors:
+            wcag_audit.hex_to_rgb(color)
+    return run
+
+def bench_relative_luminance(size):
+    rgbs = [wcag_audit.hex_to_rgb(fg) for fg, _ in synthetic_pairs(size, 2)]
+    def run():
+        for rgb in rgbs:
+            wcag_audit.relative_luminance(rgb)
+    return run
+
+def bench_contrast_ratio(size):
+    pairs = synthetic_pairs(size, 3)
+    def run():
+        for fg, bg in pairs:
+            wcag_audit.contrast_ratio(fg, bg)
+    return run
+
+def bench_contrast_matrix(size):
+    side = max(1, math.isqrt(size))
+    foregrounds = synthetic_palette(side, 4)
+    backgrounds = synthetic_palette(max(1, size // side), 5)
+    def run():
+        _, _, ratios = wcag_audit.contrast_matrix(foregrounds, backgrounds)
+        for standard in wcag_audit.WCAG_THRESHOLDS:
+            wcag_audit.meets_standard(standard, ratios, None)
+    return run
+
+def bench_cached_pair_contrast(size):
+    layers = [([(fg, 1.0)], [(bg, 1.0)], "#ffffff") for fg, bg in synthetic_pairs(size, 6)]
+    def run():
+        wcag_audit.cached_pair_contrast(layers)
+    return run
+
+def bench_analyze_color_combinations(size):
+    def run():
+        with redirect_stdout(io.StringIO()):
+            wcag_audit.analyze_color_combinations()
+    return run
+
+# name -> (setup(size) returning a callable, scalar?, fixed pair count or None)
+BENCHMARKS = {
+    "hex_to_rgb": (bench_hex_to_rgb, True, None),
+    "relative_luminance": (bench_relative_luminance, True, None),
+    "contrast_ratio": (bench_contrast_ratio, True, None),
+    "contrast_matrix": (bench_contrast_matrix, False, None),
+    # Builds a key and a palette entry per pair in Python before the vectorized scoring
+    "cached_pair_contrast": (bench_cached_pair_contrast, True, None),
+    # Fixed input: timed once at the curated report's own pair count, whatever --sizes says
+    "analyze_color_combinations": (bench_analyze_color_combinations, True, "curated"),
+}
+
+def curated_pair_count():
+    """Number of pairs the curated report evaluates"""
+    reporter = wcag_audit.Reporter()
+    with redirect_stdout(io.StringIO()):
+        wcag_audit.analyze_color_combinations(reporter=reporter)
+    return reporter.total
+
+def measure(run, repeat):
+    """(best wall time over repeat runs, peak traced bytes of one extra run)"""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def run_benchmarks(names, sizes, repeat, full=False):
+    """Yield one result dict per (benchmark, size)"""
+    for name in names:
+        setup, scalar, fixed = BENCHMARKS[name]
+        bench_sizes = [curated_pair_count()] if fixed == "curated" else sizes
+        for size in bench_sizes:
+            if scalar and size > SCALAR_MAX_PAIRS and not full:
+                continue
+            wall, peak = measure(setup(size), repeat)
+            yield {
+                "name": name,
+                "pairs": size,
+                "wall_s": wall,
+                "pairs_per_s": size / wall if wall > 0 else math.inf,
+                "peak_mb": peak / 1e6,
+            }
+
+def find_regressions(results, baseline, tolerance):
+    """Results whose throughput fell more than tolerance below the baseline"""
+    reference = {(entry["name"], entry["pairs"]): entry["pairs_per_s"] for entry in baseline}
+    regressions = []
+    for result in results:
+        expected = reference.get((result["name"], result["pairs"]))
+        if expected and result["pairs_per_s"] < expected * (1 - tolerance):
+            regressions.append((result, expected))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the wcag_audit.py contrast engine")
+    parser.add_argument("--bench", action="append", choices=sorted(BENCHMARKS),
+                        help="benchmark to run (repeatable, default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="pair counts for the synthetic palettes (analyze_color_combinations always "
+                             "runs at the curated count)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per size (best is kept)")
+    parser.add_argument("--full", action="store_true",
+                        help=f"also run scalar benchmarks above {SCALAR_MAX_PAIRS} pairs")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed throughput drop versus the baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    if wcag_audit.np is None:
+        parser.error("benchmarks need numpy (pip install numpy)")
+
+    names = args.bench or list(BENCHMARKS)
+    print(f"{'benchmark':<28} {'pairs':>9} {'wall (s)':>10} {'pairs/s':>14} {'peak (MB)':>10}")
+    print("-" * 75)
+    results = []
+    for result in run_benchmarks(names, args.sizes, args.repeat, args.full):
+        results.append(result)
+        print(f"{result['name']:<28} {result['pairs']:>9} {result['wall_s']:>10.4f} "
+              f"{result['pairs_per_s']:>14,.0f} {result['peak_mb']:>10.2f}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nBaseline saved to {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to create one")
+        return 0
+
+    regressions = find_regressions(results, json.loads(baseline_path.read_text(encoding="utf-8")), args.tolerance)
+    print()
+    if not regressions:
+        print(f"[PASS] No throughput regressions beyond {args.tolerance:.0%}")
+        return 0
+    for result, expected in regressions:
+        print(f"[FAIL] {result['name']} @ {result['pairs']} pairs: "
+              f"{result['pairs_per_s']:,.0f} pairs/s vs baseline {expected:,.0f}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())